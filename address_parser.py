@@ -0,0 +1,265 @@
+import argparse
+import csv
+import difflib
+import functools
+import json
+import re
+from collections import Counter, defaultdict
+from config import ADDRESS_PARSER_CONFIG, DISTRICTS, OUTPUT_FILES
+
+UNKNOWN = "Unknown"
+ENREKANG_CODE = "73.16"  # Kode wilayah Kemendagri Kabupaten Enrekang
+
+# Regex dikompilasi sekali di level modul
+KECAMATAN_PATTERN = re.compile(r"^kec(?:amatan)?\.?\s+(?P<name>.+)$", re.IGNORECASE)
+DESA_PREFIX_PATTERN = re.compile(r"^(?:desa|ds\.|kelurahan|kel\.|lura)\s+", re.IGNORECASE)
+PLUS_CODE_PATTERN = re.compile(r"^[23456789CFGHJMPQRVWX]{2,8}\+[23456789CFGHJMPQRVWX]{0,3}\s*", re.IGNORECASE)
+# Bagian alamat yang bukan nama desa: jalan, dusun, kompleks, nomor telepon, dll
+NON_DESA_PATTERN = re.compile(
+    r"^(?:jl\.?|jln\.?|jalan|dusun|dsn\.?|lorong|lr\.|rt\.?|rw\.?|kompleks|komp\.|pasar|ruko|no\.|desa$)"
+    r"|\d{3,}|\bno\.", re.IGNORECASE
+)
+# Bagian administratif di atas kecamatan (kabupaten, provinsi, negara, kode pos)
+REGION_PATTERN = re.compile(
+    r"^(?:kabupaten|kab\.|kota)\s|regency|sulawesi|indonesia|makassar|^\d{5}$", re.IGNORECASE
+)
+KEY_PATTERN = re.compile(r"[^a-z0-9]")
+
+def name_key(name):
+    """Key pencocokan: huruf kecil tanpa spasi/tanda baca ('Bamba Puang' == 'bambapuang')"""
+    return KEY_PATTERN.sub("", name.lower())
+
+class Gazetteer:
+    """Daftar kecamatan dan desa/kelurahan Kabupaten Enrekang dengan lookup exact + fuzzy"""
+
+    def __init__(self, kecamatan_desa):
+        self.kecamatan_keys = {name_key(kecamatan): kecamatan for kecamatan in kecamatan_desa}
+        self.desa_keys = {
+            kecamatan: {name_key(desa): desa for desa in desa_list}
+            for kecamatan, desa_list in kecamatan_desa.items()
+        }
+        self.desa_kecamatan = defaultdict(set)
+        for kecamatan, keys in self.desa_keys.items():
+            for key in keys:
+                self.desa_kecamatan[key].add(kecamatan)
+
+    @staticmethod
+    def lookup(name, keys):
+        """Nama resmi dari dict key -> nama: exact key dulu, lalu difflib di atas cutoff"""
+        key = name_key(name)
+        if not key:
+            return None
+        if key in keys:
+            return keys[key]
+        matches = difflib.get_close_matches(key, list(keys), n=1, cutoff=ADDRESS_PARSER_CONFIG["fuzzy_cutoff"])
+        return keys[matches[0]] if matches else None
+
+    def match_kecamatan(self, name):
+        return self.lookup(name, self.kecamatan_keys)
+
+    def match_desa(self, name, kecamatan=None):
+        """Desa di kecamatan tertentu, atau (desa, kecamatan) unik di seluruh kabupaten"""
+        if kecamatan:
+            return self.lookup(name, self.desa_keys.get(kecamatan, {})), kecamatan
+
+        all_keys = {key: desa for keys in self.desa_keys.values() for key, desa in keys.items()}
+        desa = self.lookup(name, all_keys)
+        if not desa:
+            return None, None
+        candidates = self.desa_kecamatan[name_key(desa)]
+        return desa, next(iter(candidates)) if len(candidates) == 1 else None
+
+@functools.lru_cache(maxsize=None)
+def load_gazetteer(filename=None):
+    filename = filename or ADDRESS_PARSER_CONFIG["gazetteer_file"]
+    with open(filename, 'r', encoding='utf-8') as f:
+        return Gazetteer(json.load(f)["kecamatan"])
+
+def clean_part(part):
+    """Buang plus code dan prefix Desa/Kelurahan, None jika bagian bukan kandidat nama desa"""
+    part = PLUS_CODE_PATTERN.sub("", part).strip()
+    part = DESA_PREFIX_PATTERN.sub("", part).strip()
+    if not part or NON_DESA_PATTERN.search(part) or REGION_PATTERN.search(part):
+        return None
+    return part
+
+@functools.lru_cache(maxsize=ADDRESS_PARSER_CONFIG["cache_size"])
+def parse_location(address):
+    """(kecamatan, desa) dari string alamat; hasil di-cache karena alamat sering berulang"""
+    if not address:
+        return UNKNOWN, UNKNOWN
+    gazetteer = load_gazetteer()
+
+    parts = [part.strip() for part in address.split(",") if part.strip()]
+    parts = [part for part in parts if not REGION_PATTERN.search(part) or KECAMATAN_PATTERN.match(part)]
+
+    # 1. Kecamatan eksplisit "Kec. X"; kecamatan di luar gazetteer berarti di luar kabupaten
+    kecamatan = None
+    kecamatan_index = None
+    explicit = False
+    for index, part in enumerate(parts):
+        match = KECAMATAN_PATTERN.match(part)
+        if match:
+            kecamatan = gazetteer.match_kecamatan(match.group("name"))
+            if not kecamatan:
+                return UNKNOWN, UNKNOWN
+            kecamatan_index = index
+            explicit = True
+            break
+
+    # 2. Tanpa "Kec." (format alamat Inggris): bagian terakhir yang cocok nama kecamatan
+    if kecamatan is None:
+        for index in range(len(parts) - 1, 0, -1):
+            kecamatan = gazetteer.match_kecamatan(parts[index])
+            if kecamatan:
+                kecamatan_index = index
+                break
+
+    # Kandidat desa: bagian sebelum kecamatan dari yang terdekat, lalu bagian sesudahnya
+    if kecamatan_index is None:
+        candidates = list(reversed(parts))
+    else:
+        candidates = list(reversed(parts[:kecamatan_index])) + parts[kecamatan_index + 1:]
+    candidates = [cleaned for cleaned in map(clean_part, candidates) if cleaned]
+
+    for candidate in candidates:
+        desa, desa_kecamatan = gazetteer.match_desa(candidate, kecamatan)
+        if desa:
+            return kecamatan or desa_kecamatan or UNKNOWN, desa
+
+    # Desa belum ada di gazetteer: pakai bagian bersih terdekat sebelum "Kec. X"
+    if explicit and kecamatan_index:
+        nearest = clean_part(parts[kecamatan_index - 1])
+        if nearest:
+            return kecamatan, nearest[0].upper() + nearest[1:]
+
+    return kecamatan or UNKNOWN, UNKNOWN
+
+def parse_address(address):
+    kecamatan, desa = parse_location(address)
+    return {"kecamatan": kecamatan, "desa": desa}
+
+def import_gazetteer(filename, prefix=ENREKANG_CODE):
+    """Gazetteer resmi dari CSV kode wilayah Kemendagri ('kode,nama' per baris).
+
+    Kode kecamatan 73.16.xx dan desa/kelurahan 73.16.xx.xxxx; nama kecamatan
+    dicocokkan ke ejaan DISTRICTS supaya key shard/ledger tetap sama.
+    """
+    kecamatan_names = {}
+    desa_rows = []
+    with open(filename, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.reader(f):
+            if len(row) < 2 or not row[0].startswith(prefix + "."):
+                continue
+            code, name = row[0].strip(), " ".join(row[1].split())
+            if name.isupper():
+                name = name.title()  # Sebagian rilis Kemendagri ditulis kapital semua
+            depth = code.count(".")
+            if depth == 2:
+                kecamatan_names[code] = name
+            elif depth == 3:
+                desa_rows.append((code.rsplit(".", 1)[0], name))
+
+    district_keys = {name_key(district): district for district in DISTRICTS}
+    kecamatan_desa = defaultdict(list)
+    for kecamatan_code, desa in desa_rows:
+        kecamatan = kecamatan_names.get(kecamatan_code)
+        if kecamatan:
+            kecamatan_desa[district_keys.get(name_key(kecamatan), kecamatan)].append(desa)
+
+    return {
+        "source": f"Kode wilayah Kemendagri {prefix} ({filename})",
+        "kecamatan": {kecamatan: sorted(desa_list) for kecamatan, desa_list in sorted(kecamatan_desa.items())}
+    }
+
+def suggest_variants(records, gazetteer=None):
+    """Ejaan desa di dataset yang tidak persis sama dengan gazetteer.
+
+    Return {(kecamatan, ejaan): (nama resmi atau None, jumlah record)}; gazetteer
+    tidak diubah, saran hanya untuk ditinjau manual.
+    """
+    gazetteer = gazetteer or load_gazetteer()
+    counts = Counter()
+    for item in records:
+        kecamatan = item.get("kecamatan")
+        desa = clean_part(str(item.get("desa") or ""))
+        if kecamatan in DISTRICTS and desa and desa != UNKNOWN:
+            counts[(kecamatan, desa)] += 1
+
+    suggestions = {}
+    for (kecamatan, desa), count in counts.items():
+        keys = gazetteer.desa_keys.get(kecamatan, {})
+        if name_key(desa) in keys:
+            continue
+        suggestions[(kecamatan, desa)] = (gazetteer.lookup(desa, keys), count)
+    return suggestions
+
+def reparse_dataset(data_manager):
+    """Parse ulang kecamatan/desa semua record dalam satu pass, return jumlah record berubah"""
+    changed = []
+    for item in data_manager.data:
+        if not item.get("address"):
+            continue
+        location = parse_address(item["address"])
+        if location["kecamatan"] == UNKNOWN and item.get("kecamatan") in DISTRICTS:
+            # Kecamatan dari pencarian tetap dipakai jika alamat tidak menyebut kecamatan
+            location["kecamatan"] = item["kecamatan"]
+        if (location["kecamatan"], location["desa"]) != (item.get("kecamatan"), item.get("desa")):
+            item.update(location)
+            changed.append(item)
+
+    data_manager.rebuild_tracking_sets()
+    if data_manager.facility_index is not None:
+        for item in changed:
+            data_manager.facility_index.add(item)
+    return len(changed)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parser alamat berbasis gazetteer Kabupaten Enrekang")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    parse_parser = subparsers.add_parser("parse", help="Parse satu alamat")
+    parse_parser.add_argument("address")
+
+    import_parser = subparsers.add_parser("import", help="Bangun gazetteer dari CSV kode wilayah Kemendagri")
+    import_parser.add_argument("codes", help="CSV 'kode,nama' (mis. base.csv kode wilayah)")
+
+    suggest_parser = subparsers.add_parser("suggest", help="Saran ejaan desa dataset yang belum cocok gazetteer")
+    suggest_parser.add_argument("input", nargs="?", help="Snapshot JSON/JSONL (default dari config)")
+
+    subparsers.add_parser("reparse", help="Parse ulang kecamatan/desa seluruh dataset lalu compaction")
+
+    args = parser.parse_args()
+
+    if args.command == "parse":
+        print(json.dumps(parse_address(args.address), ensure_ascii=False))
+    elif args.command == "import":
+        gazetteer = import_gazetteer(args.codes)
+        filename = ADDRESS_PARSER_CONFIG["gazetteer_file"]
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(gazetteer, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        total = sum(len(desa_list) for desa_list in gazetteer["kecamatan"].values())
+        print(f"📚 Gazetteer {filename}: {len(gazetteer['kecamatan'])} kecamatan, {total} desa/kelurahan")
+    elif args.command == "suggest":
+        from record_stream import iter_records
+
+        suggestions = suggest_variants(iter_records(args.input or OUTPUT_FILES["json"]))
+        for (kecamatan, desa), (official, count) in sorted(suggestions.items()):
+            if official:
+                print(f"   ✏️  {kecamatan}: '{desa}' -> '{official}' ({count} record)")
+            else:
+                print(f"   ❓ {kecamatan}: '{desa}' tidak ada di gazetteer ({count} record)")
+        print(f"📚 {len(suggestions)} ejaan desa berbeda dari gazetteer (gazetteer tidak diubah)")
+    else:
+        from data_manager import DataManager
+
+        manager = DataManager(journal_file=OUTPUT_FILES["journal"], index_file=OUTPUT_FILES["facility_index"])
+        manager.load_existing_data(identity_only=False)
+        changed = reparse_dataset(manager)
+        files = manager.save_to_files()
+        manager.close()
+        info = parse_location.cache_info()
+        print(f"🏷️  {changed} record diperbarui dari {len(manager.data)} "
+              f"(cache hit {info.hits}, miss {info.misses})")
+        print(f"💾 Disimpan: {files['json']}, {files['csv']}")
@@ -0,0 +1,125 @@
+import fnmatch
+import json
+from collections import defaultdict
+from config import BROWSER_PROFILE_CONFIG
+
+# Request yang tidak dibutuhkan untuk membaca feed hasil dan panel detail.
+# Pola memakai wildcard Network.setBlockedURLs ("*" = sembarang karakter)
+BLOCKED_URL_PATTERNS = {
+    "tiles": [
+        "*://*/maps/vt*",
+        "*://*/kh/v=*",
+        "*://*/maps/rpc/vector*",
+        "*streetviewpixels-pa.googleapis.com*",
+        "*://*.ggpht.com/*"
+    ],
+    "images": [
+        "*googleusercontent.com*",
+        "*.png*",
+        "*.jpg*",
+        "*.jpeg*",
+        "*.gif*",
+        "*.webp*"
+    ],
+    "fonts": [
+        "*fonts.googleapis.com*",
+        "*fonts.gstatic.com*",
+        "*.woff2*",
+        "*.woff*",
+        "*.ttf*"
+    ],
+    "analytics": [
+        "*google-analytics.com*",
+        "*googletagmanager.com*",
+        "*doubleclick.net*",
+        "*/gen_204*",
+        "*play.google.com/log*",
+        "*/maps/preview/log204*"
+    ]
+}
+
+def blocked_patterns(categories=None):
+    """Pola URL untuk kategori yang diblokir"""
+    categories = categories or BROWSER_PROFILE_CONFIG["block_categories"]
+    return [pattern for category in categories for pattern in BLOCKED_URL_PATTERNS[category]]
+
+def classify_url(url):
+    """Kategori blokir untuk URL, atau None"""
+    for category, patterns in BLOCKED_URL_PATTERNS.items():
+        if any(fnmatch.fnmatchcase(url, pattern) for pattern in patterns):
+            return category
+    return None
+
+def apply_lean_options(options):
+    """Flag Chrome untuk profil lean: tanpa canvas WebGL, dengan performance log untuk meter"""
+    if BROWSER_PROFILE_CONFIG["disable_webgl"]:
+        # Tanpa WebGL, Maps jatuh ke mode lite (tile raster 2D) yang tile-nya ikut diblokir
+        options.add_argument("--disable-webgl")
+        options.add_argument("--disable-3d-apis")
+        options.add_argument("--disable-gpu")
+
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return options
+
+def enable_resource_blocking(driver, categories=None):
+    """Blokir tile/gambar/font/analytics lewat CDP Network.setBlockedURLs"""
+    patterns = blocked_patterns(categories)
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    print(f"🪶 Profil lean aktif: {len(patterns)} pola URL diblokir")
+    return patterns
+
+class TrafficMeter:
+    """Hitung byte yang ditransfer dan request yang diblokir dari performance log Chrome"""
+
+    def __init__(self):
+        self.request_urls = {}
+        self.totals = {"bytes": 0, "blocked": 0, "saved": 0, "queries": 0}
+
+    def collect(self, driver, query=True):
+        """Kuras performance log sejak collect terakhir, return statistik periode ini.
+
+        query=False untuk periode di luar pencarian (mis. session break): byte tetap dihitung,
+        tapi tidak menambah jumlah query untuk rata-rata per query.
+        """
+        stats = {"bytes": 0, "requests": 0, "blocked": defaultdict(int), "saved": 0}
+
+        for entry in driver.get_log("performance"):
+            message = json.loads(entry["message"])["message"]
+            method = message.get("method")
+            params = message.get("params", {})
+
+            if method == "Network.requestWillBeSent":
+                self.request_urls[params["requestId"]] = params["request"]["url"]
+
+            elif method == "Network.loadingFinished":
+                stats["bytes"] += int(params.get("encodedDataLength", 0))
+                stats["requests"] += 1
+                self.request_urls.pop(params["requestId"], None)
+
+            elif method == "Network.loadingFailed":
+                url = self.request_urls.pop(params["requestId"], "")
+                if params.get("blockedReason"):
+                    stats["blocked"][classify_url(url) or "other"] += 1
+
+        # Byte yang dihemat adalah estimasi: request yang diblokir tidak pernah punya ukuran
+        estimated_bytes = BROWSER_PROFILE_CONFIG["estimated_bytes"]
+        stats["saved"] = sum(count * estimated_bytes.get(category, 0) for category, count in stats["blocked"].items())
+        stats["blocked"] = dict(stats["blocked"])
+
+        self.totals["bytes"] += stats["bytes"]
+        self.totals["blocked"] += sum(stats["blocked"].values())
+        self.totals["saved"] += stats["saved"]
+        self.totals["queries"] += int(query)
+        return stats
+
+    def print_query(self, stats, label):
+        blocked = ", ".join(f"{category} {count}" for category, count in sorted(stats["blocked"].items())) or "0"
+        print(f"🪶 {label}: {stats['bytes'] / 1024:.0f} KB ditransfer ({stats['requests']} request), "
+              f"diblokir {blocked}, ~{stats['saved'] / 1024:.0f} KB dihemat")
+
+    def print_summary(self):
+        queries = self.totals["queries"] or 1
+        print(f"🪶 Total traffic: {self.totals['bytes'] / 1048576:.1f} MB ditransfer, "
+              f"{self.totals['blocked']} request diblokir, ~{self.totals['saved'] / 1048576:.1f} MB dihemat "
+              f"(~{self.totals['saved'] / queries / 1024:.0f} KB per query)")
@@ -0,0 +1,265 @@
+import time
+import numpy as np
+import pandas as pd
+from config import DEDUPE_CONFIG
+
+# Offset cell tetangga (3x3) dan stride untuk menggabung (cell_lat, cell_lng) jadi satu key int64
+NEIGHBOR_OFFSETS = [(d_lat, d_lng) for d_lat in (-1, 0, 1) for d_lng in (-1, 0, 1)]
+CELL_KEY_STRIDE = 1 << 32
+NEIGHBOR_KEY_OFFSETS = np.array([d_lat * CELL_KEY_STRIDE + d_lng for d_lat, d_lng in NEIGHBOR_OFFSETS], dtype=np.int64)
+DENSE_CELL_SIZE = 8  # Cell dengan titik lebih banyak tidak di-expand jadi pasangan eksak
+
+def build_identity_columns(records):
+    """Key nama/kecamatan/desa, URL dan koordinat (normalisasi identity_of) ke array"""
+    from data_manager import identity_of  # data_manager mengimpor modul ini
+
+    identities = [identity_of(item) for item in records]
+    location_ids = [location_id for location_id, _, _ in identities]
+    urls = [url for _, url, _ in identities]
+    lat = np.array([coordinates[0] if coordinates else np.nan for _, _, coordinates in identities], dtype=np.float64)
+    lng = np.array([coordinates[1] if coordinates else np.nan for _, _, coordinates in identities], dtype=np.float64)
+
+    return location_ids, urls, lat, lng
+
+def cell_keys_of(lat, lng, threshold):
+    """Key int64 cell grid (ukuran cell = threshold) per titik"""
+    return np.floor(lat / threshold).astype(np.int64) * CELL_KEY_STRIDE + np.floor(lng / threshold).astype(np.int64)
+
+def sorted_unique(keys):
+    """Key unik terurut (sort + mask; lebih cepat dari np.unique berbasis hash untuk int64 besar)"""
+    keys = np.sort(keys, axis=None)
+    return keys[np.concatenate(([True], keys[1:] != keys[:-1]))] if len(keys) else keys
+
+def contains_sorted(sorted_keys, keys):
+    """Mask keys yang ada di array terurut sorted_keys (pengganti np.isin)"""
+    if not len(sorted_keys):
+        return np.zeros(len(keys), dtype=bool)
+    position = np.minimum(np.searchsorted(sorted_keys, keys), len(sorted_keys) - 1)
+    return sorted_keys[position] == keys
+
+def find_proximity_conflicts(lat, lng, threshold):
+    """True untuk record yang mungkin punya record lebih awal dalam threshold.
+
+    Cell kecil (<= DENSE_CELL_SIZE titik) dicek pasangan eksak lewat sorted-key sweep.
+    Cell padat (mis. ratusan record di satu titik) tidak di-expand jadi pasangan O(k^2):
+    titik cukup dibandingkan dengan indeks record paling awal di cell itu, jadi hasilnya
+    superset yang jaraknya dicek ulang saat resolusi. Memori sweep <= n * DENSE_CELL_SIZE.
+    """
+    conflict = np.zeros(len(lat), dtype=bool)
+    index = np.flatnonzero(np.isfinite(lat) & np.isfinite(lng))
+    if len(index) < 2:
+        return conflict
+
+    cell_keys = cell_keys_of(lat[index], lng[index], threshold)
+    order = np.argsort(cell_keys, kind="stable")
+    sorted_keys = cell_keys[order]
+    sorted_index = index[order]
+    unique_keys, starts, counts = np.unique(sorted_keys, return_index=True, return_counts=True)
+    cell_first = np.minimum.reduceat(sorted_index, starts)
+
+    for d_lat, d_lng in NEIGHBOR_OFFSETS:
+        # Target tetap terurut sehingga searchsorted berjalan sebagai sweep
+        target = sorted_keys + (d_lat * CELL_KEY_STRIDE + d_lng)
+        position = np.minimum(np.searchsorted(unique_keys, target), len(unique_keys) - 1)
+        found = unique_keys[position] == target
+        dense = found & (counts[position] > DENSE_CELL_SIZE)
+        conflict[sorted_index[dense]] |= cell_first[position[dense]] < sorted_index[dense]
+
+        sparse = found & ~dense
+        low = starts[position[sparse]]
+        sparse_counts = counts[position[sparse]]
+        if not len(sparse_counts):
+            continue
+
+        # Expand range [low, low + count) per titik menjadi pasangan kandidat
+        offsets = np.arange(sparse_counts.sum()) - np.repeat(np.cumsum(sparse_counts) - sparse_counts, sparse_counts)
+        later = np.repeat(sorted_index[sparse], sparse_counts)
+        earlier = sorted_index[np.repeat(low, sparse_counts) + offsets]
+        mask = ((earlier < later) &
+                (np.abs(lat[later] - lat[earlier]) < threshold) &
+                (np.abs(lng[later] - lng[earlier]) < threshold))
+        conflict[later[mask]] = True
+
+    return conflict
+
+def first_index_of(codes, size, mask=None):
+    """Indeks pertama per kode (len(codes) jika kode tidak muncul), opsional hanya baris mask"""
+    index = np.arange(len(codes)) if mask is None else np.flatnonzero(mask)
+    first = np.full(size, len(codes), dtype=np.int64)
+    # Assignment fancy index: penulisan terakhir menang, jadi dibalik agar indeks terkecil tersisa
+    first[codes[index][::-1]] = index[::-1]
+    return first
+
+def near_kept_points(lat, lng, kept, candidates, threshold):
+    """True untuk kandidat yang punya titik kept (tanpa konflik) dalam threshold.
+
+    Titik tanpa konflik saling berjarak >= threshold, jadi tiap cell berisi paling banyak
+    satu titik dan cukup satu searchsorted per cell tetangga.
+    """
+    near = np.zeros(len(candidates), dtype=bool)
+    reference = np.flatnonzero(kept & np.isfinite(lat) & np.isfinite(lng))
+    if not len(reference) or not len(candidates):
+        return near
+
+    reference_keys = cell_keys_of(lat[reference], lng[reference], threshold)
+    order = np.argsort(reference_keys, kind="stable")
+    reference_keys = reference_keys[order]
+    reference = reference[order]
+
+    candidate_keys = cell_keys_of(lat[candidates], lng[candidates], threshold)
+    for offset in NEIGHBOR_KEY_OFFSETS:
+        target = candidate_keys + offset
+        position = np.minimum(np.searchsorted(reference_keys, target), len(reference_keys) - 1)
+        other = reference[position]
+        near |= ((reference_keys[position] == target) &
+                 (np.abs(lat[candidates] - lat[other]) < threshold) &
+                 (np.abs(lng[candidates] - lng[other]) < threshold))
+    return near
+
+def resolve_duplicates(location_codes, url_codes, has_url, lat, lng, threshold, by_reason):
+    """Keputusan keep/drop scan sekuensial dari kolom identitas (urutan array = urutan scan).
+
+    location_codes/url_codes adalah kode integer hasil factorize, lat/lng NaN untuk record
+    tanpa koordinat. Return (mask kept, mask conflicted); by_reason ditambah per alasan.
+    """
+    total = len(location_codes)
+    location_size = int(location_codes.max(initial=-1)) + 1
+    url_size = int(url_codes.max(initial=-1)) + 1
+
+    location_conflict = pd.Series(location_codes).duplicated().to_numpy()
+    url_conflict = pd.Series(url_codes).duplicated().to_numpy() & has_url
+
+    proximity_conflict = find_proximity_conflicts(lat, lng, threshold)
+
+    conflicted = location_conflict | url_conflict | proximity_conflict
+    kept = ~conflicted
+    has_coordinates = np.isfinite(lat) & np.isfinite(lng)
+
+    # Record konflik yang bentrok dengan record tanpa konflik (pasti dipertahankan dan lebih
+    # awal) pasti dibuang. Record yang dibuang tidak mengubah state scan, jadi tidak perlu
+    # masuk loop sekuensial; alasannya dihitung setelah loop.
+    candidates = np.flatnonzero(conflicted)
+    dropped = np.zeros(total, dtype=bool)
+    first_location = first_index_of(location_codes, location_size)
+    first_url = first_index_of(url_codes, url_size, has_url)
+    dropped[candidates] = (
+        (location_conflict[candidates] & kept[np.minimum(first_location[location_codes[candidates]], total - 1)]) |
+        (url_conflict[candidates] & kept[np.minimum(first_url[url_codes[candidates]], total - 1)])
+    )
+    with_coordinates = candidates[~dropped[candidates] & has_coordinates[candidates]]
+    dropped[with_coordinates] = near_kept_points(lat, lng, kept, with_coordinates, threshold)
+    unresolved = conflicted & ~dropped
+
+    # Record tanpa konflik pasti dipertahankan dan selalu jadi anggota pertama grupnya
+    kept_locations = set(location_codes[kept].tolist())
+    kept_urls = set(url_codes[kept & has_url].tolist())
+
+    # Grid (key cell int64 -> koordinat) berisi record yang dipertahankan. Record tanpa konflik
+    # yang bertetangga dengan record konflik i pasti lebih awal dari i (kalau lebih akhir, ia
+    # sendiri akan berkonflik), jadi aman dimasukkan di awal. Titik yang dipertahankan saling
+    # berjarak >= threshold, sehingga tiap cell hanya berisi sedikit titik.
+    cell_keys = np.zeros(total, dtype=np.int64)
+    cell_keys[has_coordinates] = cell_keys_of(lat[has_coordinates], lng[has_coordinates], threshold)
+    unresolved_cells = sorted_unique(cell_keys[unresolved & has_coordinates])
+    neighbor_cells = sorted_unique(unresolved_cells[:, None] + NEIGHBOR_KEY_OFFSETS[None, :])
+    seeds = np.flatnonzero(has_coordinates & kept)
+    seeds = seeds[contains_sorted(neighbor_cells, cell_keys[seeds])]
+    kept_cells = {}
+    for key, point in zip(cell_keys[seeds].tolist(), zip(lat[seeds].tolist(), lng[seeds].tolist())):
+        kept_cells.setdefault(key, []).append(point)
+
+    # Loop sekuensial memakai list Python (indexing skalar numpy jauh lebih lambat per elemen)
+    offsets = NEIGHBOR_KEY_OFFSETS.tolist()
+    index = np.flatnonzero(unresolved)
+    rows = zip(index.tolist(), location_codes[index].tolist(), url_codes[index].tolist(), has_url[index].tolist(),
+               has_coordinates[index].tolist(), lat[index].tolist(), lng[index].tolist(), cell_keys[index].tolist())
+    for i, location_code, url_code, with_url, with_coordinates, point_lat, point_lng, key in rows:
+        if location_code in kept_locations:
+            dropped[i] = True
+            continue
+
+        if with_url and url_code in kept_urls:
+            dropped[i] = True
+            continue
+
+        if with_coordinates:
+            nearby = False
+            for offset in offsets:
+                points = kept_cells.get(key + offset)
+                if points:
+                    for other_lat, other_lng in points:
+                        if abs(point_lat - other_lat) < threshold and abs(point_lng - other_lng) < threshold:
+                            nearby = True
+                            break
+                    if nearby:
+                        break
+            if nearby:
+                dropped[i] = True
+                continue
+            kept_cells.setdefault(key, []).append((point_lat, point_lng))
+
+        kept[i] = True
+        kept_locations.add(location_code)
+        if with_url:
+            kept_urls.add(url_code)
+
+    # Alasan sama dengan urutan cek scan: ada record dipertahankan lebih awal dengan
+    # nama-kecamatan-desa sama, lalu URL sama, selain itu koordinat
+    dropped = np.flatnonzero(dropped)
+    by_location = first_index_of(location_codes, location_size, kept)[location_codes[dropped]] < dropped
+    by_url = (~by_location & has_url[dropped] &
+              (first_index_of(url_codes, url_size, kept & has_url)[url_codes[dropped]] < dropped))
+    by_reason["location"] += int(by_location.sum())
+    by_reason["url"] += int(by_url.sum())
+    by_reason["coordinates"] += int(len(dropped) - by_location.sum() - by_url.sum())
+
+    return kept, conflicted
+
+def bulk_deduplicate(records, threshold=None):
+    """Dedupe dataset besar dengan keputusan keep/drop yang sama seperti scan sekuensial.
+
+    Record dipertahankan jika tidak ada record sebelumnya yang dipertahankan dengan
+    nama+kecamatan+desa sama, URL sama, atau koordinat dalam threshold (dicek dalam
+    urutan itu). Hanya record yang punya konflik dengan record sebelumnya yang
+    diselesaikan satu per satu; sisanya diputuskan secara vektor.
+    """
+    start_time = time.perf_counter()
+    threshold = threshold or DEDUPE_CONFIG["coordinate_threshold"]
+    total = len(records)
+
+    report = {
+        "original": total,
+        "kept": total,
+        "removed": 0,
+        "by_reason": {"location": 0, "url": 0, "coordinates": 0},
+        "conflicted": 0,
+        "elapsed_seconds": 0.0
+    }
+    if total == 0:
+        return [], report
+
+    location_ids, urls, lat, lng = build_identity_columns(records)
+
+    # Grouping: kode integer per key, record pertama tiap grup tidak punya konflik
+    location_codes, _ = pd.factorize(pd.Series(location_ids, dtype=object))
+    url_codes, _ = pd.factorize(pd.Series(urls, dtype=object))
+    has_url = np.array([bool(url) for url in urls], dtype=bool)
+
+    kept, conflicted = resolve_duplicates(location_codes, url_codes, has_url, lat, lng, threshold,
+                                          report["by_reason"])
+    unique_records = [records[i] for i in np.flatnonzero(kept)]
+
+    report["kept"] = len(unique_records)
+    report["removed"] = total - len(unique_records)
+    report["conflicted"] = int(conflicted.sum())
+    report["elapsed_seconds"] = time.perf_counter() - start_time
+
+    return unique_records, report
+
+def print_dedupe_report(report):
+    """Ringkasan hasil bulk dedupe"""
+    reasons = report["by_reason"]
+    print(f"🧹 Bulk dedupe: {report['removed']} duplikat dihapus dari {report['original']} data "
+          f"({report['elapsed_seconds']:.2f}s)")
+    print(f"   🏷️  nama-kecamatan-desa: {reasons['location']} | 🔗 URL: {reasons['url']} | "
+          f"📍 koordinat: {reasons['coordinates']}")
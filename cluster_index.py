@@ -0,0 +1,215 @@
+import argparse
+import bisect
+import json
+import math
+from config import CLUSTER_CONFIG, GEO_EXPORT_CONFIG, INFRASTRUCTURE_CATEGORIES, KEYWORD_CATEGORIES, OUTPUT_FILES
+from data_manager import parse_coordinates
+
+CATEGORIES = sorted(INFRASTRUCTURE_CATEGORIES) + ["lainnya"]
+ZOOM_BITS = 5  # id = (posisi di level << 5) | zoom
+
+def project(lat, lng):
+    """Web Mercator ternormalisasi [0, 1]"""
+    sin_lat = math.sin(math.radians(max(-85.0511, min(85.0511, lat))))
+    y = 0.5 - 0.25 * math.log((1 + sin_lat) / (1 - sin_lat)) / math.pi
+    return lng / 360 + 0.5, y
+
+def unproject_lat(y):
+    return math.degrees(2 * math.atan(math.exp((0.5 - y) * 2 * math.pi)) - math.pi / 2)
+
+def cluster_id(zoom, index):
+    return (index << ZOOM_BITS) | zoom
+
+def decode_id(identifier):
+    return identifier & ((1 << ZOOM_BITS) - 1), identifier >> ZOOM_BITS
+
+class Node:
+    """Titik atau cluster di satu level zoom (koordinat Mercator, berat = jumlah fasilitas)"""
+
+    __slots__ = ("x", "y", "count", "categories", "children", "leaf", "merged_at")
+
+    def __init__(self, x, y, count, categories, children, leaf=None):
+        self.x = x
+        self.y = y
+        self.count = count
+        self.categories = categories
+        self.children = children
+        self.leaf = leaf  # (lat, lng, record) asli untuk node level paling bawah
+        self.merged_at = math.inf
+
+def cluster_level(nodes, zoom):
+    """Gabungkan node level zoom+1 dalam radius piksel jadi node level zoom (grid hash untuk tetangga)"""
+    radius = CLUSTER_CONFIG["radius"] / (CLUSTER_CONFIG["extent"] * 2 ** zoom)
+    cells = {}
+    for index, node in enumerate(nodes):
+        cells.setdefault((math.floor(node.x / radius), math.floor(node.y / radius)), []).append(index)
+
+    parents = []
+    for index, node in enumerate(nodes):
+        if node.merged_at <= zoom:
+            continue
+        node.merged_at = zoom
+
+        members = [index]
+        cell_x, cell_y = math.floor(node.x / radius), math.floor(node.y / radius)
+        for d_x in (-1, 0, 1):
+            for d_y in (-1, 0, 1):
+                for other in cells.get((cell_x + d_x, cell_y + d_y), ()):
+                    neighbor = nodes[other]
+                    if neighbor.merged_at > zoom and (neighbor.x - node.x) ** 2 + (neighbor.y - node.y) ** 2 <= radius ** 2:
+                        neighbor.merged_at = zoom
+                        members.append(other)
+
+        count = sum(nodes[member].count for member in members)
+        parents.append(Node(
+            sum(nodes[member].x * nodes[member].count for member in members) / count,
+            sum(nodes[member].y * nodes[member].count for member in members) / count,
+            count,
+            [sum(values) for values in zip(*(nodes[member].categories for member in members))],
+            members
+        ))
+
+    return parents
+
+def sort_level(nodes):
+    """Urutkan level berdasarkan x (longitude) supaya reader bisa bisect per viewport"""
+    return sorted(nodes, key=lambda node: node.x)
+
+def build_cluster_index(records):
+    """Hierarki cluster per zoom ala supercluster: count per kategori dan pointer ke children"""
+    min_zoom, max_zoom = CLUSTER_CONFIG["min_zoom"], CLUSTER_CONFIG["max_zoom"]
+    precision = GEO_EXPORT_CONFIG["coordinate_precision"]
+
+    leaves = []
+    for item in records:
+        coordinates = parse_coordinates(item)
+        if not coordinates:
+            continue
+        categories = [0] * len(CATEGORIES)
+        categories[CATEGORIES.index(KEYWORD_CATEGORIES.get(item.get("keyword"), "lainnya"))] = 1
+        leaves.append(Node(*project(*coordinates), 1, categories, [], leaf=(*coordinates, item)))
+
+    levels = {max_zoom + 1: sort_level(leaves)}
+    for zoom in range(max_zoom, min_zoom - 1, -1):
+        levels[zoom] = sort_level(cluster_level(levels[zoom + 1], zoom))
+
+    # Serialisasi kolom per level: array paralel jauh lebih ringkas daripada list objek
+    serialized = {}
+    for zoom, nodes in levels.items():
+        if zoom == max_zoom + 1:
+            serialized[str(zoom)] = {
+                "lng": [round(node.leaf[1], precision) for node in nodes],
+                "lat": [round(node.leaf[0], precision) for node in nodes],
+                "category": [node.categories.index(1) for node in nodes],
+                "properties": {
+                    field: [node.leaf[2].get(field) for node in nodes]
+                    for field in GEO_EXPORT_CONFIG["properties"] if field != "kategori"
+                }
+            }
+            continue
+        serialized[str(zoom)] = {
+            "lng": [round((node.x - 0.5) * 360, precision) for node in nodes],
+            "lat": [round(unproject_lat(node.y), precision) for node in nodes],
+            "count": [node.count for node in nodes],
+            "categories": [node.categories for node in nodes],
+            "children": [node.children for node in nodes]
+        }
+
+    # Index children mengacu ke posisi di level bawah (sudah terurut saat level atas dibangun)
+    return {
+        "min_zoom": min_zoom,
+        "max_zoom": max_zoom,
+        "categories": CATEGORIES,
+        "levels": serialized
+    }
+
+class ClusterIndex:
+    """Reader file cluster: cluster dalam viewport per zoom dan ekspansi ke children"""
+
+    def __init__(self, filename=None):
+        with open(filename or OUTPUT_FILES["clusters"], 'r', encoding='utf-8') as f:
+            self.index = json.load(f)
+        self.min_zoom = self.index["min_zoom"]
+        self.max_zoom = self.index["max_zoom"]
+        self.categories = self.index["categories"]
+
+    def level(self, zoom):
+        return self.index["levels"][str(zoom)]
+
+    def node(self, zoom, position):
+        """Cluster sebagai dict; leaf (zoom max+1) sebagai fasilitas dengan properties"""
+        level = self.level(zoom)
+        node = {"id": cluster_id(zoom, position), "lat": level["lat"][position], "lng": level["lng"][position]}
+        if zoom > self.max_zoom:
+            node["count"] = 1
+            node["kategori"] = self.categories[level["category"][position]]
+            node.update({field: values[position] for field, values in level["properties"].items()})
+            return node
+
+        children = level["children"][position]
+        if level["count"][position] == 1:
+            # Titik tunggal di zoom ini: tampilkan sebagai fasilitas, bukan cluster
+            return {**self.node(zoom + 1, children[0]), "id": node["id"]}
+
+        node["count"] = level["count"][position]
+        node["categories"] = {
+            category: amount for category, amount in zip(self.categories, level["categories"][position]) if amount
+        }
+        return node
+
+    def clusters(self, south, west, north, east, zoom):
+        """Cluster/fasilitas dalam viewport pada zoom (di-clamp ke rentang index)"""
+        zoom = max(self.min_zoom, min(self.max_zoom + 1, int(zoom)))
+        level = self.level(zoom)
+        start = bisect.bisect_left(level["lng"], west)
+        end = bisect.bisect_right(level["lng"], east)
+        return [self.node(zoom, position) for position in range(start, end)
+                if south <= level["lat"][position] <= north]
+
+    def children(self, identifier):
+        """Node di zoom berikutnya yang tergabung dalam cluster ini"""
+        zoom, position = decode_id(identifier)
+        if zoom > self.max_zoom:
+            return []
+        return [self.node(zoom + 1, child) for child in self.level(zoom)["children"][position]]
+
+    def expansion_zoom(self, identifier):
+        """Zoom pertama saat cluster ini pecah jadi lebih dari satu node"""
+        zoom, position = decode_id(identifier)
+        while zoom <= self.max_zoom:
+            children = self.level(zoom)["children"][position]
+            if len(children) > 1:
+                return zoom + 1
+            zoom, position = zoom + 1, children[0]
+        return zoom
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Index cluster per zoom untuk peta statis")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Bangun index cluster dari snapshot JSON")
+    build_parser.add_argument("input", nargs="?", help="Snapshot JSON (default dari config)")
+
+    query_parser = subparsers.add_parser("query", help="Cluster dalam viewport pada zoom tertentu")
+    for name in ("south", "west", "north", "east"):
+        query_parser.add_argument(name, type=float)
+    query_parser.add_argument("zoom", type=int)
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        with open(args.input or OUTPUT_FILES["json"], 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        from data_manager import DataManager
+
+        manager = DataManager()
+        manager.data = data["data"] if isinstance(data, dict) else data
+        filename = manager.save_to_clusters()
+        print(f"🧭 Index cluster disimpan: {filename}")
+    else:
+        for node in ClusterIndex().clusters(args.south, args.west, args.north, args.east, args.zoom):
+            if "categories" in node:
+                print(f"   🔵 {node['count']} fasilitas @ {node['lat']:.5f}, {node['lng']:.5f} {node['categories']}")
+            else:
+                print(f"   📍 {node.get('nama')} ({node['kategori']}) @ {node['lat']:.5f}, {node['lng']:.5f}")
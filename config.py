@@ -85,21 +85,80 @@ ALL_KEYWORDS = []
 for category_keywords in INFRASTRUCTURE_CATEGORIES.values():
     ALL_KEYWORDS.extend(category_keywords)
 
+# Keyword -> kategori (kolom "kategori" di export Parquet)
+KEYWORD_CATEGORIES = {
+    keyword: category
+    for category, category_keywords in INFRASTRUCTURE_CATEGORIES.items()
+    for keyword in category_keywords
+}
+
 # Konfigurasi scraping
 SCRAPING_CONFIG = {
     "implicit_wait": 10,
     "page_load_timeout": 30,
     "max_scroll_attempts": 20,
-    "delay_between_items": 2,
-    "delay_between_keywords": 5,
     "delay_between_districts": 30,
-    "human_behavior_chance": 0.3
+    "human_behavior_chance": 0.3,
+    "start_url": "https://maps.google.com/?hl=id",
+    "harvest_mode": True  # Baca semua kartu feed sekaligus, click hanya untuk kartu yang tidak lengkap
+}
+
+# Profil browser lean: blokir resource yang tidak dibaca scraper
+BROWSER_PROFILE_CONFIG = {
+    "lean": True,
+    "block_categories": ["tiles", "images", "fonts", "analytics"],
+    "disable_webgl": True,
+    # Estimasi ukuran rata-rata per request yang diblokir (byte), untuk laporan penghematan
+    "estimated_bytes": {"tiles": 20000, "images": 25000, "fonts": 35000, "analytics": 500}
+}
+
+# Warm start browser: chromedriver ter-patch di-cache dan template user-data-dir
+DRIVER_CACHE_CONFIG = {
+    "enabled": True,
+    "cache_dir": ".driver_cache",
+    "profile_template": True  # Profil sesi pertama disimpan sebagai template untuk sesi berikutnya
+}
+
+# Wait event-driven (MutationObserver/history hook) di browser, dalam detik
+DOM_WAIT_CONFIG = {
+    "url_change_timeout": 15,
+    "results_timeout": 15,
+    "feed_growth_timeout": 8,
+    "detail_timeout": 10,
+    "script_timeout_margin": 5  # Batas execute_async_script di atas timeout wait
+}
+
+# Konfigurasi deteksi duplikat
+DEDUPE_CONFIG = {
+    "coordinate_threshold": 0.0005  # ~50 meter dalam derajat
 }
 
 # File output
 OUTPUT_FILES = {
     "json": "infrastruktur_enrekang.json",
-    "csv": "infrastruktur_enrekang.csv"
+    "csv": "infrastruktur_enrekang.csv",
+    "journal": "infrastruktur_enrekang.jsonl",
+    "ledger": "infrastruktur_enrekang_tasks.sqlite",
+    "query_plan": "query_plan.json",
+    "tile_coverage": "tile_coverage.json",
+    "metrics": "scrape_metrics.jsonl",
+    "metrics_prometheus": "scrape_metrics.prom",
+    "parquet": "infrastruktur_enrekang_parquet",  # Folder dataset, partisi kecamatan=/kategori=
+    "facility_index": "infrastruktur_enrekang_index.sqlite",
+    "geojsonseq": "infrastruktur_enrekang.geojsonl",
+    "flatgeobuf": "infrastruktur_enrekang.fgb",
+    "clusters": "infrastruktur_enrekang_clusters.json"
+}
+
+# Journal append-only, snapshot JSON/CSV dibuat saat compaction
+JOURNAL_CONFIG = {
+    "fsync_batch_size": 20,  # fsync setiap 20 record
+    "fsync_interval": 5.0  # atau setiap 5 detik
+}
+
+# Load data lama saat resume
+LOAD_CONFIG = {
+    "identity_only": True  # Hanya key identitas di RAM, record lama di-stream dari snapshot saat compaction
 }
 
 # Tambahkan di config.py
@@ -109,4 +168,136 @@ SECURITY_CONFIG = {
     "recovery_delay_multiplier": 2.0,
     "max_retries_per_element": 3,
     "randomize_order": True,  # Randomize district order
-}
\ No newline at end of file
+}
+
+# Rate limiter: token bucket per jenis aksi (rate per jam, capacity = burst)
+RATE_LIMIT_CONFIG = {
+    "buckets": {
+        "search": {"rate_per_hour": SECURITY_CONFIG["max_requests_per_hour"], "capacity": 1},
+        "place_open": {"rate_per_hour": 1200, "capacity": 2},  # ~3 detik per detail tempat
+        "scroll": {"rate_per_hour": 2400, "capacity": 3}  # ~1.5 detik per scroll feed
+    },
+    "jitter": 0.25  # Tambahan acak hingga 25% interval token setiap acquire
+}
+
+# Pacing profile untuk job spec (batch/cron); "normal" = nilai default di atas
+PACING_PROFILES = {
+    "gentle": {
+        "searches_per_hour": 30,
+        "place_opens_per_hour": 600,
+        "scrolls_per_hour": 1200,
+        "delay_between_districts": 60,
+        "session_break_interval": 2
+    },
+    "normal": {
+        "searches_per_hour": 50,
+        "place_opens_per_hour": 1200,
+        "scrolls_per_hour": 2400,
+        "delay_between_districts": 30,
+        "session_break_interval": 3
+    },
+    "fast": {
+        "searches_per_hour": 90,
+        "place_opens_per_hour": 2400,
+        "scrolls_per_hour": 4800,
+        "delay_between_districts": 15,
+        "session_break_interval": 4
+    }
+}
+
+# Task ledger untuk resume per unit kecamatan×keyword
+LEDGER_CONFIG = {
+    "max_attempts": 3  # Unit gagal dicoba ulang saat resume sampai batas ini
+}
+
+# Tile sweep: pencarian per kotak koordinat di bounding box kabupaten
+TILE_SWEEP_CONFIG = {
+    "bbox": [-3.90, 119.60, -3.15, 120.20],  # south, west, north, east Kabupaten Enrekang
+    "grid": [3, 3],  # rows × cols tile awal
+    "saturation_count": 100,  # Feed Maps berhenti di ~120 hasil; >= 100 dianggap jenuh
+    "max_depth": 3,  # Maksimum subdivisi (tile terkecil 1/64 tile awal)
+    "viewport_pixels": 1400,  # Lebar area peta di samping panel hasil
+    "min_zoom": 11,
+    "max_zoom": 17,
+    "filter_outside_bbox": True  # Kartu di luar bbox kabupaten di-skip tanpa click (semua mode)
+}
+
+# Metrics per fase: JSONL per unit + Prometheus textfile (node_exporter textfile collector)
+METRICS_CONFIG = {
+    "enabled": True,
+    "prefix": "enrekang_scraper"
+}
+
+# Export Parquet ber-partisi (butuh pyarrow, dilewati jika tidak terinstall)
+PARQUET_CONFIG = {
+    "enabled": True,
+    "compression": "zstd"
+}
+
+# Parser alamat berbasis gazetteer kecamatan/desa (file gazetteer ikut di repo)
+ADDRESS_PARSER_CONFIG = {
+    "gazetteer_file": "enrekang_gazetteer.json",
+    "fuzzy_cutoff": 0.85,  # Rasio difflib minimum untuk ejaan yang berbeda ('Kabiolangi' -> 'Kambiolangi')
+    "cache_size": 4096
+}
+
+# Assignment kecamatan/desa dari koordinat: GeoJSON batas desa (atribut RBI WADMKC/WADMKD)
+GEO_ASSIGN_CONFIG = {
+    "enabled": True,  # Dilewati otomatis jika file batas belum ada
+    "boundaries_file": "batas_desa_enrekang.geojson",
+    "kecamatan_property": "WADMKC",
+    "desa_property": "WADMKD",
+    # Poligon kabupaten tetangga di file batas diabaikan (titik di dalamnya dianggap di luar)
+    "kabupaten_property": "WADMKK",
+    "kabupaten": "Enrekang"
+}
+
+# Merge streaming file hasil (external sort + merge), item di memori dibatasi run_size
+MERGE_CONFIG = {
+    "run_size": 100000,  # Record per run terurut yang ditulis ke disk
+    "temp_dir": None  # None = folder temp sistem
+}
+
+# Index spasial fasilitas (SQLite R*Tree) untuk query nearest/radius/bbox
+FACILITY_INDEX_CONFIG = {
+    "enabled": True,
+    "initial_radius": 1000,  # Meter, radius awal pencarian nearest (digandakan sampai cukup hasil)
+    "max_radius": 64000
+}
+
+# Export peta: GeoJSONSeq + FlatGeobuf urut Hilbert (FlatGeobuf butuh pyogrio)
+GEO_EXPORT_CONFIG = {
+    "enabled": True,
+    "properties": ["nama", "kategori", "keyword", "kecamatan", "desa", "place_id"],
+    "coordinate_precision": 6  # ~0.1 m
+}
+
+# Index cluster per zoom (ala supercluster) untuk peta statis
+CLUSTER_CONFIG = {
+    "enabled": True,
+    "radius": 60,  # Radius cluster dalam piksel tile
+    "extent": 512,  # Ukuran tile dalam piksel
+    "min_zoom": 0,
+    "max_zoom": 16  # Di atas zoom ini semua fasilitas tampil sebagai titik
+}
+
+# Record/replay halaman Maps untuk benchmark ekstraksi offline
+REPLAY_CONFIG = {
+    "directory": "replay_recordings",
+    "port": 8765
+}
+
+# Query planner: konsolidasi keyword berdasarkan overlap hasil run sebelumnya
+PLANNER_CONFIG = {
+    "min_yield_per_search": 0.5,  # Skip keyword dengan rata-rata < 0.5 tempat unik baru per pencarian
+    "merge_containment": 0.8,  # Keyword A digabung ke B jika >= 80% tempat A juga ditemukan B
+    "category_coverage": 0.95  # Subset keyword per kategori yang menutup 95% tempat kategori
+}
+
+# Mode pool: beberapa proses worker, masing-masing dengan browser sendiri
+POOL_CONFIG = {
+    "workers": 1,
+    "sessions": 1,  # Jumlah sesi browser konkuren dalam satu proses (asyncio)
+    "startup_stagger": 10,  # Detik jeda antar start browser worker
+    "result_poll_interval": 5  # Detik cek worker yang mati
+}
@@ -1,29 +1,87 @@
 import json
 import csv
 import os
+import math
 from datetime import datetime
-from config import OUTPUT_FILES
+from config import CLUSTER_CONFIG, FACILITY_INDEX_CONFIG, GEO_EXPORT_CONFIG, LOAD_CONFIG, OUTPUT_FILES, \
+    PARQUET_CONFIG
+from grid_index import CoordinateGridIndex
+from bulk_dedupe import bulk_deduplicate, print_dedupe_report
+from journal import RecordJournal, read_journal
+from record_stream import iter_records, write_json_stream
+
+def parse_coordinates(item):
+    """Ambil (lat, lng) numerik dari item, None jika tidak ada/tidak valid"""
+    lat = item.get('latitude')
+    lng = item.get('longitude')
+    
+    if lat is None or lng is None:
+        return None
+    
+    try:
+        coordinates = (float(lat), float(lng))
+    except (ValueError, TypeError):
+        return None
+    
+    if not (math.isfinite(coordinates[0]) and math.isfinite(coordinates[1])):
+        return None
+    
+    return coordinates
+
+def identity_of(item):
+    """Key identitas yang dipakai semua dedupe: (nama_kecamatan_desa, url, koordinat).
+
+    Satu-satunya tempat normalisasi identitas; url None/kosong jadi '' (bukan 'None').
+    """
+    nama = str(item.get('nama', '')).lower().strip()
+    kecamatan = str(item.get('kecamatan', '')).lower().strip()
+    desa = str(item.get('desa', '')).lower().strip()
+    url = str(item.get('url') or '').strip()
+    return f"{nama}_{kecamatan}_{desa}", url, parse_coordinates(item)
+
+def print_saved_files(files):
+    """Ringkasan file hasil save_to_files (format opsional hanya dicetak jika ditulis)"""
+    print(f"\n💾 Data final disimpan:")
+    print(f"   📄 JSON: {files['json']}")
+    print(f"   📊 CSV: {files['csv']}")
+    if files['parquet']:
+        print(f"   🧱 Parquet: {files['parquet']}")
+    if files['geojsonseq']:
+        print(f"   🗺️  GeoJSONSeq: {files['geojsonseq']}")
+    if files['flatgeobuf']:
+        print(f"   🗺️  FlatGeobuf: {files['flatgeobuf']}")
+    if files['clusters']:
+        print(f"   🧭 Cluster: {files['clusters']}")
 
 class DataManager:
-    def __init__(self):
+    def __init__(self, journal_file=None, index_file=None):
         self.data = []
         self.processed_names = set()
         self.processed_urls = set()
-        self.processed_coordinates = set()  # Add coordinate tracking
+        self.coordinate_index = CoordinateGridIndex()  # Grid index untuk cek koordinat dekat
+        
+        # Mode identity-only: record lama tetap di snapshot, self.data hanya berisi record baru
+        self.snapshot_file = None
+        self.snapshot_count = 0
+        
+        # Journal append-only untuk record baru (None = tanpa journal)
+        self.journal_file = journal_file
+        self.journal = RecordJournal(journal_file) if journal_file else None
+        
+        # Index spasial SQLite R*Tree, di-update setiap record diterima (None = tanpa index)
+        self.facility_index = None
+        if index_file and FACILITY_INDEX_CONFIG["enabled"]:
+            from facility_index import FacilityIndex
+            self.facility_index = FacilityIndex(index_file)
         
     def comprehensive_duplicate_check(self, item):
         """Comprehensive duplicate detection"""
-        nama = str(item.get('nama', '')).lower().strip()
-        kecamatan = str(item.get('kecamatan', '')).lower().strip()
-        desa = str(item.get('desa', '')).lower().strip()
-        url = str(item.get('url', '')).strip()
-        lat = item.get('latitude')
-        lng = item.get('longitude')
+        location_id, url, coordinates = identity_of(item)
         
         # 1. Check nama + kecamatan + desa combination
-        location_id = f"{nama}_{kecamatan}_{desa}"
         if location_id in self.processed_names:
-            print(f"🔍 Duplikat terdeteksi (nama-kecamatan-desa): {nama} | {kecamatan} | {desa}")
+            print(f"🔍 Duplikat terdeteksi (nama-kecamatan-desa): {item.get('nama')} | {item.get('kecamatan')} | "
+                  f"{item.get('desa')}")
             return True
         
         # 2. Check URL duplicate
@@ -31,26 +89,14 @@ class DataManager:
             print(f"🔍 Duplikat terdeteksi (URL): {url[:50]}...")
             return True
         
-        # 3. Check coordinate duplicate (dalam radius 50 meter)
-        if lat is not None and lng is not None:
-            try:
-                lat_float = float(lat)
-                lng_float = float(lng)
-                coord_key = f"{lat_float:.4f}_{lng_float:.4f}"
-                
-                # Check if coordinates are too close (within 50 meters approximately)
-                for existing_coord in self.processed_coordinates:
-                    existing_lat, existing_lng = map(float, existing_coord.split('_'))
-                    
-                    # Simple distance check (approximately 50 meters = 0.0005 degrees)
-                    if (abs(lat_float - existing_lat) < 0.0005 and 
-                        abs(lng_float - existing_lng) < 0.0005):
-                        print(f"🔍 Duplikat terdeteksi (koordinat dekat): {lat_float}, {lng_float}")
-                        return True
-                
-                self.processed_coordinates.add(coord_key)
-            except (ValueError, TypeError):
-                pass
+        # 3. Check coordinate duplicate (dalam radius 50 meter) hanya di cell tetangga
+        if coordinates:
+            lat_float, lng_float = coordinates
+            if self.coordinate_index.has_nearby(lat_float, lng_float):
+                print(f"🔍 Duplikat terdeteksi (koordinat dekat): {lat_float}, {lng_float}")
+                return True
+            
+            self.coordinate_index.add(lat_float, lng_float)
         
         # 4. Add to tracking sets
         self.processed_names.add(location_id)
@@ -63,6 +109,10 @@ class DataManager:
         """Enhanced add data dengan comprehensive duplicate check"""
         if not self.comprehensive_duplicate_check(item):
             self.data.append(item)
+            if self.journal:
+                self.journal.append(item)
+            if self.facility_index is not None:
+                self.facility_index.add(item)
             print(f"✅ Data ditambahkan: {item.get('nama')} | {item.get('kecamatan')} | {item.get('desa')}")
             return True
         else:
@@ -73,52 +123,39 @@ class DataManager:
         """Remove duplicates from loaded data"""
         print("🔄 Removing duplicates from existing data...")
         
+        # Cleanup langsung mengisi tracking sets + grid index yang dipakai comprehensive_duplicate_check
         unique_data = []
-        seen_identifiers = set()
-        seen_urls = set()
-        seen_coordinates = set()
+        self.processed_names = set()
+        self.processed_urls = set()
+        self.coordinate_index = CoordinateGridIndex()
+        seen_identifiers = self.processed_names
+        seen_urls = self.processed_urls
+        seen_coordinates = self.coordinate_index
         
         for item in self.data:
-            nama = str(item.get('nama', '')).lower().strip()
-            kecamatan = str(item.get('kecamatan', '')).lower().strip()
-            desa = str(item.get('desa', '')).lower().strip()
-            url = str(item.get('url', '')).strip()
-            lat = item.get('latitude')
-            lng = item.get('longitude')
-            
-            # Create unique identifier
-            location_id = f"{nama}_{kecamatan}_{desa}"
+            location_id, url, coordinates = identity_of(item)
             
             is_duplicate = False
             
             # Check duplicates
             if location_id in seen_identifiers:
                 is_duplicate = True
-                print(f"🗑️  Removing duplicate (location): {nama} | {kecamatan} | {desa}")
+                print(f"🗑️  Removing duplicate (location): {item.get('nama')} | {item.get('kecamatan')} | "
+                      f"{item.get('desa')}")
             
             elif url and url in seen_urls:
                 is_duplicate = True
                 print(f"🗑️  Removing duplicate (URL): {url[:50]}...")
             
-            elif lat is not None and lng is not None:
-                try:
-                    lat_float = float(lat)
-                    lng_float = float(lng)
-                    coord_key = f"{lat_float:.4f}_{lng_float:.4f}"
-                    
-                    # Check coordinate proximity
-                    for existing_coord in seen_coordinates:
-                        existing_lat, existing_lng = map(float, existing_coord.split('_'))
-                        if (abs(lat_float - existing_lat) < 0.0005 and 
-                            abs(lng_float - existing_lng) < 0.0005):
-                            is_duplicate = True
-                            print(f"🗑️  Removing duplicate (coordinates): {lat_float}, {lng_float}")
-                            break
-                    
-                    if not is_duplicate:
-                        seen_coordinates.add(coord_key)
-                except:
-                    pass
+            elif coordinates:
+                lat_float, lng_float = coordinates
+                
+                # Check coordinate proximity
+                if seen_coordinates.has_nearby(lat_float, lng_float):
+                    is_duplicate = True
+                    print(f"🗑️  Removing duplicate (coordinates): {lat_float}, {lng_float}")
+                else:
+                    seen_coordinates.add(lat_float, lng_float)
             
             if not is_duplicate:
                 unique_data.append(item)
@@ -133,70 +170,152 @@ class DataManager:
         print(f"🧹 Cleanup selesai: {removed_count} duplikat dihapus dari {original_count} data")
         return removed_count
     
-    def load_existing_data(self, filename=None):
-        """Enhanced load dengan duplicate removal"""
+    def bulk_remove_duplicates(self):
+        """Vectorized dedupe untuk dataset besar (keputusan sama dengan remove_duplicates_from_existing_data)"""
+        self.data, report = bulk_deduplicate(self.data)
+        print_dedupe_report(report)
+        
+        self.rebuild_tracking_sets()
+        return report["removed"]
+    
+    def is_known(self, location_id, url, coordinates):
+        """Cek duplikat tanpa print (urutan cek sama dengan comprehensive_duplicate_check)"""
+        if location_id in self.processed_names:
+            return True
+        if url and url in self.processed_urls:
+            return True
+        return bool(coordinates) and self.coordinate_index.has_nearby(*coordinates)
+    
+    def track_identity(self, location_id, url, coordinates):
+        self.processed_names.add(location_id)
+        if url:
+            self.processed_urls.add(url)
+        if coordinates:
+            self.coordinate_index.add(*coordinates)
+    
+    def load_identities(self, filename):
+        """Stream snapshot ke tracking sets + grid index tanpa menyimpan record (False jika snapshot berduplikat)"""
+        total = 0
+        duplicates = 0
+        for item in iter_records(filename):
+            identity = identity_of(item)
+            if self.is_known(*identity):
+                duplicates += 1
+            else:
+                self.track_identity(*identity)
+            total += 1
+        
+        if duplicates:
+            # Snapshot lama belum bersih: perlu load penuh supaya duplikatnya ikut dibuang
+            print(f"⚠️  Snapshot berisi {duplicates} duplikat, load penuh untuk cleanup")
+            self.processed_names = set()
+            self.processed_urls = set()
+            self.coordinate_index = CoordinateGridIndex()
+            return False
+        
+        self.snapshot_file = filename
+        self.snapshot_count = total
+        print(f"📂 Loaded {total} identitas dari {filename} (record tetap di snapshot)")
+        return True
+    
+    def load_existing_data(self, filename=None, identity_only=None):
+        """Enhanced load dengan duplicate removal (snapshot + replay journal).
+        
+        identity_only (default dari LOAD_CONFIG) hanya mengisi tracking sets dari stream snapshot;
+        dipakai saat resume scraping. Proses yang mengubah record lama butuh load penuh (False).
+        """
         if not filename:
             filename = OUTPUT_FILES["json"]
-            
+        if identity_only is None:
+            identity_only = LOAD_CONFIG["identity_only"]
+        
+        self.data = []
+        self.snapshot_file = None
+        self.snapshot_count = 0
+        
+        if identity_only and os.path.exists(filename):
+            try:
+                if self.load_identities(filename):
+                    self.replay_journal_identities()
+                    # Index bisa tertinggal dari snapshot (mis. dihapus atau dari run lain): sync dari stream
+                    if self.facility_index is not None:
+                        report = self.facility_index.sync(self.iter_all_records())
+                        print(f"🗂️  Index spasial: +{report['added']} baru, -{report['removed']} dihapus, "
+                              f"total {report['total']}")
+                    return True
+            except Exception as e:
+                print(f"⚠️ Error loading existing data: {e}")
+                return False
+        
+        loaded = False
         if os.path.exists(filename):
             try:
-                with open(filename, 'r', encoding='utf-8') as f:
-                    existing_data = json.load(f)
-                    
-                if "data" in existing_data:
-                    self.data = existing_data["data"]
-                else:
-                    self.data = existing_data
-                
-                original_count = len(self.data)
-                print(f"📂 Loaded {original_count} existing data from {filename}")
-                
-                # Remove duplicates from loaded data
-                removed_count = self.remove_duplicates_from_existing_data()
-                
-                # Rebuild tracking sets
-                self.rebuild_tracking_sets()
+                self.data = list(iter_records(filename))
                 
-                final_count = len(self.data)
-                print(f"✅ Final data count after cleanup: {final_count} (removed {removed_count} duplicates)")
-                
-                return True
+                print(f"📂 Loaded {len(self.data)} existing data from {filename}")
+                loaded = True
                 
             except Exception as e:
                 print(f"⚠️ Error loading existing data: {e}")
                 return False
         
-        return False
+        # Replay record yang belum ter-compact ke snapshot (mis. setelah crash)
+        if self.journal_file:
+            journal_records = read_journal(self.journal_file)
+            if journal_records:
+                self.data.extend(journal_records)
+                print(f"📜 Replayed {len(journal_records)} record dari journal {self.journal_file}")
+                loaded = True
+        
+        if not loaded:
+            return False
+        
+        # Remove duplicates from loaded data dengan bulk engine, lalu bangun tracking sets
+        removed_count = self.bulk_remove_duplicates()
+        
+        final_count = len(self.data)
+        print(f"✅ Final data count after cleanup: {final_count} (removed {removed_count} duplicates)")
+        
+        if self.facility_index is not None:
+            report = self.facility_index.sync(self.data)
+            print(f"🗂️  Index spasial: +{report['added']} baru, -{report['removed']} dihapus, total {report['total']}")
+        
+        return True
+    
+    def replay_journal_identities(self):
+        """Replay journal di mode identity-only: record baru masuk self.data, duplikat dibuang diam-diam"""
+        replayed = 0
+        for item in read_journal(self.journal_file) if self.journal_file else []:
+            identity = identity_of(item)
+            if self.is_known(*identity):
+                continue
+            self.track_identity(*identity)
+            self.data.append(item)
+            replayed += 1
+        
+        if replayed:
+            print(f"📜 Replayed {replayed} record dari journal {self.journal_file}")
+        print(f"✅ Siap resume: {self.count()} data ({len(self.processed_names)} identitas)")
+        return True
+    
+    def count(self):
+        """Jumlah record dataset, termasuk yang hanya ada di snapshot (mode identity-only)"""
+        return self.snapshot_count + len(self.data)
+    
+    def iter_all_records(self):
+        """Stream seluruh dataset: record snapshot (mode identity-only) lalu self.data"""
+        if self.snapshot_file:
+            yield from iter_records(self.snapshot_file)
+        yield from self.data
     
     def rebuild_tracking_sets(self):
         """Rebuild tracking sets from cleaned data"""
         self.processed_names = set()
         self.processed_urls = set()
-        self.processed_coordinates = set()
+        self.coordinate_index = CoordinateGridIndex()
         
         for item in self.data:
-            nama = str(item.get('nama', '')).lower().strip()
-            kecamatan = str(item.get('kecamatan', '')).lower().strip()
-            desa = str(item.get('desa', '')).lower().strip()
-            url = str(item.get('url', '')).strip()
-            lat = item.get('latitude')
-            lng = item.get('longitude')
-            
-            # Add to tracking
-            location_id = f"{nama}_{kecamatan}_{desa}"
-            self.processed_names.add(location_id)
-            
-            if url:
-                self.processed_urls.add(url)
-            
-            if lat is not None and lng is not None:
-                try:
-                    lat_float = float(lat)
-                    lng_float = float(lng)
-                    coord_key = f"{lat_float:.4f}_{lng_float:.4f}"
-                    self.processed_coordinates.add(coord_key)
-                except:
-                    pass
+            self.track_identity(*identity_of(item))
 
     def validate_final_data_integrity(self):
         """Final validation before saving"""
@@ -207,16 +326,12 @@ class DataManager:
         urls = set()
         duplicates_found = 0
         
-        for i, item in enumerate(self.data):
-            nama = str(item.get('nama', '')).lower().strip()
-            kecamatan = str(item.get('kecamatan', '')).lower().strip()
-            desa = str(item.get('desa', '')).lower().strip()
-            url = str(item.get('url', '')).strip()
-            
-            location_id = f"{nama}_{kecamatan}_{desa}"
+        for i, item in enumerate(self.iter_all_records()):
+            location_id, url, _ = identity_of(item)
             
             if location_id in location_ids:
-                print(f"⚠️  Duplicate found at index {i}: {nama} | {kecamatan} | {desa}")
+                print(f"⚠️  Duplicate found at index {i}: {item.get('nama')} | {item.get('kecamatan')} | "
+                      f"{item.get('desa')}")
                 duplicates_found += 1
             else:
                 location_ids.add(location_id)
@@ -234,13 +349,122 @@ class DataManager:
         
         return duplicates_found == 0
 
+    def get_stats(self):
+        """Statistik jumlah data per kecamatan dan per keyword"""
+        by_district = {}
+        by_keyword = {}
+        
+        for item in self.iter_all_records():
+            district = item.get('kecamatan') or "Unknown"
+            keyword = item.get('keyword') or "Unknown"
+            by_district[district] = by_district.get(district, 0) + 1
+            by_keyword[keyword] = by_keyword.get(keyword, 0) + 1
+        
+        return {"total": self.count(), "by_district": by_district, "by_keyword": by_keyword}
+    
+    def write_atomic(self, filename, write_func):
+        """Tulis ke file sementara lalu replace, snapshot lama tetap utuh jika crash"""
+        temp_filename = f"{filename}.tmp"
+        
+        with open(temp_filename, 'w', encoding='utf-8', newline='') as f:
+            write_func(f)
+            f.flush()
+            os.fsync(f.fileno())
+        
+        os.replace(temp_filename, filename)
+        return filename
+    
+    def save_to_json(self, filename=None):
+        """Simpan snapshot JSON lengkap"""
+        filename = filename or OUTPUT_FILES["json"]
+        
+        if self.snapshot_file:
+            # Compaction streaming: snapshot lama + record baru, lalu record baru dilepas dari RAM
+            count = 0
+            
+            def write_stream(f):
+                nonlocal count
+                count = write_json_stream(f, self.iter_all_records())
+            
+            self.write_atomic(filename, write_stream)
+            self.snapshot_file = filename
+            self.snapshot_count = count
+            self.data = []
+            return filename
+        
+        document = {
+            "scraped_at": datetime.now().isoformat(),
+            "total_count": len(self.data),
+            "data": self.data
+        }
+        
+        return self.write_atomic(filename, lambda f: json.dump(document, f, ensure_ascii=False, indent=2))
+    
+    def save_to_csv(self, filename=None):
+        """Simpan snapshot CSV lengkap"""
+        filename = filename or OUTPUT_FILES["csv"]
+        fieldnames = sorted({key for item in self.iter_all_records() for key in item.keys()})
+        
+        def write_csv(f):
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(self.iter_all_records())
+        
+        return self.write_atomic(filename, write_csv)
+    
+    def save_to_parquet(self, directory=None):
+        """Export Parquet ber-partisi kecamatan/kategori (None jika dinonaktifkan atau pyarrow tidak ada)"""
+        if not PARQUET_CONFIG["enabled"]:
+            return None
+        from parquet_export import export_parquet
+        return export_parquet(self.iter_all_records(), directory)
+    
+    def save_to_geo(self):
+        """Export peta: GeoJSONSeq dan FlatGeobuf urut Hilbert (FlatGeobuf None jika pyogrio tidak ada)"""
+        if not GEO_EXPORT_CONFIG["enabled"]:
+            return {"geojsonseq": None, "flatgeobuf": None}
+        from geo_export import export_flatgeobuf, write_geojsonseq
+        geojsonseq_file = self.write_atomic(OUTPUT_FILES["geojsonseq"],
+                                            lambda f: write_geojsonseq(f, self.iter_all_records()))
+        return {"geojsonseq": geojsonseq_file, "flatgeobuf": export_flatgeobuf(self.iter_all_records())}
+    
+    def save_to_clusters(self, filename=None):
+        """Bangun index cluster per zoom untuk peta (None jika dinonaktifkan)"""
+        if not CLUSTER_CONFIG["enabled"]:
+            return None
+        from cluster_index import build_cluster_index
+        index = build_cluster_index(self.iter_all_records())
+        return self.write_atomic(filename or OUTPUT_FILES["clusters"],
+                                 lambda f: json.dump(index, f, ensure_ascii=False, separators=(",", ":")))
+    
+    def checkpoint(self):
+        """Checkpoint murah: hanya fsync batch journal yang tertunda (O(record baru))"""
+        if self.journal:
+            self.journal.sync()
+        return self.count()
+    
     def save_to_files(self):
-        """Enhanced save dengan final validation"""
+        """Compaction: tulis snapshot JSON/CSV lalu kosongkan journal (export berikutnya dibaca dari snapshot baru)"""
         # Final integrity check
         self.validate_final_data_integrity()
         
         # Save files
         json_file = self.save_to_json()
         csv_file = self.save_to_csv()
+        parquet_directory = self.save_to_parquet()
+        geo_files = self.save_to_geo()
+        cluster_file = self.save_to_clusters()
         
-        return {"json": json_file, "csv": csv_file}
\ No newline at end of file
+        # Record di journal sekarang sudah ada di snapshot
+        if self.journal:
+            self.journal.truncate()
+        
+        return {"json": json_file, "csv": csv_file, "parquet": parquet_directory, **geo_files,
+                "clusters": cluster_file}
+    
+    def close(self):
+        """Tutup journal (sync batch terakhir)"""
+        if self.journal:
+            self.journal.close()
+        if self.facility_index is not None:
+            self.facility_index.close()
\ No newline at end of file
@@ -0,0 +1,162 @@
+from selenium.common.exceptions import WebDriverException
+from config import DOM_WAIT_CONFIG
+
+# Selector Google Maps yang dipakai untuk menentukan kapan halaman "siap"
+FEED_SELECTOR = "[role='feed']"
+CARD_SELECTOR = ".hfpxzc"
+FEED_END_SELECTOR = ".HlvSq"  # "Anda telah mencapai akhir daftar."
+PLACE_TITLE_SELECTOR = "h1.DUwDvf"
+ADDRESS_SELECTOR = ".Io6YTe"
+
+# waitUntil(check, root, timeoutMs, done): evaluasi check() setiap ada mutasi DOM di root
+# atau navigasi lewat history API, resolve begitu check().ready atau saat timeout
+WAIT_PRELUDE = """
+function waitUntil(check, root, timeoutMs, done) {
+    let finished = false;
+    let timer = null;
+    const cleanups = [];
+
+    function finish(state) {
+        if (finished) return;
+        finished = true;
+        clearTimeout(timer);
+        cleanups.forEach(fn => fn());
+        done(state);
+    }
+
+    function probe() {
+        if (finished) return;
+        const state = check();
+        if (state.ready) finish(state);
+    }
+
+    const observer = new MutationObserver(probe);
+    observer.observe(root || document.documentElement, {childList: true, subtree: true});
+    cleanups.push(() => observer.disconnect());
+
+    ['pushState', 'replaceState'].forEach(name => {
+        const original = history[name];
+        history[name] = function() {
+            const result = original.apply(this, arguments);
+            setTimeout(probe, 0);
+            return result;
+        };
+        cleanups.push(() => { history[name] = original; });
+    });
+    window.addEventListener('popstate', probe);
+    cleanups.push(() => window.removeEventListener('popstate', probe));
+
+    timer = setTimeout(() => {
+        const state = check();
+        state.timed_out = !state.ready;
+        finish(state);
+    }, timeoutMs);
+
+    probe();
+}
+"""
+
+URL_CHANGE_SCRIPT = """
+const originalUrl = arguments[1];
+waitUntil(() => {
+    const url = location.href;
+    return {ready: url !== originalUrl, url: url};
+}, document.documentElement, arguments[0], arguments[arguments.length - 1]);
+"""
+
+SEARCH_RESULTS_SCRIPT = """
+const originalUrl = arguments[1];
+const previousFirstHref = arguments[2];
+waitUntil(() => {
+    const feed = document.querySelector("%(feed)s");
+    const staleFeed = !!feed && feed.dataset.staleResults === "1";
+    const firstCard = feed ? feed.querySelector("%(card)s") : null;
+    const title = document.querySelector("%(title)s");
+    // Feed/judul yang sudah ditandai mark_stale_results() adalah hasil pencarian sebelumnya,
+    // sehingga query identik (URL sama, mis. retry) tetap resolve tanpa menunggu navigasi
+    const freshFeed = !!firstCard && (!staleFeed || firstCard.href !== previousFirstHref);
+    const place = !!title && title.dataset.staleResults !== "1";
+    const end = !!feed && !staleFeed && !!feed.querySelector("%(end)s");
+    return {
+        ready: freshFeed || place || end,
+        navigated: location.href !== originalUrl,
+        feed: !!feed,
+        place: place,
+        count: feed ? feed.querySelectorAll("%(card)s").length : 0
+    };
+}, document.documentElement, arguments[0], arguments[arguments.length - 1]);
+""" % {"feed": FEED_SELECTOR, "card": CARD_SELECTOR, "title": PLACE_TITLE_SELECTOR, "end": FEED_END_SELECTOR}
+
+FEED_GROWTH_SCRIPT = """
+const feed = arguments[1];
+const previousCount = arguments[2];
+waitUntil(() => {
+    const count = feed.querySelectorAll("%(card)s").length;
+    const end = !!feed.querySelector("%(end)s");
+    return {ready: count > previousCount || end, count: count, end: end};
+}, feed, arguments[0], arguments[arguments.length - 1]);
+""" % {"card": CARD_SELECTOR, "end": FEED_END_SELECTOR}
+
+# Nama dibandingkan setelah normalisasi (NFKC, huruf kecil, spasi/tanda baca diseragamkan)
+# karena judul h1 dan aria-label kartu sering beda kapitalisasi, spasi atau tanda kutip
+DETAIL_PANEL_SCRIPT = r"""
+function normalizeName(value) {
+    return (value || "").normalize("NFKC").toLowerCase()
+        .replace(/[\u2018\u2019\u201c\u201d'"`]/g, "")
+        .replace(/[^\p{L}\p{N}]+/gu, " ")
+        .trim();
+}
+const expectedName = normalizeName(arguments[1]);
+waitUntil(() => {
+    const title = document.querySelector("%(title)s");
+    const name = title ? title.textContent.trim() : "";
+    const address = !!document.querySelector("%(address)s");
+    const matches = !!name && (!expectedName || normalizeName(name) === expectedName);
+    return {ready: matches && address, name: name, address: address};
+}, document.documentElement, arguments[0], arguments[arguments.length - 1]);
+""" % {"title": PLACE_TITLE_SELECTOR, "address": ADDRESS_SELECTOR}
+
+def run_wait(driver, script, timeout, *args):
+    """Jalankan wait script di browser (blocking sampai resolve atau timeout)"""
+    driver.set_script_timeout(timeout + DOM_WAIT_CONFIG["script_timeout_margin"])
+    return driver.execute_async_script(WAIT_PRELUDE + script, int(timeout * 1000), *args)
+
+def wait_for_url_change(driver, original_url, timeout=None):
+    """Resolve begitu URL berubah (history API atau mutasi DOM), return URL baru atau None"""
+    timeout = timeout or DOM_WAIT_CONFIG["url_change_timeout"]
+    try:
+        state = run_wait(driver, URL_CHANGE_SCRIPT, timeout, original_url)
+    except WebDriverException:
+        # Navigasi penuh (bukan pushState) membuang dokumen tempat script menunggu
+        current_url = driver.current_url
+        return current_url if current_url != original_url else None
+    return state["url"] if state["ready"] else None
+
+def wait_for_search_results(driver, original_url, previous_first_href=None, timeout=None):
+    """Resolve begitu feed hasil baru atau detail tempat tunggal muncul setelah Enter"""
+    timeout = timeout or DOM_WAIT_CONFIG["results_timeout"]
+    return run_wait(driver, SEARCH_RESULTS_SCRIPT, timeout, original_url, previous_first_href)
+
+def wait_for_feed_growth(driver, feed, previous_count, timeout=None):
+    """Resolve begitu kartu feed bertambah atau penanda akhir daftar muncul"""
+    timeout = timeout or DOM_WAIT_CONFIG["feed_growth_timeout"]
+    return run_wait(driver, FEED_GROWTH_SCRIPT, timeout, feed, previous_count)
+
+def wait_for_detail_panel(driver, expected_name=None, timeout=None):
+    """Resolve begitu panel detail tempat (judul + alamat) ter-render"""
+    timeout = timeout or DOM_WAIT_CONFIG["detail_timeout"]
+    return run_wait(driver, DETAIL_PANEL_SCRIPT, timeout, expected_name)
+
+def mark_stale_results(driver):
+    """Tandai feed/judul saat ini sebagai hasil lama, return href kartu pertama feed (atau None)"""
+    return driver.execute_script(
+        """
+        const feed = document.querySelector(arguments[0]);
+        const title = document.querySelector(arguments[2]);
+        if (feed) feed.dataset.staleResults = "1";
+        if (title) title.dataset.staleResults = "1";
+        const card = feed ? feed.querySelector(arguments[1]) : null;
+        return card ? card.href : null;
+        """,
+        FEED_SELECTOR, CARD_SELECTOR, PLACE_TITLE_SELECTOR
+    )
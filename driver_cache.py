@@ -0,0 +1,99 @@
+import os
+import shutil
+import time
+import uuid
+import undetected_chromedriver as uc
+from config import DRIVER_CACHE_CONFIG
+
+# File yang tidak boleh ikut disalin dari/ke template profil
+PROFILE_IGNORE = shutil.ignore_patterns(
+    "Singleton*", "lockfile", "*.lock", "LOCK", "Crashpad", "Crash Reports", "BrowserMetrics*",
+    # Identitas sesi (cookie consent/NID, storage, riwayat): sesi baru tidak boleh mewarisi
+    # identitas yang mungkin sudah ditandai "blocked"; yang dibawa hanya cache yang hangat
+    "Cookies*", "Local Storage", "Session Storage", "IndexedDB", "Network", "History*", "Web Data*"
+)
+
+def driver_cache_path():
+    exe_name = "chromedriver.exe" if os.name == "nt" else "chromedriver"
+    return os.path.join(DRIVER_CACHE_CONFIG["cache_dir"], exe_name)
+
+def cached_driver_path():
+    """Chromedriver yang sudah di-patch; download + patch hanya saat cache kosong"""
+    path = driver_cache_path()
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(DRIVER_CACHE_CONFIG["cache_dir"], exist_ok=True)
+    patcher = uc.Patcher()
+    patcher.auto()
+
+    # Copy lewat file sementara supaya worker lain tidak membaca binary setengah jadi
+    temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    shutil.copy2(patcher.executable_path, temp_path)
+    os.replace(temp_path, path)
+    print(f"📦 Chromedriver ter-patch disimpan di cache: {path}")
+    return path
+
+def invalidate_driver_cache():
+    """Hapus binary cache (mis. setelah Chrome update dan versi driver tidak cocok)"""
+    try:
+        os.remove(driver_cache_path())
+        print("🗑️  Cache chromedriver dihapus")
+    except FileNotFoundError:
+        pass
+
+def template_dir():
+    return os.path.join(DRIVER_CACHE_CONFIG["cache_dir"], "profile_template")
+
+def prepare_session_profile():
+    """User-data-dir baru per sesi, disalin dari template yang sudah hangat jika ada"""
+    sessions_dir = os.path.join(DRIVER_CACHE_CONFIG["cache_dir"], "sessions")
+    os.makedirs(sessions_dir, exist_ok=True)
+    session_dir = os.path.join(sessions_dir, f"{os.getpid()}-{uuid.uuid4().hex[:8]}")
+
+    if DRIVER_CACHE_CONFIG["profile_template"] and os.path.isdir(template_dir()):
+        shutil.copytree(template_dir(), session_dir, ignore=PROFILE_IGNORE)
+    else:
+        os.makedirs(session_dir)
+
+    return session_dir
+
+def release_session_profile(session_dir):
+    """Hapus profil sesi setelah browser ditutup; cache profil pertama (tanpa cookie/storage) jadi template"""
+    if not session_dir or not os.path.isdir(session_dir):
+        return
+
+    if DRIVER_CACHE_CONFIG["profile_template"] and not os.path.isdir(template_dir()):
+        temp_dir = f"{template_dir()}.{uuid.uuid4().hex}.tmp"
+        try:
+            shutil.copytree(session_dir, temp_dir, ignore=PROFILE_IGNORE)
+            os.rename(temp_dir, template_dir())
+            print(f"🔥 Template profil hangat dibuat: {template_dir()}")
+        except OSError:
+            # Worker lain sudah lebih dulu membuat template
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    shutil.rmtree(session_dir, ignore_errors=True)
+
+class StartupTimer:
+    """Durasi tiap fase startup browser"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.last = self.started
+        self.phases = []
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def total(self):
+        return self.last - self.started
+
+    def as_dict(self):
+        return {"total": self.total(), **dict(self.phases)}
+
+    def print_report(self):
+        phases = ", ".join(f"{phase} {seconds:.1f}s" for phase, seconds in self.phases)
+        print(f"⏱️  Startup browser {self.total():.1f}s ({phases})")
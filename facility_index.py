@@ -0,0 +1,221 @@
+import argparse
+import json
+import math
+import sqlite3
+import time
+from config import FACILITY_INDEX_CONFIG, KEYWORD_CATEGORIES, OUTPUT_FILES
+from data_manager import parse_coordinates
+from query_planner import place_key
+from record_stream import iter_records
+
+METERS_PER_DEGREE = 111320.0
+
+def haversine_meters(lat1, lng1, lat2, lng2):
+    """Jarak great-circle dalam meter"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * 6371000.0 * math.asin(math.sqrt(a))
+
+def radius_bounds(lat, lng, meters):
+    """Bounding box (south, west, north, east) yang menutup lingkaran radius meter"""
+    d_lat = meters / METERS_PER_DEGREE
+    d_lng = meters / (METERS_PER_DEGREE * max(math.cos(math.radians(lat)), 1e-6))
+    return lat - d_lat, lng - d_lng, lat + d_lat, lng + d_lng
+
+class FacilityIndex:
+    """Index spasial persisten (SQLite R*Tree) untuk query nearest/radius/bbox tanpa scan file"""
+
+    def __init__(self, filename=None):
+        self.filename = filename or OUTPUT_FILES["facility_index"]
+        self.connection = sqlite3.connect(self.filename, timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute('''
+            CREATE TABLE IF NOT EXISTS facilities (
+                id INTEGER PRIMARY KEY,
+                place_key TEXT NOT NULL UNIQUE,
+                keyword TEXT,
+                kategori TEXT,
+                kecamatan TEXT,
+                latitude REAL NOT NULL,
+                longitude REAL NOT NULL,
+                record TEXT NOT NULL
+            )
+        ''')
+        self.connection.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS facility_rtree USING rtree(
+                id, min_lat, max_lat, min_lng, max_lng
+            )
+        ''')
+        self.connection.execute("CREATE INDEX IF NOT EXISTS facilities_keyword ON facilities (keyword)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS facilities_kategori ON facilities (kategori)")
+        self.connection.commit()
+
+    def upsert(self, item, key=None):
+        """Insert/replace satu record di tabel dan R*Tree (tanpa commit)"""
+        coordinates = parse_coordinates(item)
+        if not coordinates:
+            return False
+        lat, lng = coordinates
+        key = key or place_key(item)
+
+        row = self.connection.execute("SELECT id FROM facilities WHERE place_key = ?", (key,)).fetchone()
+        values = (item.get("keyword"), KEYWORD_CATEGORIES.get(item.get("keyword"), "lainnya"),
+                  item.get("kecamatan"), lat, lng, json.dumps(item, ensure_ascii=False))
+        if row:
+            facility_id = row[0]
+            self.connection.execute(
+                "UPDATE facilities SET keyword = ?, kategori = ?, kecamatan = ?, latitude = ?, longitude = ?, "
+                "record = ? WHERE id = ?", (*values, facility_id)
+            )
+            self.connection.execute("DELETE FROM facility_rtree WHERE id = ?", (facility_id,))
+        else:
+            cursor = self.connection.execute(
+                "INSERT INTO facilities (place_key, keyword, kategori, kecamatan, latitude, longitude, record) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", (key, *values)
+            )
+            facility_id = cursor.lastrowid
+
+        self.connection.execute(
+            "INSERT INTO facility_rtree (id, min_lat, max_lat, min_lng, max_lng) VALUES (?, ?, ?, ?, ?)",
+            (facility_id, lat, lat, lng, lng)
+        )
+        return True
+
+    def add(self, item):
+        """Update inkremental untuk satu record baru (dipanggil dari DataManager.add_data)"""
+        with self.connection:
+            return self.upsert(item)
+
+    def sync(self, records, refresh=False):
+        """Samakan index dengan dataset: insert record yang belum ada, hapus yang sudah hilang.
+
+        records boleh berupa stream (mis. iter_all_records): hanya key yang disimpan di memori.
+        refresh=True juga menulis ulang record yang sudah ter-index (mis. setelah assign ulang wilayah).
+        """
+        indexed = {key: facility_id for facility_id, key in
+                   self.connection.execute("SELECT id, place_key FROM facilities")}
+        seen = set()
+
+        added = 0
+        with self.connection:
+            for item in records:
+                key = place_key(item)
+                if key in seen:
+                    continue
+                seen.add(key)
+                if key in indexed:
+                    if refresh:
+                        self.upsert(item, key)
+                elif self.upsert(item, key):
+                    added += 1
+
+            stale = [(facility_id,) for key, facility_id in indexed.items() if key not in seen]
+            self.connection.executemany("DELETE FROM facilities WHERE id = ?", stale)
+            self.connection.executemany("DELETE FROM facility_rtree WHERE id = ?", stale)
+
+        return {"added": added, "removed": len(stale), "total": len(self)}
+
+    def candidates(self, south, west, north, east, keyword=None, kategori=None, kecamatan=None):
+        """Baris (record, lat, lng) di dalam bbox lewat R*Tree, difilter atribut"""
+        query = ("SELECT f.record, f.latitude, f.longitude FROM facility_rtree r "
+                 "JOIN facilities f ON f.id = r.id "
+                 "WHERE r.max_lat >= ? AND r.min_lat <= ? AND r.max_lng >= ? AND r.min_lng <= ?")
+        params = [south, north, west, east]
+        for column, value in (("keyword", keyword), ("kategori", kategori), ("kecamatan", kecamatan)):
+            if value is not None:
+                query += f" AND f.{column} = ?"
+                params.append(value)
+        return self.connection.execute(query, params).fetchall()
+
+    def within_bbox(self, south, west, north, east, **filters):
+        """Semua fasilitas di dalam bounding box"""
+        return [json.loads(record) for record, _, _ in self.candidates(south, west, north, east, **filters)]
+
+    def within_radius(self, lat, lng, meters, **filters):
+        """Fasilitas dalam radius meter, urut dari yang terdekat (dengan distance_m)"""
+        results = []
+        for record, item_lat, item_lng in self.candidates(*radius_bounds(lat, lng, meters), **filters):
+            distance = haversine_meters(lat, lng, item_lat, item_lng)
+            if distance <= meters:
+                results.append({**json.loads(record), "distance_m": round(distance, 1)})
+        results.sort(key=lambda item: item["distance_m"])
+        return results
+
+    def nearest(self, lat, lng, n=5, **filters):
+        """N fasilitas terdekat: radius bbox digandakan sampai N hasil pasti berada di dalam lingkaran"""
+        meters = FACILITY_INDEX_CONFIG["initial_radius"]
+        while meters <= FACILITY_INDEX_CONFIG["max_radius"]:
+            results = self.within_radius(lat, lng, meters, **filters)
+            if len(results) >= n:
+                return results[:n]
+            meters *= 2
+
+        # Sisa fasilitas jauh di luar kabupaten: hitung jarak semua kandidat
+        results = [
+            {**json.loads(record), "distance_m": round(haversine_meters(lat, lng, item_lat, item_lng), 1)}
+            for record, item_lat, item_lng in self.candidates(-90, -180, 90, 180, **filters)
+        ]
+        results.sort(key=lambda item: item["distance_m"])
+        return results[:n]
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM facilities").fetchone()[0]
+
+    def close(self):
+        self.connection.close()
+
+def print_results(results, elapsed):
+    for item in results:
+        distance = f" ({item['distance_m']:.0f} m)" if "distance_m" in item else ""
+        print(f"   📍 {item.get('nama')} | {item.get('keyword')} | {item.get('kecamatan')}{distance}")
+    print(f"🔎 {len(results)} hasil dalam {elapsed * 1000:.2f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query spasial fasilitas hasil scraping")
+    parser.add_argument("--index", help="File index SQLite (default dari config)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    rebuild_parser = subparsers.add_parser("sync", help="Samakan index dengan snapshot JSON/JSONL")
+    rebuild_parser.add_argument("input", nargs="?", help="Snapshot JSON/JSONL (default dari config)")
+
+    nearest_parser = subparsers.add_parser("nearest", help="N fasilitas terdekat dari titik")
+    nearest_parser.add_argument("lat", type=float)
+    nearest_parser.add_argument("lng", type=float)
+    nearest_parser.add_argument("-n", type=int, default=5)
+
+    radius_parser = subparsers.add_parser("radius", help="Fasilitas dalam radius meter")
+    radius_parser.add_argument("lat", type=float)
+    radius_parser.add_argument("lng", type=float)
+    radius_parser.add_argument("meters", type=float)
+
+    bbox_parser = subparsers.add_parser("bbox", help="Fasilitas di dalam bounding box")
+    for name in ("south", "west", "north", "east"):
+        bbox_parser.add_argument(name, type=float)
+
+    for query_parser in (nearest_parser, radius_parser, bbox_parser):
+        query_parser.add_argument("--keyword")
+        query_parser.add_argument("--kategori")
+        query_parser.add_argument("--kecamatan")
+
+    args = parser.parse_args()
+    index = FacilityIndex(args.index)
+
+    if args.command == "sync":
+        # Stream snapshot (JSON/JSONL/CSV) supaya dataset besar tidak dimuat utuh ke memori
+        report = index.sync(iter_records(args.input or OUTPUT_FILES["json"]))
+        print(f"🗂️  Index: +{report['added']} baru, -{report['removed']} dihapus, total {report['total']}")
+    else:
+        filters = {"keyword": args.keyword, "kategori": args.kategori, "kecamatan": args.kecamatan}
+        start_time = time.perf_counter()
+        if args.command == "nearest":
+            results = index.nearest(args.lat, args.lng, args.n, **filters)
+        elif args.command == "radius":
+            results = index.within_radius(args.lat, args.lng, args.meters, **filters)
+        else:
+            results = index.within_bbox(args.south, args.west, args.north, args.east, **filters)
+        print_results(results, time.perf_counter() - start_time)
+
+    index.close()
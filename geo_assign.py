@@ -0,0 +1,199 @@
+import argparse
+import functools
+import json
+import os
+import numpy as np
+from config import GEO_ASSIGN_CONFIG, OUTPUT_FILES
+from data_manager import parse_coordinates
+from address_parser import UNKNOWN, load_gazetteer, name_key, parse_address
+
+class Boundary:
+    """Satu poligon desa/kelurahan: ring (lng, lat) sebagai array numpy + bounding box"""
+
+    def __init__(self, kecamatan, desa, rings):
+        self.kecamatan = kecamatan
+        self.desa = desa
+        self.rings = [np.asarray(ring, dtype=np.float64)[:, :2] for ring in rings]
+        points = np.vstack(self.rings)
+        self.west, self.south = points.min(axis=0)
+        self.east, self.north = points.max(axis=0)
+
+    def contains(self, lngs, lats):
+        """Mask titik di dalam poligon (ray casting even-odd, semua ring sekaligus -> hole ikut benar)"""
+        inside = np.zeros(len(lngs), dtype=bool)
+        for ring in self.rings:
+            x1, y1 = ring[:, 0], ring[:, 1]
+            x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+
+            # Matriks titik × edge: edge memotong garis horizontal titik di sebelah kanan titik
+            py = lats[:, None]
+            crosses = (y1 > py) != (y2 > py)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                x_cross = x1 + (py - y1) * (x2 - x1) / (y2 - y1)
+            inside ^= (np.count_nonzero(crosses & (lngs[:, None] < x_cross), axis=1) % 2).astype(bool)
+        return inside
+
+def official_names(kecamatan, desa):
+    """Nama dari properti RBI (mis. 'BUNTU BATU') ke ejaan gazetteer/DISTRICTS.
+
+    Kecamatan None jika tidak ada di gazetteer (poligon di luar kabupaten); desa yang
+    tidak cocok tetap memakai nama asli.
+    """
+    gazetteer = load_gazetteer()
+    official_kecamatan = gazetteer.match_kecamatan(kecamatan or "")
+    if not official_kecamatan:
+        return None, None
+    official_desa = gazetteer.match_desa(desa or "", official_kecamatan)[0]
+    return official_kecamatan, official_desa or desa
+
+def in_kabupaten_feature(properties):
+    """False untuk feature yang properti kabupatennya jelas bukan kabupaten target"""
+    value = properties.get(GEO_ASSIGN_CONFIG["kabupaten_property"])
+    return not value or name_key(GEO_ASSIGN_CONFIG["kabupaten"]) in name_key(str(value))
+
+def address_location(item):
+    """(kecamatan, desa) menurut alamat saja.
+
+    Field kecamatan di record bisa berisi kecamatan pencarian sebagai fallback, jadi
+    alamat di-parse ulang (di-cache) supaya fallback itu tidak dianggap "kata alamat".
+    """
+    if not item.get("address"):
+        return UNKNOWN, UNKNOWN
+    location = parse_address(item["address"])
+    return location["kecamatan"], location["desa"]
+
+class BoundaryStore:
+    """Poligon batas desa dari GeoJSON, di-load sekali dan di-prefilter dengan bounding box"""
+
+    def __init__(self, filename=None):
+        self.filename = filename or GEO_ASSIGN_CONFIG["boundaries_file"]
+        with open(self.filename, 'r', encoding='utf-8') as f:
+            collection = json.load(f)
+
+        self.boundaries = []
+        self.skipped = 0  # Poligon di luar kabupaten (tidak ada di gazetteer)
+        for feature in collection.get("features", []):
+            geometry = feature.get("geometry") or {}
+            properties = feature.get("properties") or {}
+            if geometry.get("type") == "Polygon":
+                polygons = [geometry["coordinates"]]
+            elif geometry.get("type") == "MultiPolygon":
+                polygons = geometry["coordinates"]
+            else:
+                continue
+            kecamatan, desa = official_names(
+                properties.get(GEO_ASSIGN_CONFIG["kecamatan_property"]),
+                properties.get(GEO_ASSIGN_CONFIG["desa_property"])
+            )
+            if kecamatan is None or not in_kabupaten_feature(properties):
+                self.skipped += 1
+                continue
+            for rings in polygons:
+                self.boundaries.append(Boundary(kecamatan, desa, rings))
+
+        # Bounding box semua poligon dalam array untuk prefilter vektor
+        self.bounds = np.array([(b.south, b.west, b.north, b.east) for b in self.boundaries], dtype=np.float64)
+
+    def assign(self, lats, lngs):
+        """(kecamatan, desa) untuk setiap titik, (None, None) jika di luar semua poligon"""
+        lats = np.asarray(lats, dtype=np.float64)
+        lngs = np.asarray(lngs, dtype=np.float64)
+        kecamatan = np.full(len(lats), None, dtype=object)
+        desa = np.full(len(lats), None, dtype=object)
+        unassigned = np.ones(len(lats), dtype=bool)
+
+        for index, boundary in enumerate(self.boundaries):
+            south, west, north, east = self.bounds[index]
+            candidates = np.flatnonzero(
+                unassigned & (lats >= south) & (lats <= north) & (lngs >= west) & (lngs <= east)
+            )
+            if not len(candidates):
+                continue
+            hits = candidates[boundary.contains(lngs[candidates], lats[candidates])]
+            kecamatan[hits] = boundary.kecamatan
+            desa[hits] = boundary.desa
+            unassigned[hits] = False
+            if not unassigned.any():
+                break
+
+        return list(zip(kecamatan, desa))
+
+@functools.lru_cache(maxsize=None)
+def load_boundaries(filename=None):
+    """BoundaryStore bersama, None jika fitur dimatikan atau file GeoJSON belum tersedia"""
+    filename = filename or GEO_ASSIGN_CONFIG["boundaries_file"]
+    if not GEO_ASSIGN_CONFIG["enabled"]:
+        return None
+    if not os.path.exists(filename):
+        print(f"⚠️  File batas wilayah {filename} tidak ditemukan, assignment geometri dilewati")
+        return None
+    store = BoundaryStore(filename)
+    print(f"🗺️  {len(store.boundaries)} poligon batas desa dimuat dari {filename}"
+          + (f", {store.skipped} poligon di luar kabupaten diabaikan" if store.skipped else ""))
+    return store
+
+def assign_records(records, store=None):
+    """Set kecamatan/desa dari geometri dalam satu batch, return (record di dalam, record di luar).
+
+    Nilai dari alamat yang berbeda dengan geometri disimpan di field geo_mismatch
+    ("kecamatan | desa" versi alamat). Record tanpa koordinat dibiarkan apa adanya.
+    """
+    store = store or load_boundaries()
+    if store is None:
+        return list(records), []
+
+    located = [(item, parse_coordinates(item)) for item in records]
+    points = [coordinates for _, coordinates in located if coordinates]
+    assignments = iter(store.assign([lat for lat, _ in points], [lng for _, lng in points]) if points else [])
+
+    inside, outside = [], []
+    for item, coordinates in located:
+        if not coordinates:
+            inside.append(item)
+            continue
+
+        kecamatan, desa = next(assignments)
+        if kecamatan is None:
+            outside.append(item)
+            continue
+
+        address_kecamatan, address_desa = address_location(item)
+        kecamatan_differs = address_kecamatan != UNKNOWN and name_key(address_kecamatan) != name_key(kecamatan)
+        desa_differs = address_desa != UNKNOWN and name_key(address_desa) != name_key(desa or "")
+        if kecamatan_differs or desa_differs:
+            item["geo_mismatch"] = f"{address_kecamatan} | {address_desa}"
+        else:
+            item.pop("geo_mismatch", None)
+
+        item["kecamatan"] = kecamatan
+        item["desa"] = desa or UNKNOWN
+        inside.append(item)
+
+    return inside, outside
+
+if __name__ == "__main__":
+    # Pass batch: assign ulang seluruh dataset, buang titik di luar kabupaten, lalu compaction
+    parser = argparse.ArgumentParser(description="Assign kecamatan/desa dari koordinat (point-in-polygon)")
+    parser.add_argument("--boundaries", help="GeoJSON batas desa (default dari config)")
+    args = parser.parse_args()
+
+    store = load_boundaries(args.boundaries)
+    if store is None:
+        raise SystemExit(1)
+
+    from data_manager import DataManager
+
+    manager = DataManager(journal_file=OUTPUT_FILES["journal"], index_file=OUTPUT_FILES["facility_index"])
+    manager.load_existing_data(identity_only=False)
+    inside, outside = assign_records(manager.data, store)
+    manager.data = inside
+    manager.rebuild_tracking_sets()
+    if manager.facility_index is not None:
+        # refresh: kecamatan/desa record yang sudah ter-index ikut diperbarui
+        manager.facility_index.sync(manager.data, refresh=True)
+
+    mismatches = sum(1 for item in inside if item.get("geo_mismatch"))
+    files = manager.save_to_files()
+    manager.close()
+    print(f"📐 {len(inside)} record di-assign, {mismatches} beda dengan alamat, {len(outside)} di luar kabupaten dibuang")
+    print(f"💾 Disimpan: {files['json']}, {files['csv']}")
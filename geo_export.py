@@ -0,0 +1,110 @@
+import argparse
+import json
+import os
+import shutil
+import struct
+import numpy as np
+from config import GEO_EXPORT_CONFIG, KEYWORD_CATEGORIES, OUTPUT_FILES
+from data_manager import parse_coordinates
+
+def hilbert_index(lats, lngs, order=16):
+    """Posisi titik di kurva Hilbert 2^order × 2^order di atas bbox data (vektor numpy)"""
+    lats = np.asarray(lats, dtype=np.float64)
+    lngs = np.asarray(lngs, dtype=np.float64)
+    side = (1 << order) - 1
+
+    def scale(values):
+        span = values.max() - values.min()
+        if span == 0:
+            return np.zeros(len(values), dtype=np.int64)
+        return ((values - values.min()) / span * side).astype(np.int64)
+
+    x, y = scale(lngs), scale(lats)
+    index = np.zeros(len(x), dtype=np.int64)
+    s = 1 << (order - 1)
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        index += s * s * ((3 * rx) ^ ry)
+        # Rotasi kuadran supaya kurva tetap kontinu di level berikutnya
+        flip = ~ry & rx
+        x = np.where(flip, side - x, x)
+        y = np.where(flip, side - y, y)
+        swap = ~ry
+        x, y = np.where(swap, y, x), np.where(swap, x, y)
+        s >>= 1
+    return index
+
+def map_features(records):
+    """(lat, lng, properties) berurutan Hilbert, properties dipangkas ke kebutuhan peta"""
+    features = []
+    for item in records:
+        coordinates = parse_coordinates(item)
+        if not coordinates:
+            continue
+        properties = {"kategori": KEYWORD_CATEGORIES.get(item.get("keyword"), "lainnya"), **item}
+        features.append((*coordinates, {key: properties.get(key) for key in GEO_EXPORT_CONFIG["properties"]}))
+
+    if features:
+        order = np.argsort(hilbert_index([f[0] for f in features], [f[1] for f in features]), kind="stable")
+        features = [features[index] for index in order]
+    return features
+
+def write_geojsonseq(f, records):
+    """Satu Feature GeoJSON per baris (newline-delimited), bisa di-stream tanpa parse seluruh file"""
+    precision = GEO_EXPORT_CONFIG["coordinate_precision"]
+    for lat, lng, properties in map_features(records):
+        feature = {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [round(lng, precision), round(lat, precision)]},
+            "properties": properties
+        }
+        f.write(json.dumps(feature, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+def export_flatgeobuf(records, filename=None):
+    """FlatGeobuf dengan packed Hilbert R-tree (range request per viewport), via pyogrio/GDAL"""
+    try:
+        from pyogrio.raw import write
+    except ImportError:
+        print("⚠️  pyogrio belum terinstall, export FlatGeobuf dilewati")
+        return None
+
+    filename = filename or OUTPUT_FILES["flatgeobuf"]
+    features = map_features(records)
+    fields = GEO_EXPORT_CONFIG["properties"]
+    geometry = np.array([struct.pack("<BIdd", 1, 1, lng, lat) for lat, lng, _ in features], dtype=object)
+    field_data = [
+        np.array([None if properties[field] is None else str(properties[field]) for _, _, properties in features],
+                 dtype=object)
+        for field in fields
+    ]
+
+    # Driver FlatGeobuf menganggap path tanpa ekstensi .fgb sebagai folder: file sementara harus tetap .fgb
+    root, extension = os.path.splitext(filename)
+    temp_filename = f"{root}.tmp{extension or '.fgb'}"
+    if os.path.exists(temp_filename):
+        os.remove(temp_filename)
+    if os.path.isdir(filename):
+        shutil.rmtree(filename)  # Sisa export lama yang tertulis sebagai folder
+    write(temp_filename, geometry, field_data, fields, driver="FlatGeobuf", geometry_type="Point",
+          crs="EPSG:4326", layer=os.path.splitext(os.path.basename(filename))[0],
+          layer_options={"SPATIAL_INDEX": "YES"})
+    os.replace(temp_filename, filename)
+    return filename
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export snapshot JSON ke GeoJSONSeq dan FlatGeobuf")
+    parser.add_argument("input", nargs="?", help="Snapshot JSON (default dari config)")
+    args = parser.parse_args()
+
+    with open(args.input or OUTPUT_FILES["json"], 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    from data_manager import DataManager
+
+    manager = DataManager()
+    manager.data = data["data"] if isinstance(data, dict) else data
+    files = manager.save_to_geo()
+    print(f"🗺️  GeoJSONSeq: {files['geojsonseq']}")
+    if files["flatgeobuf"]:
+        print(f"🗺️  FlatGeobuf: {files['flatgeobuf']}")
@@ -0,0 +1,43 @@
+import math
+from config import DEDUPE_CONFIG
+
+class CoordinateGridIndex:
+    """Hashed grid index untuk cek kedekatan koordinat tanpa scan semua titik"""
+
+    def __init__(self, threshold=None):
+        self.threshold = threshold or DEDUPE_CONFIG["coordinate_threshold"]
+        self.cells = {}
+        self.count = 0
+
+    def cell_of(self, lat, lng):
+        """Key cell untuk koordinat (ukuran cell = threshold)"""
+        return (math.floor(lat / self.threshold), math.floor(lng / self.threshold))
+
+    def add(self, lat, lng):
+        """Tambah koordinat sebagai tuple numerik"""
+        self.cells.setdefault(self.cell_of(lat, lng), []).append((lat, lng))
+        self.count += 1
+
+    def find_nearby(self, lat, lng):
+        """Cari titik dalam threshold di cell sendiri dan 8 cell tetangga"""
+        cell_lat, cell_lng = self.cell_of(lat, lng)
+
+        for d_lat in (-1, 0, 1):
+            for d_lng in (-1, 0, 1):
+                for existing_lat, existing_lng in self.cells.get((cell_lat + d_lat, cell_lng + d_lng), ()):
+                    if (abs(lat - existing_lat) < self.threshold and
+                            abs(lng - existing_lng) < self.threshold):
+                        return (existing_lat, existing_lng)
+
+        return None
+
+    def has_nearby(self, lat, lng):
+        """True jika ada titik dalam radius threshold"""
+        return self.find_nearby(lat, lng) is not None
+
+    def clear(self):
+        self.cells = {}
+        self.count = 0
+
+    def __len__(self):
+        return self.count
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+from config import ALL_KEYWORDS, DISTRICTS, INFRASTRUCTURE_CATEGORIES, OUTPUT_FILES, PACING_PROFILES, \
+    RATE_LIMIT_CONFIG, SCRAPING_CONFIG, SECURITY_CONFIG
+
+# Path output bawaan sebelum diarahkan ke folder job/shard
+DEFAULT_OUTPUT_FILES = dict(OUTPUT_FILES)
+
+# Tile sweep tidak per kecamatan: unit shard-nya (TILE_SHARD_DISTRICT, keyword)
+TILE_SHARD_DISTRICT = "*"
+
+# File level job yang dibaca semua shard (tanpa suffix shard): query plan dibuat sekali per job
+# (python query_planner.py -o <output_dir>/query_plan.json) dan dipakai use_plan di tiap shard
+JOB_LEVEL_FILES = ("query_plan",)
+
+def load_job_spec(filename):
+    """Baca dan validasi job spec JSON (kecamatan, kategori/keyword, pacing, folder output)"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        spec = json.load(f)
+
+    districts = spec.get("districts") or list(DISTRICTS)
+    unknown = [district for district in districts if district not in DISTRICTS]
+    if unknown:
+        raise ValueError(f"Kecamatan tidak dikenal: {', '.join(unknown)}")
+
+    categories = spec.get("categories") or []
+    unknown = [category for category in categories if category not in INFRASTRUCTURE_CATEGORIES]
+    if unknown:
+        raise ValueError(f"Kategori tidak dikenal: {', '.join(unknown)}")
+
+    keywords = [keyword for category in categories for keyword in INFRASTRUCTURE_CATEGORIES[category]]
+    keywords += spec.get("keywords") or []
+    if not keywords:
+        keywords = list(ALL_KEYWORDS)
+
+    pacing = spec.get("pacing", "normal")
+    if pacing not in PACING_PROFILES:
+        raise ValueError(f"Pacing profile tidak dikenal: {pacing} (pilihan: {', '.join(PACING_PROFILES)})")
+
+    return {
+        "name": spec.get("name") or os.path.splitext(os.path.basename(filename))[0],
+        "districts": districts,
+        "keywords": list(dict.fromkeys(keywords)),
+        "pacing": pacing,
+        "output_dir": spec.get("output_dir") or ".",
+        "workers": spec.get("workers"),
+        "sessions": spec.get("sessions"),
+        "use_plan": bool(spec.get("use_plan", False))
+    }
+
+def parse_shard(text):
+    """'i/n' -> (i, n) dengan 0 <= i < n"""
+    try:
+        index, count = (int(part) for part in text.split("/"))
+    except ValueError:
+        raise ValueError(f"Format shard harus i/n, bukan '{text}'")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Shard {text} di luar rentang (0 <= i < n)")
+    return index, count
+
+def shard_of(district, keyword, count):
+    """Shard deterministik untuk satu unit: hash stabil lintas mesin (bukan hash() Python)"""
+    digest = hashlib.sha1(f"{district}|{keyword}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count
+
+def shard_units(districts, keywords, index, count):
+    """Unit kecamatan×keyword milik shard ini, urutan sama di semua mesin"""
+    return [(district, keyword) for district in districts for keyword in keywords
+            if shard_of(district, keyword, count) == index]
+
+def shard_suffix(index, count):
+    return f".shard{index}of{count}" if count > 1 else ""
+
+def output_paths(directory, suffix=""):
+    """OUTPUT_FILES bawaan dipindah ke folder job, suffix shard sebelum ekstensi (kecuali file level job)"""
+    paths = {}
+    for key, filename in DEFAULT_OUTPUT_FILES.items():
+        root, extension = os.path.splitext(filename)
+        paths[key] = os.path.join(directory, f"{root}{'' if key in JOB_LEVEL_FILES else suffix}{extension}")
+    return paths
+
+def job_settings(spec, shard=(0, 1)):
+    """Setting yang juga diterapkan ulang di proses worker (spawn tidak mewarisi config yang diubah)"""
+    return {"pacing": spec["pacing"], "output_dir": spec["output_dir"], "shard": list(shard)}
+
+def apply_job_settings(settings):
+    """Terapkan pacing profile dan path output shard ke dict config (in place, idempotent)"""
+    profile = PACING_PROFILES[settings["pacing"]]
+    SECURITY_CONFIG["max_requests_per_hour"] = profile["searches_per_hour"]
+    SECURITY_CONFIG["session_break_interval"] = profile["session_break_interval"]
+    SCRAPING_CONFIG["delay_between_districts"] = profile["delay_between_districts"]
+    RATE_LIMIT_CONFIG["buckets"]["search"]["rate_per_hour"] = profile["searches_per_hour"]
+    RATE_LIMIT_CONFIG["buckets"]["place_open"]["rate_per_hour"] = profile["place_opens_per_hour"]
+    RATE_LIMIT_CONFIG["buckets"]["scroll"]["rate_per_hour"] = profile["scrolls_per_hour"]
+
+    os.makedirs(settings["output_dir"], exist_ok=True)
+    OUTPUT_FILES.update(output_paths(settings["output_dir"], shard_suffix(*settings["shard"])))
+
+def merge_shards(spec, count):
+    """Gabungkan snapshot + journal semua shard secara streaming, lalu bangun export dari hasil merge"""
+    from data_manager import DataManager
+    from merge_results import merge_files, print_merge_report
+    from task_ledger import TaskLedger
+
+    inputs = []
+    for index in range(count):
+        paths = output_paths(spec["output_dir"], shard_suffix(index, count))
+        # Journal berisi record shard yang belum sempat di-compact (shard mati di tengah jalan)
+        shard_inputs = [paths[key] for key in ("json", "journal") if os.path.exists(paths[key])]
+        if not shard_inputs:
+            print(f"⚠️  Shard {index}/{count} tanpa data")
+        inputs += shard_inputs
+
+        if os.path.exists(paths["ledger"]):
+            ledger = TaskLedger(paths["ledger"])
+            counts = ledger.summary()
+            ledger.close()
+            if counts["pending"] or counts["failed"] or counts["running"]:
+                print(f"⚠️  Shard {index}: {counts['pending']} pending, {counts['failed']} gagal, "
+                      f"{counts['running']} berjalan (belum lengkap)")
+
+    OUTPUT_FILES.update(output_paths(spec["output_dir"]))
+    report = merge_files(inputs, OUTPUT_FILES["json"])
+    print_merge_report(report, OUTPUT_FILES["json"])
+
+    # Export turunan (CSV, Parquet, peta, index) dari snapshot hasil merge
+    manager = DataManager(index_file=OUTPUT_FILES["facility_index"])
+    manager.load_existing_data()
+    files = manager.save_to_files()
+    manager.close()
+    return files
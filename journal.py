@@ -0,0 +1,76 @@
+import json
+import os
+import time
+from config import JOURNAL_CONFIG, OUTPUT_FILES
+
+class RecordJournal:
+    """Append-only JSONL journal dengan fsync per batch"""
+
+    def __init__(self, filename=None, batch_size=None, sync_interval=None):
+        self.filename = filename or OUTPUT_FILES["journal"]
+        self.batch_size = batch_size or JOURNAL_CONFIG["fsync_batch_size"]
+        self.sync_interval = sync_interval or JOURNAL_CONFIG["fsync_interval"]
+        self.pending = 0
+        self.last_sync = time.time()
+        self.file = open(self.filename, 'a', encoding='utf-8')
+
+    def append(self, record):
+        """Tulis satu record, fsync jika batch penuh atau interval terlewati"""
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.file.flush()
+        self.pending += 1
+
+        if self.pending >= self.batch_size or time.time() - self.last_sync >= self.sync_interval:
+            self.sync()
+
+    def sync(self):
+        """Paksa batch yang tertunda ke disk"""
+        if self.file.closed:
+            return
+
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.pending = 0
+        self.last_sync = time.time()
+
+    def truncate(self):
+        """Kosongkan journal setelah compaction ke snapshot"""
+        self.sync()
+        self.file.truncate(0)
+        self.file.seek(0)
+        self.sync()
+
+    def close(self):
+        if not self.file.closed:
+            self.sync()
+            self.file.close()
+
+def read_journal(filename=None):
+    """Baca record dari journal, abaikan baris terakhir yang terpotong karena crash"""
+    filename = filename or OUTPUT_FILES["journal"]
+    records = []
+
+    if not os.path.exists(filename):
+        return records
+
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                print(f"⚠️  Journal baris {line_number} rusak, dilewati")
+
+    return records
+
+if __name__ == "__main__":
+    # Compaction on demand: snapshot + journal -> JSON/CSV baru, lalu journal dikosongkan
+    from data_manager import DataManager
+
+    manager = DataManager(journal_file=OUTPUT_FILES["journal"], index_file=OUTPUT_FILES["facility_index"])
+    manager.load_existing_data()
+    files = manager.save_to_files()
+    manager.close()
+    print(f"💾 Compaction selesai: {files['json']}, {files['csv']}")
@@ -1,36 +1,185 @@
+import argparse
 import asyncio
 import sys
+from config import POOL_CONFIG
+from job import TILE_SHARD_DISTRICT, apply_job_settings, job_settings, load_job_spec, merge_shards, parse_shard, \
+    shard_of, shard_units
 from scraper import GoogleMapsInfrastructureScraper
+from query_planner import is_skipped, load_skip_list
+from replay import PageRecorder
 from selector import get_user_selection
+from task_ledger import TaskLedger
+from worker_pool import run_worker_pool, run_session_pool
 
-async def main():
+def parse_args():
+    """Argumen command line"""
+    parser = argparse.ArgumentParser(description="Scraper infrastruktur Kabupaten Enrekang")
+    parser.add_argument("--workers", type=int, default=POOL_CONFIG["workers"],
+                        help="Jumlah proses worker (masing-masing satu browser)")
+    parser.add_argument("--sessions", type=int, default=POOL_CONFIG["sessions"],
+                        help="Jumlah sesi browser konkuren dalam satu proses (asyncio)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Lanjutkan unit kecamatan×keyword yang belum selesai dari run sebelumnya")
+    parser.add_argument("--use-plan", action="store_true",
+                        help="Skip keyword yang menurut query plan hampir tidak menambah tempat unik")
+    parser.add_argument("--tiles", action="store_true",
+                        help="Tile sweep bbox kabupaten per koordinat, bukan pencarian teks per kecamatan")
+    parser.add_argument("--record", metavar="DIR",
+                        help="Rekam snapshot feed dan panel detail ke DIR untuk replay offline")
+    parser.add_argument("--job", metavar="SPEC",
+                        help="Jalankan job spec JSON tanpa prompt interaktif (cron/batch)")
+    parser.add_argument("--shard", default="0/1", metavar="I/N",
+                        help="Kerjakan shard ke-I dari N (0 <= I < N) unit kecamatan×keyword job")
+    parser.add_argument("--merge", action="store_true",
+                        help="Gabungkan output semua shard job (pakai N dari --shard)")
+    return parser.parse_args()
+
+def apply_skip_list(units):
+    """Buang unit (kecamatan, keyword) yang menurut query plan di-skip untuk kecamatan itu"""
+    skip = load_skip_list()
+    planned = [(district, keyword) for district, keyword in units if not is_skipped(skip, district, keyword)]
+    print(f"🧭 Query plan: {len(units) - len(planned)} unit kecamatan×keyword di-skip")
+    return planned
+
+async def main(args):
     """Main function untuk menjalankan scraping dengan pilihan user"""
     
-    try:
-        # Dapatkan pilihan user
-        selection = get_user_selection()
+    # Job spec: pacing dan path output shard diterapkan sebelum ledger/DataManager dibuat
+    job = None
+    settings = None
+    if args.job:
+        job = load_job_spec(args.job)
+        shard = parse_shard(args.shard)
         
-        if not selection:
-            print("👋 Terima kasih telah menggunakan scraper!")
+        if args.merge:
+            files = merge_shards(job, shard[1])
+            print(f"💾 Merge {shard[1]} shard selesai: {files['json']}, {files['csv']}")
             return
         
-        # Extract pilihan
-        selected_keywords = selection["keywords"]
-        selected_districts = selection["districts"]
-        scraping_mode = selection["mode"]
+        settings = job_settings(job, shard)
+        apply_job_settings(settings)
+        args.workers = job["workers"] or args.workers
+        args.sessions = job["sessions"] or args.sessions
+        args.use_plan = args.use_plan or job["use_plan"]
+        print(f"📋 Job '{job['name']}' shard {shard[0]}/{shard[1]}, pacing '{job['pacing']}', "
+              f"output {job['output_dir']}")
+    elif args.merge:
+        print("❌ --merge hanya bisa dipakai bersama --job")
+        return
+    
+    task_ledger = TaskLedger()
+    
+    try:
+        if args.resume:
+            # Resume: jadwalkan hanya unit yang belum selesai, tanpa prompt interaktif
+            recovered = task_ledger.recover_interrupted()
+            if recovered:
+                print(f"🔁 {recovered} unit yang terputus dikembalikan ke pending")
+            task_ledger.print_summary()
+            
+            unfinished = task_ledger.unfinished()
+            if not unfinished:
+                print("✅ Tidak ada unit yang perlu di-resume")
+                return
+            
+            # Unit tile sweep terdaftar sebagai (TILE_SHARD_DISTRICT, keyword), terpisah dari unit kecamatan
+            tile_units = [unit for unit in unfinished if unit[0] == TILE_SHARD_DISTRICT]
+            district_units = [unit for unit in unfinished if unit[0] != TILE_SHARD_DISTRICT]
+            if tile_units and district_units:
+                print(f"❌ Ledger berisi {len(tile_units)} unit tile sweep dan {len(district_units)} unit kecamatan; "
+                      f"resume tidak bisa mencampur keduanya. Jalankan ulang salah satu mode tanpa --resume")
+                return
+            
+            # Mode resume mengikuti isi ledger, bukan flag --tiles
+            args.tiles = bool(tile_units)
+            selected_districts = list(dict.fromkeys(district for district, _ in unfinished))
+            selected_keywords = list(dict.fromkeys(keyword for _, keyword in unfinished))
+            scraping_mode = "resume"
+        elif job:
+            selected_districts = job["districts"]
+            selected_keywords = job["keywords"]
+            scraping_mode = "job"
+            
+            shard_index, shard_count = parse_shard(args.shard)
+            if args.tiles:
+                # Tile sweep mencakup seluruh kabupaten per keyword: shard dibagi per keyword saja
+                selected_keywords = [keyword for keyword in selected_keywords
+                                     if shard_of(TILE_SHARD_DISTRICT, keyword, shard_count) == shard_index]
+                units = [(TILE_SHARD_DISTRICT, keyword) for keyword in selected_keywords]
+            else:
+                # Shard: subset deterministik dari semua unit, mesin lain mengerjakan sisanya
+                units = shard_units(selected_districts, selected_keywords, shard_index, shard_count)
+            
+            # Skip list diterapkan setelah sharding supaya pembagian shard tidak bergantung pada plan
+            if args.use_plan:
+                units = apply_skip_list(units)
+                selected_keywords = list(dict.fromkeys(keyword for _, keyword in units))
+            if not units:
+                print("✅ Shard ini tidak mendapat unit")
+                return
+            task_ledger.start_units(units)
+            if not args.tiles:
+                selected_districts = list(dict.fromkeys(district for district, _ in units))
+                selected_keywords = list(dict.fromkeys(keyword for _, keyword in units))
+            print(f"🧩 Shard {args.shard}: {len(units)} unit kecamatan×keyword")
+        else:
+            # Dapatkan pilihan user
+            selection = get_user_selection()
+            
+            if not selection:
+                print("👋 Terima kasih telah menggunakan scraper!")
+                return
+            
+            # Extract pilihan
+            selected_keywords = selection["keywords"]
+            selected_districts = selection["districts"]
+            scraping_mode = selection["mode"]
+            
+            districts = [TILE_SHARD_DISTRICT] if args.tiles else selected_districts
+            units = [(district, keyword) for district in districts for keyword in selected_keywords]
+            if args.use_plan:
+                units = apply_skip_list(units)
+                selected_keywords = list(dict.fromkeys(keyword for _, keyword in units))
+            
+            # Run baru: daftarkan semua unit sebagai pending (tile sweep: satu unit per keyword)
+            task_ledger.start_units(units)
         
         print(f"\n🚀 Memulai scraping mode '{scraping_mode}'...")
         print(f"📊 Target: {len(selected_districts)} kecamatan × {len(selected_keywords)} infrastruktur")
         
+        # Tile sweep selalu berjalan dengan satu browser
+        if args.tiles and (args.workers > 1 or args.sessions > 1):
+            print("ℹ️  Tile sweep berjalan dengan satu browser; --workers/--sessions diabaikan")
+        
+        # Pool mode: beberapa browser paralel dengan budget request global
+        if args.workers > 1 and not args.tiles:
+            run_worker_pool(selected_districts, selected_keywords, workers=args.workers, task_ledger=task_ledger,
+                            settings=settings)
+            print("\n🎉 Scraping berhasil diselesaikan!")
+            return
+        
+        # Beberapa sesi browser dalam satu event loop
+        if args.sessions > 1 and not args.tiles:
+            await run_session_pool(selected_districts, selected_keywords, sessions=args.sessions,
+                                   task_ledger=task_ledger)
+            print("\n🎉 Scraping berhasil diselesaikan!")
+            return
+        
         # Inisialisasi scraper
         scraper = GoogleMapsInfrastructureScraper()
         
         # Update scraper dengan pilihan user
         scraper.selected_keywords = selected_keywords
         scraper.selected_districts = selected_districts
+        scraper.task_ledger = task_ledger
+        if args.record:
+            scraper.recorder = PageRecorder(args.record)
         
         # Jalankan scraping dengan pilihan user
-        await scraper.scrape_selected_infrastructure()
+        if args.tiles:
+            await scraper.scrape_selected_tiles()
+        else:
+            await scraper.scrape_selected_infrastructure()
         
         print("\n🎉 Scraping berhasil diselesaikan!")
         
@@ -45,13 +194,18 @@ async def main():
         if 'scraper' in locals() and scraper:
             scraper.close()
         
+        task_ledger.print_summary()
+        task_ledger.close()
+        
         print("\n👋 Terima kasih telah menggunakan scraper!")
 
 def run_scraper():
     """Function untuk menjalankan scraper"""
+    args = parse_args()
+    
     try:
         # Jalankan dengan asyncio
-        asyncio.run(main())
+        asyncio.run(main(args))
         
     except KeyboardInterrupt:
         print("\n⏹️  Program dihentikan")
@@ -0,0 +1,178 @@
+import argparse
+import csv
+import math
+import os
+import pickle
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from bulk_dedupe import resolve_duplicates
+from config import DEDUPE_CONFIG, MERGE_CONFIG, OUTPUT_FILES
+from data_manager import identity_of
+from record_stream import iter_records, write_json_stream, write_jsonl_stream
+
+RUN_BATCH_SIZE = 1024  # Record per pickle batch di file run
+
+def hash_keys(keys):
+    """Hash 64-bit stabil (siphash pandas) untuk satu batch key string.
+
+    Kolom uint64 jauh lebih kecil dari set string; peluang tabrakan 64-bit dapat diabaikan.
+    """
+    return pd.util.hash_array(np.array(keys, dtype=object), categorize=False)
+
+def sort_order(columns):
+    """Urutan kanonik (tanpa koordinat di akhir, lat, lng, input, urutan) via np.lexsort"""
+    has_coordinates = np.isfinite(columns["lat"])
+    return np.lexsort((
+        columns["sequence"],
+        columns["source"],
+        np.where(has_coordinates, columns["lng"], 0.0),
+        np.where(has_coordinates, columns["lat"], 0.0),
+        ~has_coordinates
+    ))
+
+def write_sorted_runs(inputs, directory, run_size):
+    """Fase 1 external sort: potong stream jadi run terurut di disk.
+
+    Item ditulis per run dalam urutan kanonik; kolom key (koordinat, input, urutan, hash
+    identitas, nomor run) dikumpulkan untuk seluruh stream dan dikembalikan sebagai array.
+    """
+    runs = []
+    fieldnames = set()
+    items = []
+    buffer = {"lat": [], "lng": [], "source": [], "sequence": [], "location": [], "url": []}
+    chunks = []
+
+    def flush():
+        columns = {
+            "lat": np.array(buffer["lat"], dtype=np.float64),
+            "lng": np.array(buffer["lng"], dtype=np.float64),
+            "source": np.array(buffer["source"], dtype=np.int32),
+            "sequence": np.array(buffer["sequence"], dtype=np.int64),
+            "location": hash_keys(buffer["location"]),
+            "url": hash_keys(buffer["url"]),
+            "has_url": np.array([bool(url) for url in buffer["url"]], dtype=bool)
+        }
+        order = sort_order(columns)
+        columns = {name: column[order] for name, column in columns.items()}
+        columns["run"] = np.full(len(order), len(runs), dtype=np.int32)
+        chunks.append(columns)
+
+        path = os.path.join(directory, f"run{len(runs):05d}.pickle")
+        with open(path, 'wb') as f:
+            for start in range(0, len(order), RUN_BATCH_SIZE):
+                batch = [items[i] for i in order[start:start + RUN_BATCH_SIZE]]
+                pickle.dump(batch, f, protocol=pickle.HIGHEST_PROTOCOL)
+        runs.append(path)
+        items.clear()
+        for column in buffer.values():
+            column.clear()
+
+    for source, filename in enumerate(inputs):
+        for sequence, item in enumerate(iter_records(filename)):
+            location_key, url_key, coordinates = identity_of(item)
+            coordinates = coordinates or (math.nan, math.nan)
+            buffer["lat"].append(coordinates[0])
+            buffer["lng"].append(coordinates[1])
+            buffer["source"].append(source)
+            buffer["sequence"].append(sequence)
+            buffer["location"].append(location_key)
+            buffer["url"].append(url_key)
+            items.append(item)
+            fieldnames.update(item.keys())
+            if len(items) >= run_size:
+                flush()
+    if items:
+        flush()
+
+    columns = {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]} if chunks else {}
+    return runs, columns, fieldnames
+
+def read_run(path):
+    """Baca run batch demi batch (hanya satu batch per run di memori saat merge)"""
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                yield from pickle.load(f)
+            except EOFError:
+                return
+
+def merge_runs(runs, columns, report, threshold):
+    """Fase 2: urutan global dan keputusan dedupe dihitung dari kolom key, item di-stream per run.
+
+    Urutan dalam tiap run sama dengan urutan globalnya, jadi item cukup diambil berurutan
+    dari run yang ditunjuk kolom run (tanpa heap). Kolom key dan kode identitas tetap
+    O(n) total record; yang dibatasi run_size hanya item di memori.
+    """
+    if not runs:
+        return
+
+    order = sort_order(columns)
+    location_codes, _ = pd.factorize(columns["location"][order])
+    url_codes, _ = pd.factorize(columns["url"][order])
+    kept, _ = resolve_duplicates(location_codes, url_codes, columns["has_url"][order],
+                                 columns["lat"][order], columns["lng"][order], threshold, report["by_reason"])
+    report["kept"] = int(kept.sum())
+
+    readers = [read_run(path) for path in runs]
+    for run, keep in zip(columns["run"][order].tolist(), kept.tolist()):
+        item = next(readers[run])
+        if keep:
+            yield item
+
+def merge_files(inputs, output, run_size=None, threshold=None):
+    """Gabungkan file hasil (JSON/JSONL/CSV) jadi satu output kanonik terurut lat/lng.
+
+    Item di memori dibatasi run_size; kolom key dan identitas tetap tumbuh O(n) total record.
+    """
+    start_time = time.perf_counter()
+    run_size = run_size or MERGE_CONFIG["run_size"]
+    threshold = threshold or DEDUPE_CONFIG["coordinate_threshold"]
+    report = {"inputs": len(inputs), "original": 0, "kept": 0, "removed": 0,
+              "by_reason": {"location": 0, "url": 0, "coordinates": 0}, "runs": 0}
+
+    with tempfile.TemporaryDirectory(prefix="merge_runs_", dir=MERGE_CONFIG["temp_dir"]) as directory:
+        runs, columns, fieldnames = write_sorted_runs(inputs, directory, run_size)
+        report["original"] = len(columns["run"]) if columns else 0
+        report["runs"] = len(runs)
+        records = merge_runs(runs, columns, report, threshold)
+
+        extension = os.path.splitext(output)[1].lower()
+        temp_output = f"{output}.tmp"
+        with open(temp_output, 'w', encoding='utf-8', newline='') as f:
+            if extension in (".jsonl", ".ndjson"):
+                write_jsonl_stream(f, records)
+            elif extension == ".csv":
+                writer = csv.DictWriter(f, fieldnames=sorted(fieldnames))
+                writer.writeheader()
+                writer.writerows(records)
+            else:
+                write_json_stream(f, records)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_output, output)
+
+    report["removed"] = report["original"] - report["kept"]
+    report["elapsed_seconds"] = time.perf_counter() - start_time
+    return report
+
+def print_merge_report(report, output):
+    reasons = report["by_reason"]
+    print(f"🔀 Merge {report['inputs']} file ({report['runs']} run): {report['original']} record -> "
+          f"{report['kept']} unik di {output} ({report['elapsed_seconds']:.2f}s)")
+    print(f"   🏷️  nama-kecamatan-desa: {reasons['location']} | 🔗 URL: {reasons['url']} | "
+          f"📍 koordinat: {reasons['coordinates']}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merge streaming file hasil scraping dengan dedupe global")
+    parser.add_argument("inputs", nargs="+", help="File JSON/JSONL/CSV hasil run atau shard")
+    parser.add_argument("-o", "--output", default=OUTPUT_FILES["json"],
+                        help="File output (.json/.jsonl/.csv, default dari config)")
+    parser.add_argument("--run-size", type=int, help="Record per run external sort (default dari config)")
+    args = parser.parse_args()
+
+    if os.path.abspath(args.output) in {os.path.abspath(path) for path in args.inputs}:
+        raise SystemExit("❌ Output tidak boleh sama dengan salah satu input")
+
+    print_merge_report(merge_files(args.inputs, args.output, args.run_size), args.output)
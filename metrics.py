@@ -0,0 +1,134 @@
+import json
+import os
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from config import METRICS_CONFIG, OUTPUT_FILES
+
+class UnitMetrics:
+    """Durasi per fase dan counter untuk satu unit kecamatan×keyword"""
+
+    def __init__(self, district=None, keyword=None):
+        self.district = district
+        self.keyword = keyword
+        self.started_at = time.time()
+        self.phases = defaultdict(lambda: {"calls": 0, "seconds": 0.0})
+        self.counts = defaultdict(int)
+
+    @contextmanager
+    def phase(self, name):
+        """Durasi wall-clock satu fase (tunggu rate limiter di dalam fase ikut terhitung)"""
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry = self.phases[name]
+            entry["calls"] += 1
+            entry["seconds"] += time.perf_counter() - start_time
+
+    def count(self, name, amount=1):
+        self.counts[name] += amount
+
+    def to_dict(self, status, waits=None):
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "district": self.district,
+            "keyword": self.keyword,
+            "status": status,
+            "seconds": time.time() - self.started_at,
+            "phases": {name: dict(entry) for name, entry in self.phases.items()},
+            "counts": dict(self.counts),
+            "waits": waits or {}
+        }
+
+class MetricsRecorder:
+    """Sink metrics: satu baris JSONL per unit dan Prometheus textfile dengan total kumulatif"""
+
+    def __init__(self, jsonl_file=None, prometheus_file=None, labels=None, enabled=None):
+        self.enabled = METRICS_CONFIG["enabled"] if enabled is None else enabled  # False = hanya akumulasi di memori
+        self.jsonl_file = jsonl_file or OUTPUT_FILES["metrics"]
+        self.prometheus_file = prometheus_file or OUTPUT_FILES["metrics_prometheus"]
+        self.labels = labels or {}
+
+        self.phase_calls = defaultdict(int)
+        self.phase_seconds = defaultdict(float)
+        self.wait_seconds = defaultdict(float)
+        self.counts = defaultdict(int)
+        self.units = defaultdict(int)
+        self.gauges = {}  # (nama, label) -> nilai terakhir; label membedakan sesi yang berbagi recorder
+
+    def start_unit(self, district, keyword):
+        return UnitMetrics(district, keyword)
+
+    def finish_unit(self, unit, status, waits=None, gauges=None, labels=None):
+        """Tutup unit: akumulasi total, append JSONL, tulis ulang Prometheus textfile.
+
+        labels (mis. {"session": "0"}) ditambahkan ke baris JSONL dan ke gauge unit ini.
+        """
+        labels = labels or {}
+        record = unit.to_dict(status, waits)
+
+        for name, entry in record["phases"].items():
+            self.phase_calls[name] += entry["calls"]
+            self.phase_seconds[name] += entry["seconds"]
+        for reason, seconds in record["waits"].items():
+            self.wait_seconds[reason] += seconds
+        for name, amount in record["counts"].items():
+            self.counts[name] += amount
+        self.units[status] += 1
+        for name, value in (gauges or {}).items():
+            self.gauges[(name, tuple(sorted(labels.items())))] = value
+
+        if self.enabled:
+            with open(self.jsonl_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({**record, **self.labels, **labels}, ensure_ascii=False) + "\n")
+            self.write_prometheus()
+
+        return record
+
+    def format_labels(self, **labels):
+        labels = {**self.labels, **labels}
+        if not labels:
+            return ""
+        return "{" + ",".join(f'{key}="{value}"' for key, value in sorted(labels.items())) + "}"
+
+    def write_prometheus(self):
+        """Format textfile collector node_exporter, ditulis atomik (tmp + rename)"""
+        prefix = METRICS_CONFIG["prefix"]
+        lines = []
+
+        def series(name, kind, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{prefix}_{name}{self.format_labels(**labels)} {value}")
+
+        series("phase_seconds_total", "counter", "Durasi kumulatif per fase scraping",
+               [({"phase": name}, round(seconds, 3)) for name, seconds in sorted(self.phase_seconds.items())])
+        series("phase_calls_total", "counter", "Jumlah eksekusi per fase scraping",
+               [({"phase": name}, calls) for name, calls in sorted(self.phase_calls.items())])
+        series("wait_seconds_total", "counter", "Waktu tunggu rate limiter per alasan",
+               [({"reason": reason}, round(seconds, 3)) for reason, seconds in sorted(self.wait_seconds.items())])
+        series("items_total", "counter", "Counter item (kartu, valid, baru, duplikat, gagal)",
+               [({"kind": name}, amount) for name, amount in sorted(self.counts.items())])
+        series("units_total", "counter", "Unit kecamatan×keyword per status",
+               [({"status": status}, amount) for status, amount in sorted(self.units.items())])
+
+        for name in sorted({name for name, _ in self.gauges}):
+            series(name, "gauge", f"Nilai terakhir {name}",
+                   [(dict(labels), value) for (gauge, labels), value in sorted(self.gauges.items()) if gauge == name])
+
+        temp_file = f"{self.prometheus_file}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(temp_file, self.prometheus_file)
+
+def metric_files(suffix=None):
+    """Path JSONL/textfile; suffix per worker supaya proses tidak saling menimpa"""
+    if not suffix:
+        return OUTPUT_FILES["metrics"], OUTPUT_FILES["metrics_prometheus"]
+
+    jsonl_root, jsonl_ext = os.path.splitext(OUTPUT_FILES["metrics"])
+    prometheus_root, prometheus_ext = os.path.splitext(OUTPUT_FILES["metrics_prometheus"])
+    return f"{jsonl_root}_{suffix}{jsonl_ext}", f"{prometheus_root}_{suffix}{prometheus_ext}"
@@ -0,0 +1,111 @@
+import argparse
+import json
+import os
+import shutil
+import uuid
+import pandas as pd
+from config import KEYWORD_CATEGORIES, OUTPUT_FILES, PARQUET_CONFIG
+
+# Kolom string dengan kardinalitas rendah disimpan sebagai dictionary (pandas category)
+CATEGORICAL_COLUMNS = ["kecamatan", "desa", "keyword", "kategori"]
+FLOAT_COLUMNS = ["latitude", "longitude"]
+STRING_COLUMNS = ["nama", "url", "address", "place_id", "cid"]
+PARTITION_COLUMNS = ["kecamatan", "kategori"]
+
+def records_to_frame(records):
+    """DataFrame bertipe: koordinat float64, kolom kategori ter-dictionary, sisanya string"""
+    frame = pd.DataFrame.from_records(records)
+
+    for column in STRING_COLUMNS + CATEGORICAL_COLUMNS:
+        if column not in frame.columns:
+            frame[column] = None
+    for column in FLOAT_COLUMNS:
+        if column not in frame.columns:
+            frame[column] = None
+
+    frame["kategori"] = frame["keyword"].map(KEYWORD_CATEGORIES).fillna("lainnya")
+    for column in PARTITION_COLUMNS:
+        # Nilai partisi tidak boleh kosong
+        frame[column] = frame[column].fillna("Unknown").astype(str)
+
+    for column in FLOAT_COLUMNS:
+        frame[column] = pd.to_numeric(frame[column], errors="coerce").astype("float64")
+    for column in CATEGORICAL_COLUMNS:
+        frame[column] = frame[column].astype("string").astype("category")
+
+    # Kolom tambahan (mis. field baru di masa depan) ikut sebagai string
+    known = set(STRING_COLUMNS + CATEGORICAL_COLUMNS + FLOAT_COLUMNS)
+    for column in frame.columns:
+        if column not in known or column in STRING_COLUMNS:
+            frame[column] = frame[column].astype("string")
+
+    return frame
+
+def export_parquet(records, directory=None):
+    """Tulis dataset Parquet ber-partisi hive kecamatan=/kategori=, diganti secara atomik"""
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+    except ImportError:
+        print("⚠️  pyarrow belum terinstall, export Parquet dilewati")
+        return None
+
+    directory = directory or OUTPUT_FILES["parquet"]
+    table = pa.Table.from_pandas(records_to_frame(records), preserve_index=False)
+
+    # Kolom partisi ditulis sebagai nama folder; tipe string di skema partisi
+    for column in PARTITION_COLUMNS:
+        index = table.schema.get_field_index(column)
+        table = table.set_column(index, column, table.column(column).cast(pa.string()))
+
+    partitioning = ds.partitioning(
+        pa.schema([(column, pa.string()) for column in PARTITION_COLUMNS]), flavor="hive"
+    )
+
+    temp_directory = f"{directory}.{uuid.uuid4().hex}.tmp"
+    ds.write_dataset(
+        table,
+        temp_directory,
+        format="parquet",
+        partitioning=partitioning,
+        basename_template="part-{i}.parquet",
+        file_options=ds.ParquetFileFormat().make_write_options(compression=PARQUET_CONFIG["compression"])
+    )
+
+    # Swap folder: reader tidak pernah melihat dataset setengah jadi
+    old_directory = f"{directory}.{uuid.uuid4().hex}.old"
+    if os.path.exists(directory):
+        os.rename(directory, old_directory)
+    os.rename(temp_directory, directory)
+    shutil.rmtree(old_directory, ignore_errors=True)
+
+    return directory
+
+def read_parquet(directory=None, kecamatan=None, kategori=None, columns=None):
+    """Baca dataset dengan predicate pushdown partisi dan column pruning"""
+    import pyarrow.dataset as ds
+
+    directory = directory or OUTPUT_FILES["parquet"]
+    dataset = ds.dataset(directory, format="parquet", partitioning="hive")
+
+    condition = None
+    for field, value in (("kecamatan", kecamatan), ("kategori", kategori)):
+        if value is not None:
+            expression = ds.field(field) == value
+            condition = expression if condition is None else condition & expression
+
+    return dataset.to_table(columns=columns, filter=condition).to_pandas()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export snapshot JSON ke Parquet ber-partisi")
+    parser.add_argument("input", nargs="?", help="Snapshot JSON (default dari config)")
+    parser.add_argument("-o", "--output", help="Folder dataset Parquet (default dari config)")
+    args = parser.parse_args()
+
+    with open(args.input or OUTPUT_FILES["json"], 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    records = data["data"] if isinstance(data, dict) else data
+
+    directory = export_parquet(records, args.output)
+    if directory:
+        print(f"💾 {len(records)} record diexport ke {directory}")
@@ -0,0 +1,246 @@
+import argparse
+import json
+import os
+from collections import defaultdict
+from config import INFRASTRUCTURE_CATEGORIES, OUTPUT_FILES, PLANNER_CONFIG
+from job import TILE_SHARD_DISTRICT
+from url_parser import parse_place_url
+
+def place_key(record):
+    """Identitas tempat lintas pencarian: CID > feature ID > URL > nama+kecamatan"""
+    cid = record.get("cid")
+    place_id = record.get("place_id")
+    url = str(record.get("url") or "").strip()
+
+    if not cid and not place_id and url:
+        place = parse_place_url(url)
+        cid, place_id = place["cid"], place["place_id"]
+
+    if cid:
+        return f"cid:{cid}"
+    if place_id:
+        return f"fid:{place_id}"
+    if url:
+        return f"url:{url}"
+    return f"name:{str(record.get('nama', '')).lower().strip()}|{str(record.get('kecamatan', '')).lower().strip()}"
+
+def load_observations(ledger_file=None, dataset_file=None):
+    """Sightings (kecamatan, keyword, place_key) dan unit yang pernah dicari.
+
+    Ledger menyimpan semua tempat yang terlihat tiap pencarian sehingga overlap terukur.
+    Dataset hasil dedupe hanya mengkredit keyword pertama yang menemukan tempat, jadi
+    dipakai sebagai fallback (yield terukur, overlap tidak).
+    """
+    ledger_file = ledger_file or OUTPUT_FILES["ledger"]
+    if os.path.exists(ledger_file):
+        from task_ledger import TaskLedger
+
+        ledger = TaskLedger(ledger_file)
+        try:
+            sightings = ledger.sightings()
+            searched = ledger.searched_units()
+        finally:
+            ledger.close()
+        if sightings:
+            return sightings, searched, "ledger"
+
+    dataset_file = dataset_file or OUTPUT_FILES["json"]
+    if not os.path.exists(dataset_file):
+        return [], set(), "none"
+
+    with open(dataset_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    records = data["data"] if isinstance(data, dict) else data
+
+    sightings = [(record.get("kecamatan"), record.get("keyword"), place_key(record))
+                 for record in records if record.get("keyword")]
+    searched = {(district, keyword) for district, keyword, _ in sightings}
+    return sightings, searched, "dataset"
+
+def keyword_places(sightings):
+    """Set tempat per keyword (digabung lintas kecamatan)"""
+    places = defaultdict(set)
+    for _, keyword, key in sightings:
+        places[keyword].add(key)
+    return places
+
+def greedy_order(places, keywords):
+    """Urutan keyword set-cover: tiap langkah ambil keyword dengan tempat baru terbanyak"""
+    covered = set()
+    remaining = [keyword for keyword in keywords if keyword in places]
+    order = []
+
+    while remaining:
+        best = max(remaining, key=lambda keyword: (len(places[keyword] - covered), keyword))
+        marginal = places[best] - covered
+        order.append((best, len(marginal)))
+        covered |= marginal
+        remaining.remove(best)
+
+    return order, covered
+
+def resolve_merges(places, keywords):
+    """Usulan merge: keyword diproses dari yang tempatnya terbanyak dan containment dihitung
+    hanya terhadap keyword yang tetap dipertahankan, jadi tidak ada rantai A → B → C
+    yang membuang B sekaligus menjadikannya tujuan merge A"""
+    kept = []
+    merges = []
+
+    for keyword in sorted((keyword for keyword in keywords if places.get(keyword)),
+                          key=lambda keyword: (-len(places[keyword]), keyword)):
+        best = None
+        for keep in kept:
+            shared = len(places[keyword] & places[keep])
+            containment = shared / len(places[keyword])
+            if containment >= PLANNER_CONFIG["merge_containment"] and (best is None or containment > best["containment"]):
+                best = {"drop": keyword, "covered_by": keep, "containment": containment,
+                        "jaccard": shared / len(places[keyword] | places[keep])}
+        if best:
+            merges.append(best)
+        else:
+            kept.append(keyword)
+
+    return merges
+
+def skipped_keywords(places, searches, keywords):
+    """Keyword dengan yield unik per pencarian rendah, tanpa hasil sama sekali, atau tercakup merge"""
+    order, _ = greedy_order(places, keywords)
+    skip = {keyword for keyword, marginal in order
+            if marginal / max(1, searches[keyword]) < PLANNER_CONFIG["min_yield_per_search"]}
+    skip |= {keyword for keyword in keywords if keyword not in places and searches[keyword]}
+    skip |= {merge["drop"] for merge in resolve_merges(places, keywords)}
+    return skip
+
+def district_skip_list(sightings, searched, keywords):
+    """Skip list per kecamatan: keyword yang tidak berguna di satu kecamatan bisa jadi satu-satunya
+    sumber tempat di kecamatan lain. Key TILE_SHARD_DISTRICT ("*") berisi keyword yang di-skip
+    di semua kecamatan (dipakai tile sweep yang tidak per kecamatan)."""
+    districts = {district for district, _ in searched} | {district for district, _, _ in sightings}
+    skip = {}
+    for district in sorted((district for district in districts if district), key=str):
+        places = keyword_places(sighting for sighting in sightings if sighting[0] == district)
+        searches = defaultdict(int, {keyword: 1 for searched_district, keyword in searched
+                                     if searched_district == district})
+        district_keywords = [keyword for keyword in keywords if keyword in places or searches[keyword]]
+        skip[district] = sorted(skipped_keywords(places, searches, district_keywords))
+
+    skip[TILE_SHARD_DISTRICT] = sorted(set.intersection(*(set(keywords) for keywords in skip.values()))) \
+        if skip else []
+    return skip
+
+def plan_queries(sightings, searched, keywords=None):
+    """Rencana query: urutan + yield unik per pencarian, usulan merge, subset per kategori, skip list"""
+    places = keyword_places(sightings)
+    keywords = keywords or sorted(set(places) | {keyword for _, keyword in searched})
+
+    searches = defaultdict(int)
+    for _, keyword in searched:
+        searches[keyword] += 1
+
+    order, covered = greedy_order(places, keywords)
+    queries = []
+    for keyword, marginal in order:
+        search_count = max(1, searches[keyword])
+        queries.append({
+            "keyword": keyword,
+            "places": len(places[keyword]),
+            "unique_yield": marginal,
+            "searches": search_count,
+            "yield_per_search": marginal / search_count
+        })
+
+    # Keyword yang pernah dicari tapi tidak pernah menemukan apa pun
+    for keyword in keywords:
+        if keyword not in places and searches[keyword]:
+            queries.append({"keyword": keyword, "places": 0, "unique_yield": 0,
+                            "searches": searches[keyword], "yield_per_search": 0.0})
+
+    categories = {}
+    for category, category_keywords in INFRASTRUCTURE_CATEGORIES.items():
+        observed = [keyword for keyword in category_keywords if keyword in places]
+        if not observed:
+            continue
+        category_order, category_places = greedy_order(places, observed)
+        target = PLANNER_CONFIG["category_coverage"] * len(category_places)
+        subset, reached = [], 0
+        for keyword, marginal in category_order:
+            if reached >= target:
+                break
+            subset.append(keyword)
+            reached += marginal
+        categories[category] = {"keywords": subset, "places": len(category_places),
+                                "coverage": reached / len(category_places), "observed": observed}
+
+    return {
+        "total_places": len(covered),
+        "queries": queries,
+        "merges": resolve_merges(places, keywords),
+        "categories": categories,
+        "skip": district_skip_list(sightings, searched, keywords)
+    }
+
+def save_plan(plan, filename=None):
+    filename = filename or OUTPUT_FILES["query_plan"]
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(plan, f, ensure_ascii=False, indent=2)
+    return filename
+
+def load_skip_list(filename=None):
+    """Skip list per kecamatan {kecamatan: set(keyword)} dari rencana terakhir.
+
+    Rencana format lama (satu list global) dibaca sebagai skip untuk semua kecamatan ("*").
+    """
+    filename = filename or OUTPUT_FILES["query_plan"]
+    if not os.path.exists(filename):
+        return {}
+    with open(filename, 'r', encoding='utf-8') as f:
+        skip = json.load(f).get("skip", {})
+    if isinstance(skip, list):
+        return {TILE_SHARD_DISTRICT: set(skip)}
+    return {district: set(keywords) for district, keywords in skip.items()}
+
+def is_skipped(skip, district, keyword):
+    """True jika keyword di-skip untuk kecamatan ini (atau di semua kecamatan)"""
+    return keyword in skip.get(district, ()) or keyword in skip.get(TILE_SHARD_DISTRICT, ())
+
+def print_plan(plan, source):
+    print(f"🧭 Query plan dari {source}: {plan['total_places']} tempat unik")
+    if source == "dataset":
+        print("⚠️  Dataset hanya mencatat keyword pertama per tempat; overlap antar keyword belum terukur")
+
+    skip_everywhere = set(plan["skip"].get(TILE_SHARD_DISTRICT, []))
+    print("\n📈 Urutan query (yield unik per pencarian, ⏭️  = di-skip di semua kecamatan):")
+    for query in plan["queries"]:
+        marker = "⏭️ " if query["keyword"] in skip_everywhere else "  "
+        print(f" {marker} {query['keyword']}: +{query['unique_yield']} dari {query['places']} tempat, "
+              f"{query['searches']} pencarian, {query['yield_per_search']:.2f}/pencarian")
+
+    if plan["merges"]:
+        print("\n🔗 Usulan merge:")
+        for merge in plan["merges"]:
+            print(f"   {merge['drop']} → {merge['covered_by']} ({merge['containment']:.0%} tempat sudah tercakup)")
+
+    print("\n🗂️  Query level kategori:")
+    for category, info in plan["categories"].items():
+        print(f"   {category}: {', '.join(info['keywords'])} ({info['coverage']:.0%} dari {info['places']} tempat, "
+              f"{len(info['keywords'])}/{len(info['observed'])} keyword)")
+
+    print(f"\n⏭️  Skip list: {len(skip_everywhere)} keyword di semua kecamatan")
+    for district, keywords in plan["skip"].items():
+        if district != TILE_SHARD_DISTRICT and keywords:
+            print(f"   {district}: {', '.join(keywords)}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rencanakan konsolidasi query kecamatan×keyword")
+    parser.add_argument("--ledger", help="File task ledger (default dari config)")
+    parser.add_argument("--dataset", help="Dataset JSON fallback jika ledger belum punya sightings")
+    parser.add_argument("-o", "--output", help="File rencana (default dari config)")
+    args = parser.parse_args()
+
+    sightings, searched, source = load_observations(args.ledger, args.dataset)
+    if not sightings:
+        print("❌ Belum ada data run sebelumnya untuk direncanakan")
+    else:
+        plan = plan_queries(sightings, searched)
+        print_plan(plan, source)
+        print(f"\n💾 Rencana disimpan: {save_plan(plan, args.output)}")
@@ -0,0 +1,156 @@
+import asyncio
+import multiprocessing
+import random
+import time
+from collections import defaultdict
+from config import RATE_LIMIT_CONFIG, SECURITY_CONFIG
+
+class TokenBucket:
+    """Token bucket dalam satu proses (satu event loop atau satu thread)"""
+
+    def __init__(self, rate_per_hour, capacity=1):
+        self.rate = rate_per_hour / 3600.0  # token per detik
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.last_refill = time.time()
+
+    def refill(self, now):
+        elapsed = max(0.0, now - self.last_refill)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.last_refill = now
+
+    def try_acquire(self, tokens=1):
+        """Ambil token tanpa menunggu; return 0 jika berhasil, atau detik yang harus ditunggu"""
+        self.refill(time.time())
+
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return 0.0
+
+        return (tokens - self.tokens) / self.rate
+
+    def acquire(self, tokens=1):
+        """Blocking sampai token tersedia, return total detik menunggu"""
+        waited = 0.0
+
+        while True:
+            wait_time = self.try_acquire(tokens)
+            if wait_time <= 0:
+                return waited
+
+            time.sleep(wait_time)
+            waited += wait_time
+
+    async def acquire_async(self, tokens=1):
+        """Versi async dari acquire: session lain tetap berjalan selama menunggu"""
+        waited = 0.0
+
+        while True:
+            wait_time = self.try_acquire(tokens)
+            if wait_time <= 0:
+                return waited
+
+            await asyncio.sleep(wait_time)
+            waited += wait_time
+
+class SharedTokenBucket(TokenBucket):
+    """Token bucket lintas proses untuk budget request global (mis. max_requests_per_hour)"""
+
+    def __init__(self, rate_per_hour=None, capacity=1, context=None):
+        context = context or multiprocessing.get_context()
+        rate_per_hour = rate_per_hour or SECURITY_CONFIG["max_requests_per_hour"]
+
+        self.rate = rate_per_hour / 3600.0  # token per detik
+        self.capacity = capacity
+        self.tokens = context.Value('d', float(capacity), lock=False)
+        self.last_refill = context.Value('d', time.time(), lock=False)
+        self.lock = context.Lock()
+
+    def refill(self, now):
+        elapsed = max(0.0, now - self.last_refill.value)
+        self.tokens.value = min(self.capacity, self.tokens.value + elapsed * self.rate)
+        self.last_refill.value = now
+
+    def try_acquire(self, tokens=1):
+        """Ambil token tanpa menunggu; return 0 jika berhasil, atau detik yang harus ditunggu"""
+        with self.lock:
+            now = time.time()
+            self.refill(now)
+
+            if self.tokens.value >= tokens:
+                self.tokens.value -= tokens
+                return 0.0
+
+            return (tokens - self.tokens.value) / self.rate
+
+class RateLimiter:
+    """Satu pintu untuk semua pacing scraper: bucket per aksi, jitter, dan akuntansi tunggu vs kerja"""
+
+    def __init__(self, shared_buckets=None, config=None):
+        config = config or RATE_LIMIT_CONFIG
+        self.jitter = config["jitter"]
+        self.buckets = {
+            action: TokenBucket(settings["rate_per_hour"], settings["capacity"])
+            for action, settings in config["buckets"].items()
+        }
+        # Bucket bersama (mis. budget search global pool) menggantikan bucket lokal
+        self.buckets.update(shared_buckets or {})
+
+        self.started_at = time.time()
+        self.waited = defaultdict(float)
+        self.counts = defaultdict(int)
+
+    async def acquire(self, action):
+        """Tunggu token untuk aksi, plus jitter acak sebagian interval token"""
+        bucket = self.buckets[action]
+        waited = await bucket.acquire_async()
+
+        jitter = random.uniform(0, self.jitter) / bucket.rate
+        await asyncio.sleep(jitter)
+
+        self.waited[action] += waited + jitter
+        self.counts[action] += 1
+        return waited + jitter
+
+    async def pause(self, min_seconds, max_seconds, reason="human"):
+        """Delay acak (perilaku manusia, break, recovery) yang tetap tercatat"""
+        delay = random.uniform(min_seconds, max_seconds)
+        await asyncio.sleep(delay)
+        self.waited[reason] += delay
+        self.counts[reason] += 1
+        return delay
+
+    def pause_sync(self, min_seconds, max_seconds, reason="retry"):
+        """Versi blocking dari pause untuk kode yang berjalan di thread driver"""
+        delay = random.uniform(min_seconds, max_seconds)
+        time.sleep(delay)
+        self.waited[reason] += delay
+        self.counts[reason] += 1
+        return delay
+
+    def session_break_due(self, district_index):
+        """Session break setiap session_break_interval kecamatan"""
+        interval = SECURITY_CONFIG["session_break_interval"]
+        return interval > 0 and district_index > 0 and district_index % interval == 0
+
+    def report(self):
+        """Waktu total, menunggu vs bekerja, dan rincian per aksi"""
+        elapsed = time.time() - self.started_at
+        waiting = sum(self.waited.values())
+        return {
+            "elapsed": elapsed,
+            "waiting": waiting,
+            "working": max(0.0, elapsed - waiting),
+            "by_action": {
+                action: {"count": self.counts[action], "waited": self.waited[action]}
+                for action in sorted(self.waited)
+            }
+        }
+
+    def print_report(self):
+        report = self.report()
+        elapsed = report["elapsed"] or 1.0
+        print(f"⏱️  Pacing: {report['working']:.0f}s kerja, {report['waiting']:.0f}s menunggu "
+              f"({report['waiting'] / elapsed:.0%} dari {report['elapsed']:.0f}s)")
+        for action, stats in report["by_action"].items():
+            print(f"   {action}: {stats['count']}x, {stats['waited']:.0f}s")
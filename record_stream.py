@@ -0,0 +1,141 @@
+import csv
+import json
+import os
+from datetime import datetime
+
+CHUNK_SIZE = 1 << 16
+WHITESPACE = " \t\r\n"
+
+class JsonStreamReader:
+    """Decoder JSON inkremental di atas buffer berukuran chunk (raw_decode per nilai)"""
+
+    def __init__(self, f):
+        self.file = f
+        self.buffer = ""
+        self.position = 0
+        self.decoder = json.JSONDecoder()
+        self.eof = False
+
+    def fill(self):
+        """Tambah satu chunk ke buffer, buang bagian yang sudah dibaca"""
+        chunk = self.file.read(CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+
+    def peek(self):
+        """Karakter non-whitespace berikutnya tanpa mengonsumsinya"""
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in WHITESPACE:
+                self.position += 1
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if self.eof:
+                return ""
+            self.fill()
+
+    def expect(self, character):
+        if self.peek() != character:
+            raise ValueError(f"JSON tidak valid: '{character}' diharapkan dekat posisi {self.position}")
+        self.position += 1
+
+    def value(self):
+        """Decode satu nilai JSON utuh; buffer ditambah sampai nilainya lengkap"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                self.fill()
+                continue
+            # Angka di ujung buffer bisa terpotong ("12" dari "123"): pastikan ada pembatas
+            if end == len(self.buffer) and not self.eof:
+                self.fill()
+                continue
+            self.position = end
+            return value
+
+    def array_items(self):
+        """Stream elemen array satu per satu (posisi di '[')"""
+        self.expect("[")
+        if self.peek() == "]":
+            self.position += 1
+            return
+        while True:
+            yield self.value()
+            separator = self.peek()
+            self.position += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise ValueError(f"JSON tidak valid: ',' atau ']' diharapkan dekat posisi {self.position}")
+
+def iter_json_records(f):
+    """Record dari array JSON atau dokumen snapshot {"data": [...]} tanpa json.load seluruh file"""
+    reader = JsonStreamReader(f)
+    if reader.peek() == "[":
+        yield from reader.array_items()
+        return
+
+    reader.expect("{")
+    while reader.peek() != "}":
+        key = reader.value()
+        reader.expect(":")
+        if key == "data" and reader.peek() == "[":
+            yield from reader.array_items()
+        else:
+            reader.value()  # Metadata kecil (scraped_at, total_count, ...)
+        if reader.peek() == ",":
+            reader.position += 1
+
+def iter_jsonl_records(f):
+    for line_number, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            print(f"⚠️  Baris {line_number} rusak, dilewati")
+
+def iter_csv_records(f):
+    """Record CSV; sel kosong jadi None seperti field yang tidak ada di JSON"""
+    for row in csv.DictReader(f):
+        yield {key: (value if value != "" else None) for key, value in row.items()}
+
+def iter_records(filename):
+    """Stream record dari file JSON, JSONL atau CSV (ditentukan dari ekstensi)"""
+    extension = os.path.splitext(filename)[1].lower()
+    newline = '' if extension == ".csv" else None
+    with open(filename, 'r', encoding='utf-8', newline=newline) as f:
+        if extension in (".jsonl", ".ndjson"):
+            yield from iter_jsonl_records(f)
+        elif extension == ".csv":
+            yield from iter_csv_records(f)
+        else:
+            yield from iter_json_records(f)
+
+def write_json_stream(f, records):
+    """Tulis dokumen snapshot {"scraped_at", "data", "total_count"} record demi record.
+
+    total_count ditulis setelah data karena jumlahnya baru diketahui di akhir stream.
+    """
+    f.write('{\n  "scraped_at": ' + json.dumps(datetime.now().isoformat()) + ',\n  "data": [')
+    count = 0
+    for record in records:
+        f.write(",\n    " if count else "\n    ")
+        f.write(json.dumps(record, ensure_ascii=False))
+        count += 1
+    f.write("\n  ],\n" if count else "],\n")
+    f.write(f'  "total_count": {count}\n}}')
+    return count
+
+def write_jsonl_stream(f, records):
+    count = 0
+    for record in records:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        count += 1
+    return count
@@ -0,0 +1,282 @@
+import argparse
+import asyncio
+import functools
+import json
+import os
+import threading
+import time
+import urllib.parse
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from config import REPLAY_CONFIG
+from url_parser import parse_place_url
+
+MANIFEST_NAME = "manifest.jsonl"
+
+# Snapshot DOM setelah render, tanpa script supaya bisa disajikan ulang secara statis
+CAPTURE_PAGE_SCRIPT = """
+const root = document.documentElement.cloneNode(true);
+root.querySelectorAll('script, noscript, iframe').forEach(element => element.remove());
+return '<!DOCTYPE html>' + root.outerHTML;
+"""
+
+CAPTURE_DETAIL_SCRIPT = """
+const title = document.querySelector('h1.DUwDvf');
+if (!title) return null;
+const panel = title.closest('[role="main"]') || title.parentElement;
+const clone = panel.cloneNode(true);
+clone.querySelectorAll('script, noscript, iframe').forEach(element => element.remove());
+return clone.outerHTML;
+"""
+
+# Meniru SPA Maps: click kartu -> pushState URL tempat + render panel detail hasil rekaman
+REPLAY_SHIM = """
+<script>
+document.addEventListener('click', function(event) {
+    const link = event.target.closest('a.hfpxzc');
+    if (!link) return;
+    event.preventDefault();
+    event.stopPropagation();
+
+    const target = new URL(link.getAttribute('href'), location.href);
+    history.pushState({}, '', target.pathname + target.search);
+
+    let panel = document.getElementById('replay-detail');
+    if (!panel) {
+        panel = document.createElement('div');
+        panel.id = 'replay-detail';
+        document.body.appendChild(panel);
+    }
+    panel.innerHTML = '';
+    fetch('/replay/detail?url=' + encodeURIComponent(target.href))
+        .then(response => response.ok ? response.text() : '')
+        .then(html => { panel.innerHTML = html; });
+}, true);
+</script>
+"""
+
+START_PAGE = '<!DOCTYPE html><html><body><input id="searchboxinput"></body></html>'
+
+class PageRecorder:
+    """Simpan snapshot feed dan panel detail selama run nyata untuk replay offline"""
+
+    def __init__(self, directory=None):
+        self.directory = directory or REPLAY_CONFIG["directory"]
+        os.makedirs(self.directory, exist_ok=True)
+        self.manifest_path = os.path.join(self.directory, MANIFEST_NAME)
+        self.sequence = sum(1 for _ in open(self.manifest_path, encoding='utf-8')) \
+            if os.path.exists(self.manifest_path) else 0
+
+    def save(self, kind, url, html, **fields):
+        self.sequence += 1
+        filename = f"{self.sequence:05d}_{kind}.html"
+        with open(os.path.join(self.directory, filename), 'w', encoding='utf-8') as f:
+            f.write(html)
+
+        entry = {"kind": kind, "url": url, "file": filename, "recorded_at": datetime.now().isoformat(), **fields}
+        with open(self.manifest_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def capture_feed(self, driver, keyword, district):
+        """Snapshot halaman hasil pencarian setelah feed selesai di-scroll (blocking)"""
+        self.save("feed", driver.current_url, driver.execute_script(CAPTURE_PAGE_SCRIPT),
+                  keyword=keyword, district=district)
+
+    def capture_detail(self, driver):
+        """Snapshot panel detail tempat yang sedang terbuka (blocking)"""
+        html = driver.execute_script(CAPTURE_DETAIL_SCRIPT)
+        if html:
+            self.save("detail", driver.current_url, html)
+
+class ReplayStore:
+    """Index rekaman: daftar feed dan panel detail per feature ID tempat"""
+
+    def __init__(self, directory=None):
+        self.directory = directory or REPLAY_CONFIG["directory"]
+        self.feeds = []
+        self.details = {}
+
+        with open(os.path.join(self.directory, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if entry["kind"] == "feed":
+                    self.feeds.append(entry)
+                else:
+                    place_id = parse_place_url(entry["url"])["place_id"]
+                    if place_id:
+                        self.details[place_id] = entry
+
+    def read(self, entry):
+        with open(os.path.join(self.directory, entry["file"]), 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def feed_page(self, index):
+        html = self.read(self.feeds[index])
+        position = html.rfind("</body>")
+        if position == -1:
+            return html + REPLAY_SHIM
+        return html[:position] + REPLAY_SHIM + html[position:]
+
+    def detail_fragment(self, url):
+        entry = self.details.get(parse_place_url(url)["place_id"])
+        return self.read(entry) if entry else None
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    def __init__(self, store, *args, **kwargs):
+        self.store = store
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        parsed = urllib.parse.urlparse(self.path)
+        body = None
+
+        if parsed.path == "/":
+            body = START_PAGE
+        elif parsed.path.startswith("/replay/feed/"):
+            index = int(parsed.path.rsplit("/", 1)[-1])
+            if 0 <= index < len(self.store.feeds):
+                body = self.store.feed_page(index)
+        elif parsed.path == "/replay/detail":
+            url = urllib.parse.parse_qs(parsed.query).get("url", [""])[0]
+            body = self.store.detail_fragment(url)
+
+        if body is None:
+            self.send_error(404)
+            return
+
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_replay_server(store, port=None):
+    """Jalankan server replay di thread background, return (server, base_url)"""
+    port = REPLAY_CONFIG["port"] if port is None else port
+    server = ThreadingHTTPServer(("127.0.0.1", port), functools.partial(ReplayHandler, store))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def count_round_trips(driver):
+    """Hitung setiap WebDriver command (driver dan WebElement lewat driver.execute)"""
+    counter = {"calls": 0}
+    execute = driver.execute
+
+    def counted_execute(*args, **kwargs):
+        counter["calls"] += 1
+        return execute(*args, **kwargs)
+
+    driver.execute = counted_execute
+    return counter
+
+async def run_benchmark(directory=None, repeat=1, click=False):
+    """Jalankan extract_infrastructure_data terhadap semua feed rekaman, tanpa pacing dan scroll"""
+    from data_manager import DataManager
+    from metrics import MetricsRecorder
+    from rate_limiter import RateLimiter
+    from scraper import GoogleMapsInfrastructureScraper
+
+    store = ReplayStore(directory)
+    if not store.feeds:
+        print("❌ Tidak ada feed di rekaman")
+        return None
+
+    server, base_url = start_replay_server(store, port=0)
+
+    # Benchmark mengukur ekstraksi, bukan pacing: bucket praktis tak terbatas
+    unlimited = {"rate_per_hour": 3.6e9, "capacity": 1e9}
+    rate_limiter = RateLimiter(config={
+        "buckets": {"search": unlimited, "place_open": unlimited, "scroll": unlimited},
+        "jitter": 0
+    })
+
+    # Tanpa metrics file dan driver cache/template profil di folder kerja: sesi localhost
+    # tidak boleh jadi template profil untuk run nyata
+    scraper = GoogleMapsInfrastructureScraper(
+        data_manager=DataManager(), rate_limiter=rate_limiter, start_url=f"{base_url}/",
+        metrics=MetricsRecorder(enabled=False), driver_cache=False
+    )
+    scraper.human_behavior_chance = 0
+    scraper.harvest_mode = not click
+    counter = count_round_trips(scraper.driver)
+    rows = []
+
+    try:
+        for _ in range(repeat):
+            for index, entry in enumerate(store.feeds):
+                scraper.data_manager = DataManager()
+                await scraper.run_driver(scraper.driver.get, f"{base_url}/replay/feed/{index}")
+
+                calls_before = counter["calls"]
+                start_time = time.perf_counter()
+                # Feed rekaman sudah di-scroll sampai habis: yang diukur hanya harvest/click
+                await scraper.extract_infrastructure_data(entry.get("keyword"), entry.get("district"), scroll=False)
+                elapsed = time.perf_counter() - start_time
+
+                rows.append({
+                    "feed": entry["file"],
+                    "items": len(scraper.sightings),
+                    "cards": scraper.last_card_count,
+                    "seconds": elapsed,
+                    "round_trips": counter["calls"] - calls_before
+                })
+    finally:
+        scraper.close()
+        server.shutdown()
+
+    items = sum(row["items"] for row in rows)
+    seconds = sum(row["seconds"] for row in rows)
+    round_trips = sum(row["round_trips"] for row in rows)
+    report = {
+        "mode": "click" if click else "harvest",
+        "feeds": len(rows),
+        "items": items,
+        "seconds": seconds,
+        "items_per_second": items / seconds if seconds else 0.0,
+        "round_trips_per_item": round_trips / items if items else 0.0,
+        "rows": rows
+    }
+    print_benchmark(report)
+    return report
+
+def print_benchmark(report):
+    print("\n" + "=" * 60)
+    print(f"🏁 Benchmark replay ({report['mode']}): {report['feeds']} feed, {report['items']} item "
+          f"dalam {report['seconds']:.1f}s")
+    print(f"   ⚡ {report['items_per_second']:.2f} item/s | "
+          f"🔁 {report['round_trips_per_item']:.1f} WebDriver round trip/item")
+    for row in report["rows"]:
+        print(f"   {row['feed']}: {row['items']}/{row['cards']} item, {row['seconds']:.2f}s, "
+              f"{row['round_trips']} round trip")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay offline halaman Maps hasil rekaman")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="Sajikan rekaman lewat HTTP lokal")
+    serve_parser.add_argument("directory", nargs="?", help="Folder rekaman (default dari config)")
+    serve_parser.add_argument("--port", type=int, help="Port server (default dari config)")
+
+    bench_parser = subparsers.add_parser("bench", help="Benchmark ekstraksi terhadap rekaman")
+    bench_parser.add_argument("directory", nargs="?", help="Folder rekaman (default dari config)")
+    bench_parser.add_argument("--repeat", type=int, default=1, help="Ulangi semua feed N kali")
+    bench_parser.add_argument("--click", action="store_true", help="Ukur jalur click (harvest mode off)")
+
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        store = ReplayStore(args.directory)
+        server, base_url = start_replay_server(store, args.port)
+        print(f"📼 Replay {len(store.feeds)} feed, {len(store.details)} detail di {base_url}/replay/feed/0")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+    else:
+        asyncio.run(run_benchmark(args.directory, repeat=args.repeat, click=args.click))
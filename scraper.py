@@ -1,8 +1,10 @@
 import asyncio
+import functools
 import time
 import random
 import urllib.parse
 import re
+from concurrent.futures import ThreadPoolExecutor
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
@@ -11,28 +13,87 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
 from selenium.webdriver.common.action_chains import ActionChains
 import undetected_chromedriver as uc
-from config import DISTRICTS, KEYWORDS, SCRAPING_CONFIG
-from data_manager import DataManager
+from config import DISTRICTS, ALL_KEYWORDS as KEYWORDS, SCRAPING_CONFIG, OUTPUT_FILES, BROWSER_PROFILE_CONFIG, \
+    DRIVER_CACHE_CONFIG, TILE_SWEEP_CONFIG
+from browser_profile import TrafficMeter, apply_lean_options, enable_resource_blocking
+from metrics import MetricsRecorder, UnitMetrics
+from driver_cache import StartupTimer, cached_driver_path, invalidate_driver_cache, prepare_session_profile, \
+    release_session_profile
+from data_manager import DataManager, print_saved_files
+import dom_waits
+from rate_limiter import RateLimiter
+from url_parser import parse_place_url
+from address_parser import parse_address
+from geo_assign import assign_records
+from job import TILE_SHARD_DISTRICT
+from query_planner import place_key
+from tile_sweep import TileSweep, in_kabupaten, save_coverage
 
 class GoogleMapsInfrastructureScraper:
-    def __init__(self):
+    def __init__(self, data_manager=None, rate_limiter=None, start_url=None, metrics=None, driver_cache=None):
         self.driver = None
-        self.data_manager = DataManager()
+        self.start_url = start_url or SCRAPING_CONFIG["start_url"]
+        self.owns_data_manager = data_manager is None  # DataManager bersama ditutup oleh pemiliknya
+        self.data_manager = data_manager or DataManager(journal_file=OUTPUT_FILES["journal"], index_file=OUTPUT_FILES["facility_index"])
+        
+        # Satu thread per driver: WebDriver call diserialisasi, event loop tetap bebas
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        
+        # Semua pacing (bucket per aksi, jitter, break) lewat satu rate limiter
+        self.rate_limiter = rate_limiter or RateLimiter()
+        
+        # Timing per fase dan counter per unit kecamatan×keyword (JSONL + Prometheus textfile)
+        self.metrics = metrics or MetricsRecorder()
+        self.unit_metrics = UnitMetrics()
+        self.metric_labels = {}  # Label gauge per sesi/worker (mis. {"session": "0"})
+        self.defer_dedupe = False  # True di worker pool: dedupe (dan metrics-nya) dilakukan parent
         self.security_metrics = {
           "requests_count": 0,
           "last_request_time": time.time(),
           "error_count": 0,
           "session_start": time.time()
         }
-        self.request_count = 0  # Inisialisasi request_count
-        self.session_start = time.time()  # Waktu mulai session
         
         # Variables untuk pilihan user
         self.selected_keywords = []
         self.selected_districts = []
+        self.task_ledger = None  # TaskLedger opsional untuk resume per kecamatan×keyword
+        self.sightings = []  # Key semua tempat valid dari pencarian terakhir (termasuk duplikat)
+        self.sighting_points = []  # Koordinat tempat-tempat tersebut (coverage per tile)
+        self.last_card_count = 0  # Jumlah kartu feed pencarian terakhir (deteksi tile jenuh)
+        self.recorder = None  # PageRecorder opsional untuk replay offline
+        
+        # Profil lean: meter byte per query dari performance log Chrome
+        self.traffic_meter = TrafficMeter() if BROWSER_PROFILE_CONFIG["lean"] else None
+        
+        # Perilaku per instance (default dari config) supaya benchmark tidak mengubah config global
+        self.harvest_mode = SCRAPING_CONFIG.get("harvest_mode")
+        self.human_behavior_chance = SCRAPING_CONFIG["human_behavior_chance"]
+        
+        # Warm start: user-data-dir per sesi (disalin dari template) dan timing tiap startup
+        self.use_driver_cache = DRIVER_CACHE_CONFIG["enabled"] if driver_cache is None else driver_cache
+        self.profile_dir = None
+        self.startup_timings = []
         
         self.setup_driver()
     
+    @classmethod
+    async def create(cls, data_manager=None, rate_limiter=None, metrics=None):
+        """Buat scraper tanpa mem-block event loop selama browser launch"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(cls, data_manager=data_manager, rate_limiter=rate_limiter, metrics=metrics)
+        )
+    
+    async def run_driver(self, func, *args, **kwargs):
+        """Jalankan WebDriver call (blocking) di executor milik driver ini"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+    
+    async def pause(self, min_seconds, max_seconds, reason="human"):
+        """Delay acak yang bisa di-await (session lain tetap berjalan), tercatat di rate limiter"""
+        return await self.rate_limiter.pause(min_seconds, max_seconds, reason)
+    
     def setup_driver(self):
         """Enhanced setup dengan better fingerprint masking"""
         options = uc.ChromeOptions()
@@ -63,9 +124,30 @@ class GoogleMapsInfrastructureScraper:
         ]
         options.add_argument(f"--user-agent={random.choice(user_agents)}")
         
+        # Profil lean: tanpa WebGL map canvas
+        if BROWSER_PROFILE_CONFIG["lean"]:
+            apply_lean_options(options)
+        
+        timer = StartupTimer()
+        
+        # Restart: profil sesi sebelumnya dibuang sebelum sesi baru dibuat
+        self.release_profile()
+        
         try:
-            self.driver = uc.Chrome(options=options)
+            driver_path = None
+            if self.use_driver_cache:
+                driver_path = cached_driver_path()
+                timer.mark("driver")
+                self.profile_dir = prepare_session_profile()
+                timer.mark("profil")
+            
+            self.driver = uc.Chrome(options=options, driver_executable_path=driver_path, user_data_dir=self.profile_dir)
             self.driver.implicitly_wait(SCRAPING_CONFIG["implicit_wait"])
+            timer.mark("launch")
+            
+            # Drop request tile/gambar/font/analytics sebelum halaman pertama dibuka
+            if BROWSER_PROFILE_CONFIG["lean"]:
+                enable_resource_blocking(self.driver)
             
             # Enhanced script injection
             self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
@@ -88,15 +170,27 @@ class GoogleMapsInfrastructureScraper:
             self.driver.execute_script("window.localStorage.clear();")
             self.driver.execute_script("window.sessionStorage.clear();")
             
-            # Buka Google Maps Indonesia
-            self.driver.get("https://maps.google.com/?hl=id")
-            time.sleep(3)
+            # Buka Google Maps Indonesia, siap begitu search box ada
+            self.driver.get(self.start_url)
+            self.wait_for_search_box()
+            timer.mark("maps")
             print("🌍 Google Maps loaded dengan bahasa Indonesia")
             
         except Exception as e:
             print(f"❌ Error setting up driver: {e}")
             print("🔄 Trying alternative setup...")
             
+            # Driver cache mungkin tidak cocok lagi dengan versi Chrome
+            if self.driver:
+                try:
+                    self.driver.quit()
+                except Exception:
+                    pass
+                self.driver = None
+            self.release_profile()
+            if self.use_driver_cache:
+                invalidate_driver_cache()
+            
             # Fallback setup with minimal options
             minimal_options = uc.ChromeOptions()
             minimal_options.add_argument("--no-sandbox")
@@ -104,11 +198,29 @@ class GoogleMapsInfrastructureScraper:
             
             self.driver = uc.Chrome(options=minimal_options)
             self.driver.implicitly_wait(SCRAPING_CONFIG["implicit_wait"])
-            self.driver.get("https://maps.google.com/?hl=id")
-            time.sleep(3)
+            self.driver.get(self.start_url)
+            self.wait_for_search_box()
+            timer.mark("fallback")
             print("🌍 Google Maps loaded with fallback setup")
+        
+        timer.print_report()
+        self.startup_timings.append(timer.as_dict())
+    
+    def wait_for_search_box(self):
+        """Halaman Maps siap dipakai begitu search box ter-render"""
+        try:
+            WebDriverWait(self.driver, SCRAPING_CONFIG["page_load_timeout"]).until(
+                EC.presence_of_element_located((By.ID, "searchboxinput"))
+            )
+        except TimeoutException:
+            print("⚠️  Search box belum muncul sampai timeout")
     
-    def simulate_human_behavior(self):
+    def release_profile(self):
+        """Buang user-data-dir sesi (yang pertama disimpan sebagai template hangat)"""
+        release_session_profile(self.profile_dir)
+        self.profile_dir = None
+    
+    async def simulate_human_behavior(self):
         """Simulasi perilaku manusia"""
         actions = [
             self.random_mouse_movement,
@@ -116,87 +228,84 @@ class GoogleMapsInfrastructureScraper:
             self.pause_and_think
         ]
         
-        if random.random() < SCRAPING_CONFIG["human_behavior_chance"]:
+        if random.random() < self.human_behavior_chance:
             action = random.choice(actions)
-            action()
+            await action()
+    
+    def move_mouse_randomly(self):
+        body = self.driver.find_element(By.TAG_NAME, "body")
+        ActionChains(self.driver).move_to_element_with_offset(
+            body, random.randint(100, 500), random.randint(100, 400)
+        ).perform()
     
-    def random_mouse_movement(self):
+    async def random_mouse_movement(self):
         """Gerakan mouse random"""
         try:
-            body = self.driver.find_element(By.TAG_NAME, "body")
-            ActionChains(self.driver).move_to_element_with_offset(
-                body, random.randint(100, 500), random.randint(100, 400)
-            ).perform()
-            time.sleep(random.uniform(0.5, 1.5))
+            await self.run_driver(self.move_mouse_randomly)
+            await self.pause(0.5, 1.5)
         except:
             pass
     
-    def random_scroll(self):
+    async def random_scroll(self):
         """Scroll random"""
         try:
-            self.driver.execute_script(f"window.scrollBy(0, {random.randint(-200, 200)})")
-            time.sleep(random.uniform(0.5, 1.0))
+            await self.run_driver(self.driver.execute_script, f"window.scrollBy(0, {random.randint(-200, 200)})")
+            await self.pause(0.5, 1.0)
         except:
             pass
     
-    def pause_and_think(self):
+    async def pause_and_think(self):
         """Pause seperti manusia sedang berpikir"""
-        time.sleep(random.uniform(1.0, 3.0))
+        await self.pause(1.0, 3.0)
     
-    def human_type(self, element, text):
+    async def human_type(self, element, text):
         """Typing seperti manusia"""
-        element.clear()
-        time.sleep(random.uniform(0.3, 0.8))
+        await self.run_driver(element.clear)
+        await self.pause(0.3, 0.8)
         
         for char in text:
-            element.send_keys(char)
-            time.sleep(random.uniform(0.05, 0.15))
+            await self.run_driver(element.send_keys, char)
+            await self.pause(0.05, 0.15)
         
-        time.sleep(random.uniform(0.5, 1.0))
+        await self.pause(0.5, 1.0)
     
-    def adaptive_delay(self):
-        """Adaptive delay berdasarkan request count dan waktu"""
-        # Semakin banyak request, semakin lama delay
-        base_delay = 2.0
-        request_factor = min(self.request_count / 100, 2.0)  # Max 2x multiplier
-        
-        # Tambah delay jika session sudah lama
-        session_duration = time.time() - self.session_start
-        if session_duration > 3600:  # > 1 jam
-            base_delay *= 1.5
-        
-        final_delay = base_delay * (1 + request_factor)
-        time.sleep(random.uniform(final_delay * 0.8, final_delay * 1.2))
-        self.request_count += 1
-
     async def search_infrastructure(self, keyword, district):
         """Pencarian infrastruktur di kecamatan tertentu"""
         try:
             search_query = f"{keyword} di kecamatan {district} Kabupaten Enrekang"
             
+            # Budget search (max_requests_per_hour) ditegakkan oleh token bucket
+            await self.rate_limiter.acquire("search")
+            self.security_metrics["requests_count"] += 1
+            self.security_metrics["last_request_time"] = time.time()
+            
             # Simulasi human behavior
-            self.simulate_human_behavior()
+            await self.simulate_human_behavior()
             
             # Cari search box
-            search_box = WebDriverWait(self.driver, 15).until(
+            search_box = await self.run_driver(
+                WebDriverWait(self.driver, 15).until,
                 EC.presence_of_element_located((By.ID, "searchboxinput"))
             )
             
             # Click dan ketik dengan human-like behavior
-            search_box.click()
-            time.sleep(random.uniform(0.5, 1.0))
+            await self.run_driver(search_box.click)
+            await self.pause(0.5, 1.0)
             
             print(f"🔍 Mencari: {search_query}")
-            self.human_type(search_box, search_query)
+            await self.human_type(search_box, search_query)
             
             # Enter untuk search
-            search_box.send_keys(Keys.RETURN)
-            
-            # Wait untuk hasil muncul
-            time.sleep(random.uniform(3, 5))
+            original_url = await self.run_driver(self.get_current_url)
+            previous_first_href = await self.run_driver(dom_waits.mark_stale_results, self.driver)
+            await self.run_driver(search_box.send_keys, Keys.RETURN)
             
-            # Tambahkan adaptive delay
-            self.adaptive_delay()
+            # Wait sampai feed baru atau detail tempat ter-render (event-driven, bukan sleep tetap)
+            state = await self.run_driver(
+                dom_waits.wait_for_search_results, self.driver, original_url, previous_first_href
+            )
+            if state.get("timed_out"):
+                print("⚠️  Hasil pencarian belum ter-render sampai timeout")
             
             return True
             
@@ -213,39 +322,50 @@ class GoogleMapsInfrastructureScraper:
         
         try:
             # Cari container hasil pencarian
-            results_container = WebDriverWait(self.driver, 10).until(
+            results_container = await self.run_driver(
+                WebDriverWait(self.driver, 10).until,
                 EC.presence_of_element_located((By.CSS_SELECTOR, "[role='feed']"))
             )
             
-            last_height = self.driver.execute_script("return arguments[0].scrollHeight", results_container)
+            card_count = await self.run_driver(
+                self.driver.execute_script,
+                "return arguments[0].querySelectorAll(arguments[1]).length",
+                results_container, dom_waits.CARD_SELECTOR
+            )
             scroll_attempts = 0
             no_new_results_count = 0
             
             while scroll_attempts < SCRAPING_CONFIG["max_scroll_attempts"]:
                 # Scroll ke bawah
-                self.driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight", results_container)
+                await self.rate_limiter.acquire("scroll")
+                await self.run_driver(
+                    self.driver.execute_script, "arguments[0].scrollTop = arguments[0].scrollHeight", results_container
+                )
                 
-                # Wait untuk loading
-                time.sleep(random.uniform(2, 4))
+                # Wait sampai kartu baru masuk feed atau penanda akhir daftar muncul
+                state = await self.run_driver(
+                    dom_waits.wait_for_feed_growth, self.driver, results_container, card_count
+                )
                 
-                # Check apakah ada hasil baru
-                new_height = self.driver.execute_script("return arguments[0].scrollHeight", results_container)
+                if state["end"]:
+                    print("✅ Mencapai akhir hasil")
+                    break
                 
-                if new_height == last_height:
+                if state["count"] <= card_count:
                     no_new_results_count += 1
-                    if no_new_results_count >= 3:
-                        print("✅ Mencapai akhir hasil")
+                    if no_new_results_count >= 2:
+                        print("✅ Tidak ada hasil baru, berhenti scroll")
                         break
                 else:
                     no_new_results_count = 0
-                    last_height = new_height
-                    print(f"📊 Scroll {scroll_attempts + 1}: Loading lebih banyak hasil...")
+                    card_count = state["count"]
+                    print(f"📊 Scroll {scroll_attempts + 1}: {card_count} hasil dimuat...")
                 
                 scroll_attempts += 1
                 
                 # Human behavior simulation
                 if random.random() < 0.3:
-                    self.simulate_human_behavior()
+                    await self.simulate_human_behavior()
             
             return True
             
@@ -258,6 +378,12 @@ class GoogleMapsInfrastructureScraper:
         try:
             print(f"🌍 Extracting coordinates from: {url[:100]}...")
             
+            # Method 0: Koordinat tempat dari segmen data (!3d/!4d), bukan pusat viewport
+            place = parse_place_url(url)
+            if place["lat"] is not None:
+                print(f"📍 Koordinat tempat ditemukan (!3d/!4d): Lat {place['lat']}, Lng {place['lng']}")
+                return {"lat": place["lat"], "lng": place["lng"]}
+            
             # Method 1: Standard Google Maps format with @
             if "@" in url:
                 coords_part = url.split("@")[1].split("/")[0]
@@ -339,63 +465,35 @@ class GoogleMapsInfrastructureScraper:
             return {"address": None, "kecamatan": "Unknown", "desa": "Unknown"}
     
     def parse_kecamatan_and_village(self, address):
-        """Parse kecamatan dan desa dari alamat"""
+        """Parse kecamatan dan desa dari alamat lewat gazetteer (hasil di-cache per alamat)"""
         try:
-            # Split berdasarkan koma
-            parts = [part.strip() for part in address.split(",")]
-            
-            kecamatan = "Unknown"
-            desa = "Unknown"
-            
-            # Cari bagian yang mengandung "Kec."
-            for i, part in enumerate(parts):
-                if "Kec." in part:
-                    # Extract nama kecamatan
-                    kecamatan = part.replace("Kec.", "").strip()
-                    print(f"🏘️  Kecamatan: {kecamatan}")
-                    
-                    # Desa adalah bagian sebelum kecamatan
-                    if i > 0:
-                        desa = parts[i - 1].strip()
-                        # Bersihkan dari kata "Desa", "Kelurahan", dll
-                        desa = desa.replace("Desa", "").replace("Kelurahan", "").replace("Kel.", "").strip()
-                        print(f"🏡 Desa: {desa}")
-                    
-                    break
-            
-            return {"kecamatan": kecamatan, "desa": desa}
+            location_info = parse_address(address)
+            if location_info["kecamatan"] != "Unknown":
+                print(f"🏘️  Kecamatan: {location_info['kecamatan']}")
+            if location_info["desa"] != "Unknown":
+                print(f"🏡 Desa: {location_info['desa']}")
+            return location_info
             
         except Exception as e:
             print(f"⚠️  Error parsing lokasi: {e}")
             return {"kecamatan": "Unknown", "desa": "Unknown"}
     
-    def wait_for_url_change(self, original_url, max_wait=15):
-        """Wait untuk URL berubah setelah click dengan retry mechanism"""
+    def get_current_url(self):
+        return self.driver.current_url
+    
+    async def wait_for_url_change(self, original_url, max_wait=None):
+        """Wait untuk URL berubah setelah click (history hook di browser, tanpa polling)"""
         print(f"🔄 Menunggu URL berubah dari: {original_url[:80]}...")
         
         start_time = time.time()
-        check_interval = 0.5
-        last_url = original_url
+        current_url = await self.run_driver(dom_waits.wait_for_url_change, self.driver, original_url, max_wait)
         
-        while time.time() - start_time < max_wait:
-            current_url = self.driver.current_url
-            
-            # Cek apakah URL berubah
-            if current_url != original_url:
-                wait_time = time.time() - start_time
-                print(f"✅ URL berubah setelah {wait_time:.1f}s")
-                print(f"🔗 URL baru: {current_url[:80]}...")
-                return current_url
-            
-            # Update progress setiap 2 detik
-            if int(time.time() - start_time) % 2 == 0 and current_url != last_url:
-                elapsed = time.time() - start_time
-                print(f"⏳ Masih menunggu URL berubah... ({elapsed:.1f}s)")
-                last_url = current_url
-            
-            time.sleep(check_interval)
+        if current_url:
+            print(f"✅ URL berubah setelah {time.time() - start_time:.1f}s")
+            print(f"🔗 URL baru: {current_url[:80]}...")
+            return current_url
         
-        print(f"⚠️  Timeout: URL tidak berubah dalam {max_wait}s")
+        print(f"⚠️  Timeout: URL tidak berubah dalam {time.time() - start_time:.0f}s")
         return None
 
     def get_href_url_from_element(self, element):
@@ -410,18 +508,38 @@ class GoogleMapsInfrastructureScraper:
         
         return None
 
-    def click_element_and_get_url(self, element, element_name="element"):
+    def click_with_method(self, element, click_attempt):
+        """Satu percobaan click dengan metode sesuai nomor attempt"""
+        # Method 1: Standard click
+        if click_attempt == 1:
+            ActionChains(self.driver).move_to_element(element).pause(0.5).click().perform()
+        
+        # Method 2: JavaScript click
+        elif click_attempt == 2:
+            self.driver.execute_script("arguments[0].click();", element)
+        
+        # Method 3: Force click with offset
+        else:
+            location = element.location_once_scrolled_into_view
+            size = element.size
+            x = location['x'] + size['width'] // 2
+            y = location['y'] + size['height'] // 2
+            ActionChains(self.driver).move_by_offset(x, y).click().perform()
+    
+    async def click_element_and_get_url(self, element, element_name="element"):
         """Click element dan pastikan mendapat URL yang benar"""
-        original_url = self.driver.current_url
+        original_url = await self.run_driver(self.get_current_url)
         final_url = None
         
         # Step 1: Coba ambil URL dari href attribute dulu
-        href_url = self.get_href_url_from_element(element)
+        href_url = await self.run_driver(self.get_href_url_from_element, element)
         
         # Step 2: Scroll ke element
         try:
-            self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", element)
-            time.sleep(random.uniform(1, 2))
+            await self.run_driver(
+                self.driver.execute_script,
+                "arguments[0].scrollIntoView({block: 'center'});", element
+            )
         except Exception as e:
             print(f"⚠️  Error scroll to element: {e}")
         
@@ -435,36 +553,23 @@ class GoogleMapsInfrastructureScraper:
             print(f"🖱️  Click attempt {click_attempts}/{max_attempts} pada {element_name}")
             
             try:
-                # Method 1: Standard click
-                if click_attempts == 1:
-                    ActionChains(self.driver).move_to_element(element).pause(0.5).click().perform()
-                
-                # Method 2: JavaScript click
-                elif click_attempts == 2:
-                    self.driver.execute_script("arguments[0].click();", element)
-                
-                # Method 3: Force click with offset
-                else:
-                    location = element.location_once_scrolled_into_view
-                    size = element.size
-                    x = location['x'] + size['width'] // 2
-                    y = location['y'] + size['height'] // 2
-                    ActionChains(self.driver).move_by_offset(x, y).click().perform()
-                
+                with self.unit_metrics.phase("click"):
+                    await self.run_driver(self.click_with_method, element, click_attempts)
                 clicked = True
                 print(f"✅ Click berhasil pada attempt {click_attempts}")
                 
             except Exception as e:
                 print(f"⚠️  Click attempt {click_attempts} gagal: {e}")
                 if click_attempts < max_attempts:
-                    time.sleep(random.uniform(1, 2))
+                    await self.pause(1, 2)
         
         if not clicked:
             print(f"❌ Semua click attempts gagal untuk {element_name}")
             return href_url  # Return href URL sebagai fallback
         
         # Step 4: Wait untuk URL berubah
-        new_url = self.wait_for_url_change(original_url)
+        with self.unit_metrics.phase("url_wait"):
+            new_url = await self.wait_for_url_change(original_url)
         
         # Step 5: Prioritas URL yang akan digunakan
         if new_url and new_url != original_url:
@@ -477,9 +582,9 @@ class GoogleMapsInfrastructureScraper:
             # Jika menggunakan href, coba navigate langsung
             try:
                 print("🔄 Navigating ke href URL...")
-                self.driver.get(href_url)
-                time.sleep(random.uniform(3, 5))
-                final_url = self.driver.current_url
+                await self.run_driver(self.driver.get, href_url)
+                await self.run_driver(dom_waits.wait_for_detail_panel, self.driver)
+                final_url = await self.run_driver(self.get_current_url)
                 print(f"✅ Berhasil navigate ke: {final_url[:80]}...")
             except Exception as e:
                 print(f"⚠️  Error navigate ke href: {e}")
@@ -506,41 +611,208 @@ class GoogleMapsInfrastructureScraper:
         
         return False
 
-    async def extract_infrastructure_data(self, keyword, district):
-        """Extract data infrastruktur dengan improved URL handling"""
+    def harvest_feed_cards(self):
+        """Baca nama, href dan baris info semua kartu feed dalam satu execute_script"""
+        try:
+            cards = self.driver.execute_script('''
+                return Array.from(document.querySelectorAll(".hfpxzc")).map((link, index) => {
+                    const card = link.closest(".Nv2PK") || link.parentElement;
+                    const lines = card ? Array.from(card.querySelectorAll(".W4Efsd"))
+                        .filter(el => !el.querySelector(".W4Efsd"))
+                        .map(el => el.innerText.trim())
+                        .filter(text => text.length > 0) : [];
+                    return {
+                        index: index,
+                        nama: (link.getAttribute("aria-label") || "").trim(),
+                        href: link.href || "",
+                        lines: lines
+                    };
+                });
+            ''')
+            return cards or []
+        except Exception as e:
+            print(f"⚠️  Error harvest feed: {e}")
+            return []
+
+    def parse_card_info_lines(self, lines):
+        """Ambil kategori dan alamat dari baris info kartu (format 'Kategori · Alamat')"""
+        for line in lines:
+            if "·" not in line:
+                continue
+
+            parts = [part.strip() for part in line.split("·") if part.strip()]
+            if len(parts) >= 2:
+                return {"category": parts[0], "address": parts[-1]}
+
+        return {"category": None, "address": None}
+
+    def build_data_from_card(self, card, keyword, district):
+        """Bangun data infrastruktur dari kartu feed, None jika field tidak lengkap"""
+        nama = card.get("nama")
+        href = card.get("href")
+        if not nama or not href:
+            return None
+
+        place = parse_place_url(href)
+        info = self.parse_card_info_lines(card.get("lines", []))
+        if place["lat"] is None or not info["address"]:
+            return None
+
+        location_info = self.parse_kecamatan_and_village(info["address"])
+        kecamatan = location_info["kecamatan"]
+
+        return {
+            "nama": nama,
+            "kecamatan": district if kecamatan == "Unknown" else kecamatan,
+            "desa": location_info["desa"],
+            "latitude": place["lat"],
+            "longitude": place["lng"],
+            "keyword": keyword,
+            "url": href,
+            "address": info["address"],
+            "place_id": place["place_id"],
+            "cid": place["cid"]
+        }
+
+    def outside_kabupaten(self, lat, lng):
+        """True jika koordinat diketahui dan berada di luar bbox kabupaten"""
+        if not TILE_SWEEP_CONFIG["filter_outside_bbox"] or lat is None or lng is None:
+            return False
+        return not in_kabupaten(lat, lng)
+    
+    def geo_filter(self, records):
+        """Assign kecamatan/desa dari poligon batas (satu batch), buang titik di luar kabupaten"""
+        inside, outside = assign_records(records)
+        for item in outside:
+            self.unit_metrics.count("off_target")
+            print(f"🚫 Di luar batas kabupaten, di-skip: {item['nama']}")
+        for item in inside:
+            if item.get("geo_mismatch"):
+                self.unit_metrics.count("geo_mismatch")
+                print(f"📐 Alamat ({item['geo_mismatch']}) beda dengan geometri "
+                      f"({item['kecamatan']} | {item['desa']}): {item['nama']}")
+        return inside
+    
+    def store_infrastructure_data(self, infrastructure_data, results):
+        """Validasi dan simpan data ke data manager"""
+        nama = infrastructure_data["nama"]
+
+        if self.outside_kabupaten(infrastructure_data["latitude"], infrastructure_data["longitude"]):
+            self.unit_metrics.count("off_target")
+            print(f"🚫 Di luar bbox kabupaten, di-skip: {nama}")
+            return
+        
+        if self.validate_data(infrastructure_data):
+            self.unit_metrics.count("items")
+            self.sightings.append(place_key(infrastructure_data))
+            self.sighting_points.append((infrastructure_data["latitude"], infrastructure_data["longitude"]))
+            
+            if self.defer_dedupe:
+                results.append(infrastructure_data)
+                print(f"✅ Data valid: {nama}")
+                return
+            
+            # add_data method sekarang sudah include comprehensive duplicate check
+            with self.unit_metrics.phase("dedupe"):
+                added = self.data_manager.add_data(infrastructure_data)
+            
+            if added:
+                self.unit_metrics.count("added")
+                results.append(infrastructure_data)
+                print(f"✅ Data tersimpan: {nama}")
+                print(f"   📍 Koordinat: {infrastructure_data['latitude']}, {infrastructure_data['longitude']}")
+                print(f"   🏘️  Kecamatan: {infrastructure_data['kecamatan']}")
+                print(f"   🏡 Desa: {infrastructure_data['desa']}")
+                print(f"   🔗 URL: {infrastructure_data['url'][:50]}...")
+            else:
+                # add_data return False: duplikat dan sudah di-handle
+                self.unit_metrics.count("duplicates")
+        else:
+            self.unit_metrics.count("invalid")
+            print(f"❌ Data tidak valid: {nama}")
+
+    async def extract_infrastructure_data(self, keyword, district, scroll=True):
+        """Extract data infrastruktur dengan improved URL handling (scroll=False: feed sudah lengkap, mis. replay)"""
         results = []
+        self.sightings = []
+        self.sighting_points = []
+        self.last_card_count = 0
         
         try:
             # Wait untuk hasil muncul
-            WebDriverWait(self.driver, 15).until(
+            await self.run_driver(
+                WebDriverWait(self.driver, 15).until,
                 EC.presence_of_element_located((By.CSS_SELECTOR, ".m6QErb"))
             )
             
             # Scroll untuk load semua hasil
-            await self.scroll_to_load_all_results()
+            if scroll:
+                with self.unit_metrics.phase("scroll"):
+                    await self.scroll_to_load_all_results()
+            
+            if self.recorder:
+                await self.run_driver(self.recorder.capture_feed, self.driver, keyword, district)
             
             # Ambil semua link infrastruktur
-            infrastructure_links = self.driver.find_elements(By.CSS_SELECTOR, ".hfpxzc")
+            infrastructure_links = await self.run_driver(self.driver.find_elements, By.CSS_SELECTOR, ".hfpxzc")
             
             print(f"🏗️  Ditemukan {len(infrastructure_links)} infrastruktur")
+            self.last_card_count = len(infrastructure_links)
+            self.unit_metrics.count("cards", len(infrastructure_links))
+            
+            click_indices = list(range(len(infrastructure_links)))
+            
+            # Harvest mode: baca semua kartu sekaligus, click hanya untuk kartu yang tidak lengkap
+            if self.harvest_mode:
+                with self.unit_metrics.phase("harvest"):
+                    cards = await self.run_driver(self.harvest_feed_cards)
+                if cards:
+                    click_indices = []
+                    harvested = []
+                    off_target = 0
+                    for card in cards:
+                        # Kartu yang koordinatnya sudah jelas di luar kabupaten tidak perlu di-click
+                        place = parse_place_url(card.get("href") or "")
+                        if self.outside_kabupaten(place["lat"], place["lng"]):
+                            off_target += 1
+                            continue
+                        
+                        infrastructure_data = self.build_data_from_card(card, keyword, district)
+                        if infrastructure_data:
+                            harvested.append(infrastructure_data)
+                        else:
+                            click_indices.append(card["index"])
+                    
+                    # Point-in-polygon untuk semua kartu feed dalam satu batch
+                    for infrastructure_data in self.geo_filter(harvested):
+                        self.store_infrastructure_data(infrastructure_data, results)
+                    
+                    print(f"⚡ Harvest: {len(cards) - len(click_indices) - off_target}/{len(cards)} kartu tanpa click, "
+                          f"{len(click_indices)} fallback ke click, {off_target} di luar kabupaten")
             
-            for i, link in enumerate(infrastructure_links):
+            for i in click_indices:
                 try:
+                    if i >= len(infrastructure_links):
+                        print("❌ Index out of range, breaking")
+                        break
+                    link = infrastructure_links[i]
                     print(f"\n🎯 Memproses infrastruktur {i+1}/{len(infrastructure_links)}")
                     
                     # Check if element is still valid
                     try:
-                        link.tag_name  # Test if element is still attached to DOM
+                        await self.run_driver(getattr, link, "tag_name")  # Test if element is still attached to DOM
                     except StaleElementReferenceException:
                         print("⚠️  Element stale, re-finding elements...")
-                        infrastructure_links = self.driver.find_elements(By.CSS_SELECTOR, ".hfpxzc")
+                        infrastructure_links = await self.run_driver(
+                            self.driver.find_elements, By.CSS_SELECTOR, ".hfpxzc"
+                        )
                         if i >= len(infrastructure_links):
                             print("❌ Index out of range after re-find, breaking")
                             break
                         link = infrastructure_links[i]
                     
                     # Extract nama dari aria-label SEBELUM click
-                    nama = link.get_attribute("aria-label")
+                    nama = await self.run_driver(link.get_attribute, "aria-label")
                     if not nama:
                         print("⚠️  Nama tidak ditemukan, skip")
                         continue
@@ -549,12 +821,12 @@ class GoogleMapsInfrastructureScraper:
                     print(f"📍 Nama: {nama}")
                     
                     
-                    # Delay sebelum processing
-                    time.sleep(random.uniform(1, 3))
+                    # Pacing buka detail tempat
+                    await self.rate_limiter.acquire("place_open")
                     
                     # Click element dan dapatkan URL yang benar
                     try:
-                        infrastructure_url = self.click_element_and_get_url(link, f"infrastruktur {i+1}")
+                        infrastructure_url = await self.click_element_and_get_url(link, f"infrastruktur {i+1}")
                     except Exception as e:
                         print(f"⚠️  Error clicking element: {e}")
                         infrastructure_url = None
@@ -563,14 +835,21 @@ class GoogleMapsInfrastructureScraper:
                         print(f"❌ Tidak bisa mendapat URL untuk {nama}")
                         continue
                     
-                    # Wait tambahan untuk detail load
-                    time.sleep(random.uniform(2, 4))
+                    # Wait sampai panel detail tempat ini ter-render (judul + alamat)
+                    with self.unit_metrics.phase("detail_wait"):
+                        panel = await self.run_driver(dom_waits.wait_for_detail_panel, self.driver, nama)
+                    if panel.get("timed_out"):
+                        print("⚠️  Panel detail belum lengkap sampai timeout")
+                    elif self.recorder:
+                        await self.run_driver(self.recorder.capture_detail, self.driver)
                     
                     # Extract koordinat dari URL yang benar
                     coordinates = self.extract_coordinates_from_url(infrastructure_url)
+                    place = parse_place_url(infrastructure_url)
                     
                     # Extract alamat dan lokasi
-                    location_info = self.extract_address_and_parse_location()
+                    with self.unit_metrics.phase("address"):
+                        location_info = await self.run_driver(self.extract_address_and_parse_location)
                     
                     # Buat data infrastruktur
                     infrastructure_data = {
@@ -581,40 +860,31 @@ class GoogleMapsInfrastructureScraper:
                         "longitude": coordinates["lng"],
                         "keyword": keyword,
                         "url": infrastructure_url,
-                        "address": location_info["address"]
+                        "address": location_info["address"],
+                        "place_id": place["place_id"],
+                        "cid": place["cid"]
                     }
                     
-                    # Validasi data
-                    if self.validate_data(infrastructure_data):
-                        # add_data method sekarang sudah include comprehensive duplicate check
-                        if self.data_manager.add_data(infrastructure_data):
-                            results.append(infrastructure_data)
-                            print(f"✅ Data tersimpan: {nama}")
-                            print(f"   📍 Koordinat: {coordinates['lat']}, {coordinates['lng']}")
-                            print(f"   🏘️  Kecamatan: {infrastructure_data['kecamatan']}")
-                            print(f"   🏡 Desa: {infrastructure_data['desa']}")
-                            print(f"   🔗 URL: {infrastructure_url[:50]}...")
-                        # Jika add_data return False, berarti duplikat dan sudah di-handle
-                    else:
-                        print(f"❌ Data tidak valid: {nama}")
+                    # Assign wilayah dari geometri, validasi dan simpan data
+                    for infrastructure_data in self.geo_filter([infrastructure_data]):
+                        self.store_infrastructure_data(infrastructure_data, results)
                     
                     # Human behavior simulation
-                    self.simulate_human_behavior()
-                    
-                    # Delay antar item
-                    time.sleep(random.uniform(
-                        SCRAPING_CONFIG["delay_between_items"],
-                        SCRAPING_CONFIG["delay_between_items"] + 2
-                    ))
+                    await self.simulate_human_behavior()
                     
                 except StaleElementReferenceException:
+                    self.unit_metrics.count("failures")
                     print("⚠️  Element stale during processing, continuing...")
                     continue
                 except Exception as e:
+                    self.unit_metrics.count("failures")
+                    self.security_metrics["error_count"] += 1
                     print(f"⚠️  Error item {i+1}: {e}")
                     continue
         
         except Exception as e:
+            self.unit_metrics.count("failures")
+            self.security_metrics["error_count"] += 1
             print(f"❌ Error extract data: {e}")
         
         return results
@@ -656,25 +926,10 @@ class GoogleMapsInfrastructureScraper:
             try:
                 print(f"\n🔍 Keyword {keyword_index + 1}/{len(KEYWORDS)}: {keyword}")
                 
-                # Lakukan pencarian
-                if await self.search_infrastructure(keyword, district):
-                    # Extract data infrastruktur
-                    results = await self.extract_infrastructure_data(keyword, district)
-                    
-                    # Simpan ke data manager
-                    added_count = self.data_manager.add_multiple_data(results)
-                    print(f"✅ Berhasil menambah {added_count} data baru")
-                else:
-                    print(f"❌ Pencarian gagal untuk {keyword}")
-                
-                # Delay antar keyword
-                if keyword_index < len(KEYWORDS) - 1:
-                    delay = random.uniform(
-                        SCRAPING_CONFIG["delay_between_keywords"],
-                        SCRAPING_CONFIG["delay_between_keywords"] + 3
-                    )
-                    print(f"⏸️  Istirahat antar keyword ({delay:.1f}s)...")
-                    time.sleep(delay)
+                # Search + extract; data sudah ditambahkan ke data manager saat extract
+                results = await self.scrape_keyword(keyword, district)
+                if results is not None:
+                    print(f"✅ Berhasil menambah {len(results)} data baru")
                 
             except Exception as e:
                 print(f"❌ Error keyword {keyword}: {e}")
@@ -697,25 +952,24 @@ class GoogleMapsInfrastructureScraper:
             try:
                 print(f"\n📍 Kecamatan {district_index + 1}/{len(DISTRICTS)}: {district}")
                 
-                # Session break setiap 3 kecamatan
-                if district_index > 0 and district_index % 3 == 0:
-                    self.simulate_session_break()
+                # Session break setiap session_break_interval kecamatan
+                if self.rate_limiter.session_break_due(district_index):
+                    await self.simulate_session_break()
                 
                 await self.scrape_district(district)
                 
-                # Simpan progress setelah setiap kecamatan
-                self.data_manager.save_to_files()
-                stats = self.data_manager.get_stats()
-                print(f"💾 Progress tersimpan - Total: {stats['total']} infrastruktur")
+                # Checkpoint journal setelah setiap kecamatan (snapshot dibuat saat compaction)
+                total = self.data_manager.checkpoint()
+                print(f"💾 Progress tersimpan di journal - Total: {total} infrastruktur")
                 
                 # Delay antar kecamatan
                 if district_index < len(DISTRICTS) - 1:
-                    delay = random.uniform(
+                    print("🏖️  Istirahat antar kecamatan...")
+                    await self.pause(
                         SCRAPING_CONFIG["delay_between_districts"],
-                        SCRAPING_CONFIG["delay_between_districts"] + 10
+                        SCRAPING_CONFIG["delay_between_districts"] + 10,
+                        reason="district"
                     )
-                    print(f"🏖️  Istirahat antar kecamatan ({delay:.1f}s)...")
-                    time.sleep(delay)
                 
             except Exception as e:
                 print(f"❌ Error kecamatan {district}: {e}")
@@ -738,80 +992,93 @@ class GoogleMapsInfrastructureScraper:
             print(f"   {keyword}: {count} infrastruktur")
         
         # Simpan final
-        files = self.data_manager.save_to_files()
-        print(f"\n💾 Data final disimpan:")
-        print(f"   📄 JSON: {files['json']}")
-        print(f"   📊 CSV: {files['csv']}")
+        print_saved_files(self.data_manager.save_to_files())
     
     def close(self):
         """Tutup browser"""
+        if self.owns_data_manager:
+            self.data_manager.close()
+        
         if self.driver:
             print("🔄 Menutup browser...")
             self.driver.quit()
+            self.driver = None
+            self.release_profile()
             print("✅ Browser ditutup")
+            self.rate_limiter.print_report()
+            if self.traffic_meter:
+                self.traffic_meter.print_summary()
+        
+        self.executor.shutdown(wait=False)
     
     def __del__(self):
         """Destructor"""
         self.close()
 
-    def simulate_session_break(self):
+    def clear_browser_storage(self):
+        self.driver.delete_all_cookies()
+        self.driver.execute_script("window.localStorage.clear();")
+        self.driver.execute_script("window.sessionStorage.clear();")
+    
+    async def simulate_session_break(self):
         """Simulasi break session untuk avoid detection"""
         print("🛌 Session break - simulasi user istirahat...")
         
-        # Random break duration (5-15 menit)
-        break_duration = random.uniform(300, 900)
+        break_duration = 0.0
         
         # Clear browser data
         try:
-            self.driver.delete_all_cookies()
-            self.driver.execute_script("window.localStorage.clear();")
-            self.driver.execute_script("window.sessionStorage.clear();")
+            await self.run_driver(self.clear_browser_storage)
         except:
             pass
         
-        # Navigate to different page
+        # Navigate to different page (replay harness: tetap di server lokal, tanpa request ke Google)
         try:
-            self.driver.get("https://www.google.com")
-            time.sleep(random.uniform(30, 60))
-            self.driver.get("https://maps.google.com/?hl=id")
-            time.sleep(random.uniform(10, 20))
+            live = self.start_url == SCRAPING_CONFIG["start_url"]
+            await self.run_driver(self.driver.get, "https://www.google.com" if live else "about:blank")
+            break_duration += await self.pause(30, 60, reason="break")
+            await self.run_driver(self.driver.get, self.start_url)
+            break_duration += await self.pause(10, 20, reason="break")
         except:
             pass
         
+        # Traffic selama break tidak dihitung ke query berikutnya
+        await self.collect_traffic("session break", query=False)
         print(f"💤 Session break selesai ({break_duration/60:.1f} menit)")
 
-    def recovery_mechanism(self, error_type="general"):
+    async def recovery_mechanism(self, error_type="general"):
         """Recovery mechanism untuk berbagai jenis error"""
         print(f"🔄 Aktivating recovery untuk {error_type}...")
         
         try:
             if error_type == "captcha":
                 print("🤖 Possible CAPTCHA detected - taking longer break...")
-                time.sleep(random.uniform(300, 600))  # 5-10 menit
+                await self.pause(300, 600, reason="recovery")  # 5-10 menit
                 
             elif error_type == "rate_limit":
                 print("⏰ Rate limit detected - cooling down...")
-                time.sleep(random.uniform(600, 1200))  # 10-20 menit
+                await self.pause(600, 1200, reason="recovery")  # 10-20 menit
                 
             elif error_type == "blocked":
                 print("🚫 Possible blocking - restart session...")
-                self.restart_browser_session()
+                await self.restart_browser_session()
             
             # Clear dan refresh
-            self.driver.delete_all_cookies()
-            self.driver.refresh()
-            time.sleep(random.uniform(10, 20))
+            await self.run_driver(self.driver.delete_all_cookies)
+            await self.run_driver(self.driver.refresh)
+            await self.pause(10, 20, reason="recovery")
             
         except Exception as e:
             print(f"⚠️ Recovery error: {e}")
 
-    def restart_browser_session(self):
+    async def restart_browser_session(self):
         """Restart browser session completely"""
         try:
             if self.driver:
-                self.driver.quit()
-            time.sleep(random.uniform(30, 60))
-            self.setup_driver()
+                await self.run_driver(self.driver.quit)
+                self.driver = None
+            await self.pause(30, 60, reason="recovery")
+            await self.run_driver(self.setup_driver)
         except Exception as e:
             print(f"⚠️ Restart error: {e}")
 
@@ -860,14 +1127,14 @@ class GoogleMapsInfrastructureScraper:
             print(f"⚠️  Memory cleanup error: {e}")
 
     def robust_element_interaction(self, selector, action="click", max_retries=3):
-        """Robust element interaction dengan retry logic"""
+        """Robust element interaction dengan retry logic (blocking, jalankan lewat run_driver dari async code)"""
         for attempt in range(max_retries):
             try:
                 elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
                 if not elements:
                     if attempt < max_retries - 1:
                         print(f"🔄 Attempt {attempt + 1}: Element not found, retrying...")
-                        time.sleep(random.uniform(2, 4))
+                        self.rate_limiter.pause_sync(2, 4)
                         continue
                     else:
                         return None
@@ -877,7 +1144,7 @@ class GoogleMapsInfrastructureScraper:
                 # Check if element is interactable
                 if not element.is_displayed() or not element.is_enabled():
                     self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                    time.sleep(1)
+                    self.rate_limiter.pause_sync(1, 1)
                 
                 if action == "click":
                     element.click()
@@ -890,12 +1157,12 @@ class GoogleMapsInfrastructureScraper:
                 
             except StaleElementReferenceException:
                 print(f"🔄 Stale element on attempt {attempt + 1}, retrying...")
-                time.sleep(random.uniform(1, 3))
+                self.rate_limiter.pause_sync(1, 3)
                 continue
             except Exception as e:
                 print(f"⚠️  Error on attempt {attempt + 1}: {e}")
                 if attempt < max_retries - 1:
-                    time.sleep(random.uniform(2, 4))
+                    self.rate_limiter.pause_sync(2, 4)
                     continue
                 else:
                     return None
@@ -917,26 +1184,25 @@ class GoogleMapsInfrastructureScraper:
             try:
                 print(f"\n📍 Kecamatan {district_index + 1}/{len(self.selected_districts)}: {district}")
                 
-                # Session break setiap 3 kecamatan
-                if district_index > 0 and district_index % 3 == 0:
-                    self.simulate_session_break()
+                # Session break setiap session_break_interval kecamatan
+                if self.rate_limiter.session_break_due(district_index):
+                    await self.simulate_session_break()
                 
                 # Scrape dengan keyword yang dipilih
                 await self.scrape_district_with_selected_keywords(district)
                 
-                # Simpan progress setelah setiap kecamatan
-                self.data_manager.save_to_files()
-                stats = self.data_manager.get_stats()
-                print(f"💾 Progress tersimpan - Total: {stats['total']} infrastruktur")
+                # Checkpoint journal setelah setiap kecamatan (snapshot dibuat saat compaction)
+                total = self.data_manager.checkpoint()
+                print(f"💾 Progress tersimpan di journal - Total: {total} infrastruktur")
                 
                 # Delay antar kecamatan
                 if district_index < len(self.selected_districts) - 1:
-                    delay = random.uniform(
+                    print("🏖️  Istirahat antar kecamatan...")
+                    await self.pause(
                         SCRAPING_CONFIG["delay_between_districts"],
-                        SCRAPING_CONFIG["delay_between_districts"] + 10
+                        SCRAPING_CONFIG["delay_between_districts"] + 10,
+                        reason="district"
                     )
-                    print(f"🏖️  Istirahat antar kecamatan ({delay:.1f}s)...")
-                    time.sleep(delay)
                 
             except Exception as e:
                 print(f"❌ Error kecamatan {district}: {e}")
@@ -957,24 +1223,218 @@ class GoogleMapsInfrastructureScraper:
         print("\n🏗️  Distribusi per jenis infrastruktur:")
         for keyword, count in final_stats['by_keyword'].items():
             print(f"   {keyword}: {count} infrastruktur")
+        
+        # Compaction: journal -> snapshot JSON/CSV
+        print_saved_files(self.data_manager.save_to_files())
+    
+    async def search_tile(self, keyword, tile):
+        """Pencarian berbasis koordinat: buka /maps/search/{keyword}/@lat,lng,zoom untuk satu tile"""
+        try:
+            await self.rate_limiter.acquire("search")
+            self.security_metrics["requests_count"] += 1
+            self.security_metrics["last_request_time"] = time.time()
+            
+            original_url = await self.run_driver(self.get_current_url)
+            print(f"🔍 Tile {tile.tile_id} (zoom {tile.zoom()}): {keyword}")
+            await self.run_driver(self.driver.get, tile.search_url(keyword))
+            
+            state = await self.run_driver(dom_waits.wait_for_search_results, self.driver, original_url)
+            if state.get("timed_out"):
+                print("⚠️  Hasil pencarian belum ter-render sampai timeout")
+            
+            return True
+            
+        except Exception as e:
+            print(f"❌ Error saat pencarian tile {tile.tile_id}: {e}")
+            return False
+    
+    async def scrape_keyword_tiles(self, keyword):
+        """Sweep satu keyword per tile dengan subdivisi adaptif untuk tile yang jenuh"""
+        sweep = TileSweep(keyword)
+        
+        while True:
+            tile = sweep.next_tile()
+            if tile is None:
+                break
+            
+            self.unit_metrics = self.metrics.start_unit(f"tile:{tile.tile_id}", keyword)
+            waits_before = dict(self.rate_limiter.waited)
+            
+            with self.unit_metrics.phase("search"):
+                searched = await self.search_tile(keyword, tile)
+            if not searched:
+                sweep.mark_failed(tile)
+                await self.collect_traffic(f"tile {tile.tile_id}: {keyword}")
+                self.finish_unit_metrics("failed", waits_before)
+                continue
+            
+            # Kecamatan ditentukan dari alamat; "Unknown" jika tidak bisa di-parse
+            results = await self.extract_infrastructure_data(keyword, "Unknown")
+            in_tile = sum(1 for lat, lng in self.sighting_points if tile.contains(lat, lng))
+            sweep.record(tile, self.last_card_count, in_tile, len(results))
+            self.data_manager.checkpoint()
+            await self.collect_traffic(f"tile {tile.tile_id}: {keyword}")
+            self.finish_unit_metrics("done", waits_before)
+        
+        sweep.print_report()
+        return sweep.report()
+    
+    async def scrape_keyword_tiles_with_ledger(self, keyword):
+        """scrape_keyword_tiles dengan unit (TILE_SHARD_DISTRICT, keyword) di task ledger"""
+        if not self.task_ledger:
+            return await self.scrape_keyword_tiles(keyword)
+        
+        self.task_ledger.mark_running(TILE_SHARD_DISTRICT, keyword)
+        try:
+            report = await self.scrape_keyword_tiles(keyword)
+        except Exception as e:
+            self.task_ledger.mark_failed(TILE_SHARD_DISTRICT, keyword, e)
+            raise
+        
+        # Tile yang gagal dicari membuat coverage keyword ini tidak lengkap: unit di-retry saat resume
+        if report["failed"]:
+            self.task_ledger.mark_failed(TILE_SHARD_DISTRICT, keyword,
+                                         f"tile gagal: {', '.join(report['failed'])}")
+        else:
+            self.data_manager.checkpoint()
+            self.task_ledger.mark_done(TILE_SHARD_DISTRICT, keyword, report["added"])
+        
+        return report
+    
+    async def scrape_selected_tiles(self):
+        """Tile sweep seluruh bbox kabupaten untuk keyword yang dipilih user"""
+        print("🚀 MEMULAI TILE SWEEP INFRASTRUKTUR")
+        print(f"🎯 Target: bbox kabupaten × {len(self.selected_keywords)} infrastruktur")
+        print("=" * 60)
+        
+        self.data_manager.load_existing_data()
+        
+        start_time = time.time()
+        reports = []
+        
+        keywords = self.selected_keywords
+        if self.task_ledger:
+            keywords = self.task_ledger.unfinished_keywords(TILE_SHARD_DISTRICT, keywords)
+            skipped = len(self.selected_keywords) - len(keywords)
+            if skipped:
+                print(f"⏭️  {skipped} keyword sudah selesai menurut ledger, di-skip")
+        
+        for keyword_index, keyword in enumerate(keywords):
+            try:
+                print(f"\n🔍 Keyword {keyword_index + 1}/{len(keywords)}: {keyword}")
+                reports.append(await self.scrape_keyword_tiles_with_ledger(keyword))
+            except Exception as e:
+                print(f"❌ Error keyword {keyword}: {e}")
+                continue
+        
+        total_time = time.time() - start_time
+        final_stats = self.data_manager.get_stats()
+        
+        print("\n" + "=" * 60)
+        print("🎉 TILE SWEEP SELESAI!")
+        print(f"⏰ Total waktu: {total_time/3600:.1f} jam")
+        print(f"📊 Total infrastruktur: {final_stats['total']}")
+        print(f"🗺️  Coverage disimpan: {save_coverage(reports)}")
+        
+        print_saved_files(self.data_manager.save_to_files())
+    
+    def metric_gauges(self):
+        """security_metrics sebagai gauge Prometheus"""
+        return {
+            "requests_count": self.security_metrics["requests_count"],
+            "error_count": self.security_metrics["error_count"],
+            "last_request_timestamp_seconds": round(self.security_metrics["last_request_time"], 3),
+            "session_start_timestamp_seconds": round(self.security_metrics["session_start"], 3)
+        }
+    
+    async def collect_traffic(self, label, query=True):
+        """Kuras performance log Chrome (profil lean) setiap unit/break supaya tidak menumpuk"""
+        if not self.traffic_meter or not self.driver:
+            return
+        try:
+            stats = await self.run_driver(self.traffic_meter.collect, self.driver, query)
+            self.traffic_meter.print_query(stats, label)
+        except Exception as e:
+            print(f"⚠️  Traffic meter error: {e}")
+    
+    def finish_unit_metrics(self, status, waits_before):
+        """Tutup metrics unit aktif beserta tunggu rate limiter selama unit berjalan"""
+        if status != "done":
+            self.security_metrics["error_count"] += 1
+        
+        waits = {}
+        for reason, seconds in self.rate_limiter.waited.items():
+            delta = seconds - waits_before.get(reason, 0.0)
+            if delta > 0:
+                waits[reason] = delta
+        
+        self.metrics.finish_unit(self.unit_metrics, status, waits, gauges=self.metric_gauges(),
+                                 labels=self.metric_labels)
+        self.unit_metrics = UnitMetrics()
+    
+    async def scrape_keyword(self, keyword, district):
+        """Satu unit kerja kecamatan×keyword: search + extract, None jika pencarian gagal"""
+        self.unit_metrics = self.metrics.start_unit(district, keyword)
+        waits_before = dict(self.rate_limiter.waited)
+        status = "error"
+        
+        try:
+            with self.unit_metrics.phase("search"):
+                searched = await self.search_infrastructure(keyword, district)
+            if not searched:
+                status = "failed"
+                print(f"❌ Pencarian gagal untuk {keyword}")
+                return None
+            
+            results = await self.extract_infrastructure_data(keyword, district)
+            status = "done"
+            print(f"✅ Proses keyword '{keyword}' selesai")
+            
+            return results
+        
+        finally:
+            await self.collect_traffic(f"{keyword} di {district}")
+            self.finish_unit_metrics(status, waits_before)
+    
+    async def scrape_keyword_with_ledger(self, keyword, district):
+        """scrape_keyword dengan pencatatan state unit di task ledger"""
+        if not self.task_ledger:
+            return await self.scrape_keyword(keyword, district)
+        
+        self.task_ledger.mark_running(district, keyword)
+        try:
+            results = await self.scrape_keyword(keyword, district)
+        except Exception as e:
+            self.task_ledger.mark_failed(district, keyword, e)
+            raise
+        
+        if results is None:
+            self.task_ledger.mark_failed(district, keyword, "pencarian gagal")
+        else:
+            # Pastikan record sudah durable di journal sebelum unit ditandai selesai
+            self.data_manager.checkpoint()
+            self.task_ledger.record_sightings(district, keyword, self.sightings)
+            self.task_ledger.mark_done(district, keyword, len(results))
+        
+        return results
     
     async def scrape_district_with_selected_keywords(self, district):
         """Scrape kecamatan dengan keyword yang dipilih user"""
         print(f"\n🌍 Memulai scraping kecamatan: {district}")
         
-        for keyword_index, keyword in enumerate(self.selected_keywords):
+        keywords = self.selected_keywords
+        if self.task_ledger:
+            keywords = self.task_ledger.unfinished_keywords(district, keywords)
+            skipped = len(self.selected_keywords) - len(keywords)
+            if skipped:
+                print(f"⏭️  {skipped} keyword sudah selesai menurut ledger, di-skip")
+        
+        for keyword_index, keyword in enumerate(keywords):
             try:
-                print(f"\n🔍 Keyword {keyword_index + 1}/{len(self.selected_keywords)}: {keyword}")
+                print(f"\n🔍 Keyword {keyword_index + 1}/{len(keywords)}: {keyword}")
                 
-                # Lakukan pencarian
-                if await self.search_infrastructure(keyword, district):
-                    # Extract data infrastruktur
-                    results = await self.extract_infrastructure_data(keyword, district)
-                    
-                    # Results sudah ditambahkan di extract_infrastructure_data
-                    print(f"✅ Proses keyword '{keyword}' selesai")
-                else:
-                    print(f"❌ Pencarian gagal untuk {keyword}")
+                # Results sudah ditambahkan di extract_infrastructure_data
+                await self.scrape_keyword_with_ledger(keyword, district)
             
             except Exception as e:
                 print(f"❌ Error keyword {keyword}: {e}")
@@ -0,0 +1,147 @@
+import sqlite3
+from datetime import datetime
+from config import LEDGER_CONFIG, OUTPUT_FILES
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+class TaskLedger:
+    """Ledger SQLite untuk unit kerja kecamatan×keyword (resume setelah crash)"""
+
+    def __init__(self, filename=None):
+        self.filename = filename or OUTPUT_FILES["ledger"]
+        self.connection = sqlite3.connect(self.filename, timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute('''
+            CREATE TABLE IF NOT EXISTS tasks (
+                district TEXT NOT NULL,
+                keyword TEXT NOT NULL,
+                state TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT,
+                started_at TEXT,
+                finished_at TEXT,
+                yield_count INTEGER,
+                error TEXT,
+                PRIMARY KEY (district, keyword)
+            )
+        ''')
+        # Sightings dan statistik pencarian lintas run (tidak dihapus start_run), dipakai query planner
+        self.connection.execute('''
+            CREATE TABLE IF NOT EXISTS sightings (
+                district TEXT NOT NULL,
+                keyword TEXT NOT NULL,
+                place_key TEXT NOT NULL,
+                first_seen TEXT,
+                PRIMARY KEY (district, keyword, place_key)
+            )
+        ''')
+        self.connection.execute('''
+            CREATE TABLE IF NOT EXISTS searches (
+                district TEXT NOT NULL,
+                keyword TEXT NOT NULL,
+                runs INTEGER NOT NULL DEFAULT 0,
+                last_yield INTEGER,
+                last_run TEXT,
+                PRIMARY KEY (district, keyword)
+            )
+        ''')
+        self.connection.commit()
+
+    def start_run(self, districts, keywords):
+        """Run baru: ganti isi ledger dengan semua unit pilihan user sebagai pending"""
+        self.start_units([(district, keyword) for district in districts for keyword in keywords])
+
+    def start_units(self, units):
+        """Run baru dengan daftar unit eksplisit (mis. satu shard dari job spec)"""
+        now = datetime.now().isoformat()
+        with self.connection:
+            self.connection.execute("DELETE FROM tasks")
+            self.connection.executemany(
+                "INSERT INTO tasks (district, keyword, state, created_at) VALUES (?, ?, ?, ?)",
+                [(district, keyword, PENDING, now) for district, keyword in units]
+            )
+
+    def recover_interrupted(self):
+        """Unit yang masih 'running' saat proses mati dikembalikan ke pending"""
+        with self.connection:
+            cursor = self.connection.execute(
+                "UPDATE tasks SET state = ? WHERE state = ?", (PENDING, RUNNING)
+            )
+        return cursor.rowcount
+
+    def unfinished(self):
+        """Unit pending/failed yang masih punya sisa attempt, dalam urutan pendaftaran"""
+        rows = self.connection.execute(
+            "SELECT district, keyword FROM tasks WHERE state IN (?, ?) AND attempts < ? ORDER BY rowid",
+            (PENDING, FAILED, LEDGER_CONFIG["max_attempts"])
+        )
+        return [(district, keyword) for district, keyword in rows]
+
+    def unfinished_keywords(self, district, keywords):
+        """Filter keyword kecamatan ini ke unit yang belum selesai"""
+        remaining = {keyword for task_district, keyword in self.unfinished() if task_district == district}
+        return [keyword for keyword in keywords if keyword in remaining]
+
+    def mark_running(self, district, keyword):
+        with self.connection:
+            self.connection.execute(
+                "UPDATE tasks SET state = ?, attempts = attempts + 1, started_at = ?, error = NULL "
+                "WHERE district = ? AND keyword = ?",
+                (RUNNING, datetime.now().isoformat(), district, keyword)
+            )
+
+    def mark_done(self, district, keyword, yield_count):
+        with self.connection:
+            self.connection.execute(
+                "UPDATE tasks SET state = ?, finished_at = ?, yield_count = ? WHERE district = ? AND keyword = ?",
+                (DONE, datetime.now().isoformat(), yield_count, district, keyword)
+            )
+
+    def mark_failed(self, district, keyword, error):
+        with self.connection:
+            self.connection.execute(
+                "UPDATE tasks SET state = ?, finished_at = ?, error = ? WHERE district = ? AND keyword = ?",
+                (FAILED, datetime.now().isoformat(), str(error)[:500], district, keyword)
+            )
+
+    def record_sightings(self, district, keyword, place_keys):
+        """Semua tempat yang terlihat satu pencarian, termasuk yang duplikat di dataset"""
+        now = datetime.now().isoformat()
+        place_keys = set(place_keys)
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO sightings (district, keyword, place_key, first_seen) VALUES (?, ?, ?, ?)",
+                [(district, keyword, place_key, now) for place_key in place_keys]
+            )
+            self.connection.execute(
+                "INSERT INTO searches (district, keyword, runs, last_yield, last_run) VALUES (?, ?, 1, ?, ?) "
+                "ON CONFLICT (district, keyword) DO UPDATE SET "
+                "runs = runs + 1, last_yield = excluded.last_yield, last_run = excluded.last_run",
+                (district, keyword, len(place_keys), now)
+            )
+
+    def sightings(self):
+        return list(self.connection.execute("SELECT district, keyword, place_key FROM sightings"))
+
+    def searched_units(self):
+        """Pasangan (kecamatan, keyword) yang pernah dicari, termasuk yang hasilnya nol"""
+        return {(district, keyword) for district, keyword in
+                self.connection.execute("SELECT district, keyword FROM searches")}
+
+    def summary(self):
+        """Jumlah unit per state"""
+        rows = self.connection.execute("SELECT state, COUNT(*) FROM tasks GROUP BY state")
+        counts = {PENDING: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        counts.update(dict(rows))
+        return counts
+
+    def print_summary(self):
+        counts = self.summary()
+        print(f"📒 Ledger: {counts[DONE]} selesai, {counts[PENDING]} pending, "
+              f"{counts[FAILED]} gagal, {counts[RUNNING]} berjalan")
+
+    def close(self):
+        self.connection.close()
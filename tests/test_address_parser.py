@@ -0,0 +1,46 @@
+import json
+import pytest
+from address_parser import UNKNOWN, Gazetteer, import_gazetteer, load_gazetteer, name_key, parse_location, \
+    suggest_variants
+from config import DISTRICTS
+
+@pytest.mark.parametrize("address, expected", [
+    ("Jl. Jenderal Sudirman, Galonta, Kec. Enrekang, Kabupaten Enrekang, Sulawesi Selatan 91711",
+     ("Enrekang", "Galonta")),
+    ("JR35+9HG, Tampo, Kec. Anggeraja, Kabupaten Enrekang, Sulawesi Selatan 91752", ("Anggeraja", "Tampo")),
+    ("Tindallun, Kec. Anggeraja, Kabupaten Enrekang", ("Anggeraja", "Tindalun")),
+    ("Desa Kabiolangi, Kec. Alla, Kabupaten Enrekang", ("Alla", "Kambiolangi")),
+    # Format Inggris tanpa "Kec.": kecamatan dari desa yang unik di gazetteer
+    ("Latimojong, Enrekang Regency, South Sulawesi", ("Buntu Batu", "Latimojong")),
+    ("Jl. Poros Enrekang-Sidrap, Bangkala, Maiwa, Enrekang Regency, South Sulawesi", ("Maiwa", "Bangkala")),
+    # Desa belum ada di gazetteer: bagian tepat sebelum "Kec." tetap dipakai
+    ("Lingkungan Baru, Kec. Baraka, Kabupaten Enrekang", ("Baraka", "Lingkungan Baru")),
+    ("Jl. Poros, Kec. Sidenreng, Kabupaten Sidenreng Rappang", (UNKNOWN, UNKNOWN)),
+    ("", (UNKNOWN, UNKNOWN)),
+])
+def test_parse_location(address, expected):
+    assert parse_location(address) == expected
+
+def test_shipped_gazetteer_covers_all_districts_without_cross_listing():
+    with open("enrekang_gazetteer.json", encoding="utf-8") as f:
+        kecamatan_desa = json.load(f)["kecamatan"]
+    assert sorted(kecamatan_desa) == sorted(DISTRICTS)
+    keys = [name_key(desa) for desa_list in kecamatan_desa.values() for desa in desa_list]
+    assert len(keys) == len(set(keys))
+    assert len(keys) > 120
+
+def test_import_gazetteer_from_kemendagri_codes(tmp_path):
+    codes = tmp_path / "kode.csv"
+    codes.write_text("73.16,KABUPATEN ENREKANG\n73.16.01,MAIWA\n73.16.01.1001,BANGKALA\n"
+                     "73.16.01.2001,Pasang\n73.16.09,Buntu  Batu\n73.16.09.2001,Latimojong\n"
+                     "73.17.01.2001,Bukan Enrekang\n", encoding="utf-8")
+    gazetteer = import_gazetteer(str(codes))
+    assert gazetteer["kecamatan"] == {"Buntu Batu": ["Latimojong"], "Maiwa": ["Bangkala", "Pasang"]}
+
+def test_suggest_variants_does_not_invent_desa():
+    gazetteer = Gazetteer({"Enrekang": ["Rossoan", "Galonta"]})
+    records = [{"kecamatan": "Enrekang", "desa": "Rosoan"}, {"kecamatan": "Enrekang", "desa": "Galonta"},
+               {"kecamatan": "Enrekang", "desa": "Talaga"}, {"kecamatan": "Enrekang", "desa": "Talaga"}]
+    assert suggest_variants(records, gazetteer) == {("Enrekang", "Rosoan"): ("Rossoan", 1),
+                                                    ("Enrekang", "Talaga"): (None, 2)}
+    assert load_gazetteer() is load_gazetteer()
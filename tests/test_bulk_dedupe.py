@@ -0,0 +1,54 @@
+import random
+import time
+import pytest
+from bulk_dedupe import bulk_deduplicate
+from data_manager import DataManager
+
+def random_records(seed, count, positions, jitter):
+    """Record acak dengan nama/URL berulang dan koordinat menumpuk di sedikit posisi"""
+    rng = random.Random(seed)
+    anchors = [(-3.55 + rng.random() * 0.01, 119.78 + rng.random() * 0.01) for _ in range(positions)]
+    records = []
+    for _ in range(count):
+        item = {"nama": f"Fasilitas {rng.randint(0, count // 2)}", "kecamatan": rng.choice(["Enrekang", "Alla"]),
+                "desa": rng.choice(["Juppandang", "Kambiolangi"])}
+        if rng.random() < 0.5:
+            item["url"] = f"https://www.google.com/maps/place/{rng.randint(0, count)}"
+        if rng.random() < 0.9:
+            lat, lng = rng.choice(anchors)
+            item["latitude"] = lat + rng.uniform(-jitter, jitter)
+            item["longitude"] = lng + rng.uniform(-jitter, jitter)
+        records.append(item)
+    return records
+
+def sequential_deduplicate(records):
+    manager = DataManager()
+    manager.data = list(records)
+    manager.remove_duplicates_from_existing_data()
+    return manager.data
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("positions, jitter", [(400, 0.0003), (7, 0.0008), (3, 0.0)])
+def test_bulk_matches_sequential_dedupe(seed, positions, jitter):
+    records = random_records(seed, 300, positions, jitter)
+    unique, report = bulk_deduplicate(records)
+
+    expected = sequential_deduplicate(records)
+    assert [id(item) for item in unique] == [id(item) for item in expected]
+    assert report["kept"] == len(expected)
+    assert sum(report["by_reason"].values()) == report["removed"]
+
+def test_dense_identical_coordinates_stay_fast():
+    # Ratusan ribu pasangan kandidat di satu titik tidak boleh di-expand O(k^2)
+    records = [{"nama": f"Titik {i}", "latitude": -3.5, "longitude": 119.8} for i in range(60000)]
+    start = time.perf_counter()
+    unique, report = bulk_deduplicate(records)
+    assert time.perf_counter() - start < 10
+    assert unique == records[:1]
+    assert report["by_reason"]["coordinates"] == 59999
+
+def test_records_without_coordinates():
+    records = [{"nama": "A"}, {"nama": "B", "latitude": "abc", "longitude": None}, {"nama": "a"}]
+    unique, report = bulk_deduplicate(records)
+    assert [item["nama"] for item in unique] == ["A", "B"]
+    assert report["by_reason"]["location"] == 1
@@ -0,0 +1,62 @@
+import json
+import random
+import pytest
+from cluster_index import CATEGORIES, ClusterIndex, build_cluster_index
+
+def random_records(seed, count):
+    rng = random.Random(seed)
+    keywords = ["sekolah", "masjid", "puskesmas", "tidak ada di kategori"]
+    records = [{"nama": f"Fasilitas {i}", "keyword": rng.choice(keywords),
+                "latitude": -3.6 + rng.random() * 0.5, "longitude": 119.6 + rng.random() * 0.5}
+               for i in range(count)]
+    # Titik menumpuk di satu lokasi dan record tanpa koordinat
+    records += [{"nama": f"Tumpuk {i}", "keyword": "sekolah", "latitude": -3.55, "longitude": 119.78}
+                for i in range(5)]
+    records.append({"nama": "Tanpa koordinat", "keyword": "sekolah"})
+    return records
+
+@pytest.mark.parametrize("seed", range(3))
+def test_children_and_counts_are_consistent(seed):
+    records = random_records(seed, 300)
+    index = build_cluster_index(records)
+    levels = index["levels"]
+    leaf_zoom = index["max_zoom"] + 1
+    leaves = levels[str(leaf_zoom)]
+    assert len(leaves["lng"]) == len(records) - 1
+
+    # Hitung ulang count/kategori tiap cluster dari children di level bawah
+    counts = [1] * len(leaves["lng"])
+    categories = [[int(category == position) for position in range(len(CATEGORIES))] for category in leaves["category"]]
+    for zoom in range(index["max_zoom"], index["min_zoom"] - 1, -1):
+        level = levels[str(zoom)]
+        assert level["lng"] == sorted(level["lng"])
+        children = [child for node_children in level["children"] for child in node_children]
+        # Setiap node level bawah jadi child tepat satu cluster
+        assert sorted(children) == list(range(len(counts)))
+        assert level["count"] == [sum(counts[child] for child in node_children) for node_children in level["children"]]
+        assert level["categories"] == [
+            [sum(categories[child][position] for child in node_children) for position in range(len(CATEGORIES))]
+            for node_children in level["children"]
+        ]
+        counts, categories = level["count"], level["categories"]
+
+    assert sum(levels[str(index["min_zoom"])]["count"]) == len(records) - 1
+
+def test_reader_expands_clusters_to_children(tmp_path):
+    records = random_records(0, 200)
+    path = tmp_path / "clusters.json"
+    path.write_text(json.dumps(build_cluster_index(records)), encoding="utf-8")
+    index = ClusterIndex(str(path))
+
+    top = index.clusters(-90, -180, 90, 180, index.min_zoom)
+    assert sum(node["count"] for node in top) == len(records) - 1
+    for node in top:
+        if "categories" not in node:
+            continue
+        zoom = index.expansion_zoom(node["id"])
+        assert index.min_zoom < zoom <= index.max_zoom + 1
+        assert sum(child["count"] for child in index.children(node["id"])) == node["count"]
+
+    stacked = index.clusters(-3.56, 119.77, -3.54, 119.79, index.max_zoom + 1)
+    assert sorted(node["nama"] for node in stacked if node["nama"].startswith("Tumpuk")) == \
+        [f"Tumpuk {i}" for i in range(5)]
@@ -0,0 +1,39 @@
+import json
+from data_manager import DataManager, identity_of
+from merge_results import merge_files
+from record_stream import iter_records
+
+RECORDS = [
+    {"nama": "SD 1", "kecamatan": "Alla", "desa": "Buntu Sugi", "url": "https://maps/1",
+     "latitude": -3.30, "longitude": 119.85},
+    {"nama": "SD 2", "kecamatan": "Alla", "desa": "Buntu Sugi", "url": None, "latitude": -3.31, "longitude": 119.86},
+    {"nama": "SD 3", "kecamatan": "Alla", "desa": "Buntu Sugi", "url": None, "latitude": -3.32, "longitude": 119.87},
+]
+
+def test_missing_and_none_url_share_one_identity():
+    assert identity_of({"nama": "A", "url": None}) == identity_of({"nama": "A"}) == ("a__", "", None)
+    assert identity_of({"nama": " SD 1 ", "kecamatan": "ALLA", "url": " u ", "latitude": "-3.5", "longitude": 119})[:2] \
+        == ("sd 1_alla_", "u")
+
+def test_records_without_url_are_not_url_duplicates(tmp_path):
+    # url None dulu dinormalisasi jadi 'None' sehingga record kedua dianggap duplikat URL
+    manager = DataManager()
+    assert all(manager.add_data(dict(item)) for item in RECORDS)
+
+    inputs = tmp_path / "input.json"
+    inputs.write_text(json.dumps(RECORDS), encoding="utf-8")
+    output = tmp_path / "merged.json"
+    assert merge_files([str(inputs)], str(output))["kept"] == 3
+    assert len(list(iter_records(str(output)))) == 3
+
+def test_identity_only_load_syncs_facility_index(tmp_path):
+    snapshot = tmp_path / "snapshot.json"
+    snapshot.write_text(json.dumps({"data": RECORDS[:2]}), encoding="utf-8")
+    journal = tmp_path / "journal.jsonl"
+    journal.write_text(json.dumps(RECORDS[2]) + "\n" + json.dumps(RECORDS[0]) + "\n", encoding="utf-8")
+
+    manager = DataManager(journal_file=str(journal), index_file=str(tmp_path / "index.sqlite"))
+    assert manager.load_existing_data(str(snapshot), identity_only=True)
+    assert manager.snapshot_count == 2 and manager.data == [RECORDS[2]]
+    assert len(manager.facility_index) == 3
+    manager.close()
@@ -0,0 +1,91 @@
+import pytest
+import facility_index
+from facility_index import METERS_PER_DEGREE, FacilityIndex, haversine_meters, radius_bounds
+
+ORIGIN = (-3.55, 119.80)
+
+def facility(cid, lat, lng, keyword="masjid", kecamatan="Enrekang"):
+    return {"cid": cid, "nama": f"Fasilitas {cid}", "keyword": keyword, "kecamatan": kecamatan,
+            "latitude": lat, "longitude": lng}
+
+def north_of(meters):
+    """Titik tepat di utara ORIGIN sejauh kira-kira meters"""
+    return ORIGIN[0] + meters / METERS_PER_DEGREE, ORIGIN[1]
+
+@pytest.fixture
+def index(tmp_path):
+    index = FacilityIndex(str(tmp_path / "facilities.sqlite"))
+    yield index
+    index.close()
+
+def test_within_radius_drops_bbox_corners_outside_the_circle(index):
+    south, west, north, east = radius_bounds(*ORIGIN, 1000)
+    index.sync([
+        facility("1", *north_of(500)),
+        # Di dalam bbox radius tapi di luar lingkaran (pojok bbox ~1.4 × radius)
+        facility("2", ORIGIN[0] + (north - ORIGIN[0]) * 0.95, ORIGIN[1] + (east - ORIGIN[1]) * 0.95),
+        facility("3", *north_of(900)),
+    ])
+
+    results = index.within_radius(*ORIGIN, 1000)
+
+    assert [item["cid"] for item in results] == ["1", "3"]
+    assert results[0]["distance_m"] == pytest.approx(500, abs=1)
+    assert all(item["distance_m"] <= 1000 for item in results)
+    assert len(index.within_bbox(south, west, north, east)) == 3
+
+def test_nearest_doubles_radius_until_enough_results(index, monkeypatch):
+    calls = []
+    within_radius = FacilityIndex.within_radius
+
+    def recording_within_radius(self, lat, lng, meters, **filters):
+        calls.append(meters)
+        return within_radius(self, lat, lng, meters, **filters)
+
+    monkeypatch.setattr(FacilityIndex, "within_radius", recording_within_radius)
+    monkeypatch.setitem(facility_index.FACILITY_INDEX_CONFIG, "initial_radius", 1000)
+    index.sync([facility("near", *north_of(300)), facility("mid", *north_of(3000)),
+                facility("far", *north_of(7000))])
+
+    results = index.nearest(*ORIGIN, n=2)
+
+    assert [item["cid"] for item in results] == ["near", "mid"]
+    assert calls == [1000, 2000, 4000]
+
+def test_nearest_falls_back_to_full_scan_beyond_max_radius(index, monkeypatch):
+    monkeypatch.setitem(facility_index.FACILITY_INDEX_CONFIG, "max_radius", 4000)
+    index.sync([facility("near", *north_of(300)), facility("remote", ORIGIN[0] + 1.0, ORIGIN[1])])
+
+    results = index.nearest(*ORIGIN, n=5)
+
+    assert [item["cid"] for item in results] == ["near", "remote"]
+    assert results[1]["distance_m"] == pytest.approx(haversine_meters(*ORIGIN, ORIGIN[0] + 1.0, ORIGIN[1]), abs=1)
+
+def test_within_bbox_filters_by_keyword_kategori_and_kecamatan(index):
+    index.sync([
+        facility("1", -3.50, 119.80, keyword="masjid"),
+        facility("2", -3.51, 119.81, keyword="sekolah dasar"),
+        facility("3", -3.52, 119.82, keyword="sekolah dasar", kecamatan="Alla"),
+        facility("4", -3.00, 119.80, keyword="masjid"),
+    ])
+    bbox = (-3.6, 119.7, -3.4, 119.9)
+
+    assert sorted(item["cid"] for item in index.within_bbox(*bbox)) == ["1", "2", "3"]
+    assert [item["cid"] for item in index.within_bbox(*bbox, keyword="masjid")] == ["1"]
+    assert sorted(item["cid"] for item in index.within_bbox(*bbox, kategori="pendidikan")) == ["2", "3"]
+    assert [item["cid"] for item in index.within_bbox(*bbox, kategori="pendidikan", kecamatan="Alla")] == ["3"]
+
+def test_sync_inserts_new_removes_stale_and_refreshes_on_request(index):
+    report = index.sync([facility("1", -3.5, 119.8), facility("2", -3.6, 119.9), facility("2", -3.6, 119.9),
+                         {"cid": "3", "nama": "Tanpa koordinat"}])
+    assert report == {"added": 2, "removed": 0, "total": 2}
+
+    moved = facility("1", -3.5, 119.8, kecamatan="Alla")
+    report = index.sync(iter([moved, facility("4", -3.7, 119.7)]))
+    assert report == {"added": 1, "removed": 1, "total": 2}
+    # Tanpa refresh record lama tidak ditulis ulang
+    assert index.within_bbox(-3.51, 119.79, -3.49, 119.81)[0]["kecamatan"] == "Enrekang"
+
+    index.sync([moved, facility("4", -3.7, 119.7)], refresh=True)
+    assert [item["cid"] for item in index.within_bbox(-3.51, 119.79, -3.49, 119.81, kecamatan="Alla")] == ["1"]
+    assert len(index) == 2
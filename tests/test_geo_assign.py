@@ -0,0 +1,55 @@
+import json
+from geo_assign import BoundaryStore, assign_records
+
+def square(south, west, north, east):
+    return [[[west, south], [east, south], [east, north], [west, north], [west, south]]]
+
+def write_boundaries(path, features):
+    collection = {"type": "FeatureCollection", "features": [
+        {"type": "Feature", "properties": properties, "geometry": {"type": "Polygon", "coordinates": rings}}
+        for properties, rings in features
+    ]}
+    path.write_text(json.dumps(collection), encoding="utf-8")
+    return str(path)
+
+def test_rbi_names_are_normalized_and_neighbour_polygons_count_as_outside(tmp_path):
+    filename = write_boundaries(tmp_path / "batas.geojson", [
+        ({"WADMKC": "BUNTU BATU", "WADMKD": "ERAN BATU", "WADMKK": "Enrekang"}, square(-3.5, 119.9, -3.4, 120.0)),
+        # Kecamatan kabupaten tetangga: tidak ada di gazetteer
+        ({"WADMKC": "DUAMPANUA", "WADMKD": "BUNGI", "WADMKK": "Pinrang"}, square(-3.3, 119.9, -3.2, 120.0)),
+        # Nama kecamatan sama tapi properti kabupaten lain
+        ({"WADMKC": "ALLA", "WADMKD": "BUNTU", "WADMKK": "Tana Toraja"}, square(-3.1, 119.9, -3.0, 120.0)),
+    ])
+    store = BoundaryStore(filename)
+    assert store.skipped == 2
+    records = [
+        {"nama": "Puskesmas", "kecamatan": "Buntu Batu", "desa": "Eran Batu", "latitude": -3.45, "longitude": 119.95},
+        {"nama": "Sekolah", "kecamatan": "Unknown", "desa": "Unknown", "latitude": -3.25, "longitude": 119.95},
+        {"nama": "Pasar", "kecamatan": "Alla", "desa": "Unknown", "latitude": -3.05, "longitude": 119.95},
+    ]
+
+    inside, outside = assign_records(records, store)
+
+    assert [(item["nama"], item["kecamatan"], item["desa"]) for item in inside] == \
+        [("Puskesmas", "Buntu Batu", "Eran Batu")]
+    assert [item["nama"] for item in outside] == ["Sekolah", "Pasar"]
+
+def test_mismatch_compares_geometry_with_the_address_not_the_searched_district(tmp_path):
+    filename = write_boundaries(tmp_path / "batas.geojson", [
+        ({"WADMKC": "ENREKANG", "WADMKD": "GALONTA"}, square(-3.6, 119.7, -3.5, 119.8)),
+    ])
+    store = BoundaryStore(filename)
+    records = [
+        # Alamat tidak menyebut kecamatan: field kecamatan berisi kecamatan pencarian (fallback)
+        {"nama": "Masjid", "kecamatan": "Anggeraja", "desa": "Unknown", "address": "Jl. Poros, Sulawesi Selatan",
+         "latitude": -3.55, "longitude": 119.75},
+        # Alamat jelas menyebut kecamatan lain
+        {"nama": "Kantor", "kecamatan": "Anggeraja", "desa": "Tampo",
+         "address": "Tampo, Kec. Anggeraja, Kabupaten Enrekang", "latitude": -3.55, "longitude": 119.75},
+    ]
+
+    inside, _ = assign_records(records, store)
+
+    assert "geo_mismatch" not in inside[0]
+    assert inside[0]["kecamatan"] == "Enrekang" and inside[0]["desa"] == "Galonta"
+    assert inside[1]["geo_mismatch"] == "Anggeraja | Tampo"
@@ -0,0 +1,31 @@
+import os
+import pytest
+from geo_export import export_flatgeobuf, hilbert_index, map_features
+
+RECORDS = [
+    {"nama": "SD Negeri 1", "keyword": "sekolah dasar", "latitude": -3.55, "longitude": 119.78, "kecamatan": "Enrekang"},
+    {"nama": "Puskesmas", "keyword": "puskesmas", "latitude": "-3.31", "longitude": "119.86", "kecamatan": "Anggeraja"},
+    {"nama": "Tanpa koordinat", "keyword": "masjid"},
+]
+
+def test_map_features_skips_records_without_coordinates():
+    features = map_features(RECORDS)
+    assert sorted(properties["nama"] for _, _, properties in features) == ["Puskesmas", "SD Negeri 1"]
+
+def test_hilbert_index_is_unique_per_cell():
+    index = hilbert_index([0, 0, 1, 1], [0, 1, 0, 1], order=1)
+    assert sorted(index.tolist()) == [0, 1, 2, 3]
+
+def test_export_flatgeobuf_overwrites_existing_file(tmp_path):
+    raw = pytest.importorskip("pyogrio.raw")
+    filename = str(tmp_path / "fasilitas.fgb")
+
+    # Export kedua (compaction berikutnya) harus mengganti file, bukan gagal karena folder
+    assert export_flatgeobuf(RECORDS, filename) == filename
+    assert export_flatgeobuf(RECORDS[:1], filename) == filename
+
+    assert os.path.isfile(filename)
+    assert os.listdir(tmp_path) == ["fasilitas.fgb"]
+    _, _, geometry, fields = raw.read(filename)
+    assert len(geometry) == 1
+    assert list(fields[0]) == ["SD Negeri 1"]
@@ -0,0 +1,49 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+from config import DISTRICTS
+from job import output_paths, parse_shard, shard_suffix, shard_units
+
+KEYWORDS = ["sekolah", "masjid", "puskesmas", "pasar", "kantor desa"]
+
+@pytest.mark.parametrize("count", [1, 2, 3, 7])
+def test_shards_partition_all_units_in_stable_order(count):
+    shards = [shard_units(DISTRICTS, KEYWORDS, index, count) for index in range(count)]
+    units = [(district, keyword) for district in DISTRICTS for keyword in KEYWORDS]
+
+    assert sorted(unit for shard in shards for unit in shard) == sorted(units)
+    assert sum(len(shard) for shard in shards) == len(units)
+    for shard in shards:
+        assert shard == [unit for unit in units if unit in shard]
+        assert shard == shard_units(DISTRICTS, KEYWORDS, shards.index(shard), count)
+
+def test_shards_identical_across_processes():
+    # Mesin lain = proses lain dengan hash seed berbeda; pembagian shard tidak boleh berubah
+    script = ("import json; from config import DISTRICTS; from job import shard_units; "
+              f"print(json.dumps([shard_units(DISTRICTS, {KEYWORDS!r}, i, 3) for i in range(3)]))")
+    results = []
+    for seed in ("1", "2"):
+        environment = {**os.environ, "PYTHONHASHSEED": seed}
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), env=environment)
+        results.append(json.loads(output.stdout.strip().splitlines()[-1]))
+    assert results[0] == results[1]
+    assert results[0] == [[list(unit) for unit in shard_units(DISTRICTS, KEYWORDS, i, 3)] for i in range(3)]
+
+@pytest.mark.parametrize("text, expected", [("0/1", (0, 1)), ("2/3", (2, 3))])
+def test_parse_shard(text, expected):
+    assert parse_shard(text) == expected
+
+@pytest.mark.parametrize("text", ["3/3", "-1/2", "1/0", "a/b", "1"])
+def test_parse_shard_rejects_invalid(text):
+    with pytest.raises(ValueError):
+        parse_shard(text)
+
+def test_query_plan_is_shared_by_all_shards(tmp_path):
+    shard_paths = output_paths(str(tmp_path), shard_suffix(1, 3))
+    job_paths = output_paths(str(tmp_path))
+    # Ledger dan snapshot per shard, query plan satu file untuk seluruh job
+    assert shard_paths["ledger"] != job_paths["ledger"] and ".shard1of3" in shard_paths["ledger"]
+    assert shard_paths["query_plan"] == job_paths["query_plan"] == str(tmp_path / "query_plan.json")
@@ -0,0 +1,81 @@
+import json
+import random
+import pytest
+from data_manager import DataManager, parse_coordinates
+from merge_results import merge_files
+from record_stream import iter_records, write_json_stream, write_jsonl_stream
+
+def random_records(rng, count):
+    """Record dengan nama/URL berulang antar file dan koordinat yang saling berdekatan"""
+    records = []
+    for _ in range(count):
+        item = {"nama": f"Fasilitas {rng.randint(0, count // 2)}", "kecamatan": rng.choice(["Alla", "Baraka"]),
+                "desa": "Desa", "seq": rng.random()}
+        if rng.random() < 0.5:
+            item["url"] = f"https://www.google.com/maps/place/{rng.randint(0, count)}"
+        if rng.random() < 0.9:
+            item["latitude"] = -3.55 + rng.random() * 0.01
+            item["longitude"] = 119.78 + rng.random() * 0.01
+        records.append(item)
+    return records
+
+def canonical_dedupe(inputs):
+    """Referensi: urutkan (tanpa koordinat di akhir, lat, lng, file, urutan) lalu dedupe sekuensial"""
+    rows = []
+    for source, records in enumerate(inputs):
+        for sequence, item in enumerate(records):
+            coordinates = parse_coordinates(item)
+            rows.append(((1, 0.0, 0.0) if coordinates is None else (0, *coordinates), source, sequence, item))
+    rows.sort(key=lambda row: row[:3])
+    manager = DataManager()
+    manager.data = [row[3] for row in rows]
+    manager.remove_duplicates_from_existing_data()
+    return manager.data
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("run_size", [7, 1000])
+def test_merge_matches_canonical_sequential_dedupe(tmp_path, seed, run_size):
+    rng = random.Random(seed)
+    inputs = [random_records(rng, 150) for _ in range(3)]
+    paths = []
+    for index, records in enumerate(inputs):
+        path = tmp_path / (f"input{index}.jsonl" if index % 2 else f"input{index}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            (write_jsonl_stream if index % 2 else write_json_stream)(f, records)
+        paths.append(str(path))
+
+    output = tmp_path / "merged.jsonl"
+    report = merge_files(paths, str(output), run_size=run_size)
+
+    expected = canonical_dedupe(inputs)
+    assert list(iter_records(str(output))) == expected
+    assert report["original"] == 450
+    assert report["kept"] == len(expected)
+    assert sum(report["by_reason"].values()) == report["removed"]
+
+@pytest.mark.parametrize("extension", [".json", ".jsonl", ".csv"])
+def test_merge_output_formats(tmp_path, extension):
+    first = tmp_path / "a.json"
+    first.write_text(json.dumps({"data": [
+        {"nama": "SD 1", "latitude": -3.5, "longitude": 119.8, "url": "u1"},
+        {"nama": "SD 2", "latitude": -3.6, "longitude": 119.8},
+    ]}), encoding="utf-8")
+    second = tmp_path / "b.csv"
+    second.write_text("nama,latitude,longitude,url\nSD 1 ,-3.5,119.9,\nSD 3,,,u1\nSD 4,-3.7,119.8,\n",
+                      encoding="utf-8")
+
+    output = tmp_path / f"merged{extension}"
+    report = merge_files([str(first), str(second)], str(output), run_size=2)
+
+    names = [item["nama"] for item in iter_records(str(output))]
+    assert names == ["SD 4", "SD 2", "SD 1"]
+    assert report["by_reason"] == {"location": 1, "url": 1, "coordinates": 0}
+    assert not (tmp_path / f"merged{extension}.tmp").exists()
+
+def test_merge_empty_inputs(tmp_path):
+    empty = tmp_path / "empty.jsonl"
+    empty.write_text("", encoding="utf-8")
+    output = tmp_path / "merged.json"
+    report = merge_files([str(empty)], str(output))
+    assert report["original"] == report["kept"] == 0
+    assert list(iter_records(str(output))) == []
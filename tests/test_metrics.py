@@ -0,0 +1,21 @@
+import json
+from metrics import MetricsRecorder
+
+def test_gauges_are_kept_per_session_label(tmp_path):
+    recorder = MetricsRecorder(str(tmp_path / "metrics.jsonl"), str(tmp_path / "metrics.prom"),
+                               labels={"job": "uji"}, enabled=True)
+    for session, requests in (("0", 5), ("1", 7), ("0", 6)):
+        unit = recorder.start_unit("Alla", "sekolah")
+        with unit.phase("dedupe"):
+            unit.count("added", 2)
+        recorder.finish_unit(unit, "done", gauges={"requests_count": requests}, labels={"session": session})
+
+    prometheus = (tmp_path / "metrics.prom").read_text(encoding="utf-8")
+    # Sesi terakhir tidak menimpa gauge sesi lain
+    assert 'requests_count{job="uji",session="0"} 6' in prometheus
+    assert 'requests_count{job="uji",session="1"} 7' in prometheus
+    assert 'items_total{job="uji",kind="added"} 6' in prometheus
+
+    rows = [json.loads(line) for line in (tmp_path / "metrics.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert [row["session"] for row in rows] == ["0", "1", "0"]
+    assert all(row["job"] == "uji" and row["phases"]["dedupe"]["calls"] == 1 for row in rows)
@@ -0,0 +1,50 @@
+import os
+import pytest
+from parquet_export import export_parquet, read_parquet, records_to_frame
+
+def records():
+    rows = []
+    for index in range(20):
+        rows.append({
+            "nama": f"Fasilitas {index}",
+            "kecamatan": ["Alla", "Baraka", None][index % 3],
+            "desa": "Unknown",
+            "keyword": ["masjid", "sekolah dasar"][index % 2],
+            "latitude": -3.5 + index / 1000,
+            "longitude": "119.8",
+            "url": f"https://www.google.com/maps/place/{index}",
+            "cid": str(index),
+            "rating": index
+        })
+    return rows
+
+def test_records_to_frame_types_columns():
+    frame = records_to_frame(records())
+    for column in ("kecamatan", "desa", "keyword", "kategori"):
+        assert str(frame[column].dtype) == "category"
+    assert str(frame["latitude"].dtype) == "float64" and frame["longitude"].iloc[0] == 119.8
+    assert str(frame["nama"].dtype) == "string" and str(frame["rating"].dtype) == "string"
+    # Partisi tanpa nilai jadi "Unknown", kategori diturunkan dari keyword
+    assert set(frame["kecamatan"]) == {"Alla", "Baraka", "Unknown"}
+    assert set(frame["kategori"]) == {"ibadah", "pendidikan"}
+    assert frame["place_id"].isna().all()
+
+def test_export_parquet_round_trip_with_hive_partitions(tmp_path):
+    pytest.importorskip("pyarrow")
+    directory = str(tmp_path / "dataset")
+    export_parquet(records()[:5], directory)
+    assert export_parquet(records(), directory) == directory
+
+    # Folder lama diganti utuh, tidak ada sisa .tmp/.old
+    assert sorted(os.listdir(tmp_path)) == ["dataset"]
+    assert sorted(os.listdir(directory)) == ["kecamatan=Alla", "kecamatan=Baraka", "kecamatan=Unknown"]
+    assert sorted(os.listdir(os.path.join(directory, "kecamatan=Alla"))) == ["kategori=ibadah", "kategori=pendidikan"]
+
+    frame = read_parquet(directory)
+    assert len(frame) == 20
+    assert sorted(frame["cid"].astype(int)) == list(range(20))
+
+    alla_ibadah = read_parquet(directory, kecamatan="Alla", kategori="ibadah", columns=["nama", "latitude"])
+    expected = [row["nama"] for row in records() if row["kecamatan"] == "Alla" and row["keyword"] == "masjid"]
+    assert sorted(alla_ibadah["nama"]) == sorted(expected)
+    assert list(alla_ibadah.columns) == ["nama", "latitude"]
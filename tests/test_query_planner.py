@@ -0,0 +1,48 @@
+import json
+from query_planner import is_skipped, load_skip_list, plan_queries, resolve_merges
+
+def test_merges_resolve_against_surviving_keywords():
+    # A tercakup B, B tercakup C, tapi A hanya separuh di C: B dibuang ke C, A tetap dipertahankan
+    places = {
+        "c": {f"p{i}" for i in range(20)},
+        "b": {f"p{i}" for i in range(12, 20)} | {"q0", "q1"},
+        "a": {"p18", "p19", "q0", "q1"},
+    }
+    merges = resolve_merges(places, ["a", "b", "c"])
+    assert [(merge["drop"], merge["covered_by"]) for merge in merges] == [("b", "c")]
+    assert merges[0]["containment"] == 0.8
+
+def test_merge_never_targets_a_dropped_keyword():
+    places = {"besar": set(range(100)), "sedang": set(range(50)), "kecil": set(range(10))}
+    merges = resolve_merges(places, list(places))
+    dropped = {merge["drop"] for merge in merges}
+    assert dropped == {"sedang", "kecil"}
+    assert all(merge["covered_by"] not in dropped for merge in merges)
+
+def test_skip_list_is_keyed_by_district(tmp_path):
+    # "pustu" tidak berguna di Alla (tercakup puskesmas) tapi satu-satunya sumber tempat di Baraka
+    sightings = [("Alla", "puskesmas", f"a{i}") for i in range(5)]
+    sightings += [("Alla", "pustu", f"a{i}") for i in range(4)]
+    sightings += [("Baraka", "pustu", f"b{i}") for i in range(3)]
+    sightings += [("Alla", "pasar", "x"), ("Baraka", "pasar", "x")]
+    searched = {("Alla", "puskesmas"), ("Alla", "pustu"), ("Baraka", "pustu"), ("Baraka", "puskesmas"),
+                ("Alla", "pasar"), ("Baraka", "pasar"), ("Alla", "kantor")}
+    plan = plan_queries(sightings, searched)
+
+    assert plan["skip"]["Alla"] == ["kantor", "pustu"]
+    assert plan["skip"]["Baraka"] == ["puskesmas"]
+    assert plan["skip"]["*"] == []
+
+    path = tmp_path / "query_plan.json"
+    path.write_text(json.dumps(plan), encoding="utf-8")
+    skip = load_skip_list(str(path))
+    assert is_skipped(skip, "Alla", "pustu")
+    assert not is_skipped(skip, "Baraka", "pustu")
+    assert not is_skipped(skip, "Maiwa", "pustu")
+
+def test_old_global_skip_list_applies_everywhere(tmp_path):
+    path = tmp_path / "query_plan.json"
+    path.write_text(json.dumps({"skip": ["pustu"]}), encoding="utf-8")
+    skip = load_skip_list(str(path))
+    assert is_skipped(skip, "Maiwa", "pustu") and not is_skipped(skip, "Maiwa", "pasar")
+    assert load_skip_list(str(tmp_path / "tidak_ada.json")) == {}
@@ -0,0 +1,59 @@
+import io
+import json
+import pytest
+import record_stream
+from record_stream import iter_records, write_json_stream, write_jsonl_stream
+
+RECORDS = [
+    {"nama": "SD Negeri 12345", "latitude": -3.5612345, "longitude": 119.7787654, "rating": 4.5, "ulasan": 1200},
+    {"nama": "Masjid \"Al-Ikhlas\"\n", "desa": "Kalosi Alau", "tags": ["ibadah", {"nested": [1, 2.5, None]}]},
+    {"nama": "Pustu ✚ Baraka", "latitude": 0, "longitude": -0.000123, "ok": True, "kosong": {}},
+    {},
+    {"angka": 1234567890123, "escape": "\\u0041 \\\\ é"},
+]
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 1 << 16])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_json_records_survive_chunk_boundaries(tmp_path, monkeypatch, chunk_size, indent):
+    # Chunk kecil memotong angka, string escape dan karakter unicode di tengah nilai
+    monkeypatch.setattr(record_stream, "CHUNK_SIZE", chunk_size)
+    array_file = tmp_path / "array.json"
+    array_file.write_text(json.dumps(RECORDS, indent=indent, ensure_ascii=False), encoding="utf-8")
+    snapshot_file = tmp_path / "snapshot.json"
+    snapshot_file.write_text(json.dumps({"scraped_at": "2024-01-01", "meta": {"data": [0]}, "data": RECORDS,
+                                         "total_count": len(RECORDS)}, indent=indent), encoding="utf-8")
+
+    assert list(iter_records(str(array_file))) == RECORDS
+    assert list(iter_records(str(snapshot_file))) == RECORDS
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 1 << 16])
+def test_written_snapshot_round_trips(tmp_path, monkeypatch, chunk_size):
+    monkeypatch.setattr(record_stream, "CHUNK_SIZE", chunk_size)
+    for records in (RECORDS, []):
+        path = tmp_path / "stream.json"
+        with open(path, "w", encoding="utf-8") as f:
+            assert write_json_stream(f, iter(records)) == len(records)
+        assert json.loads(path.read_text(encoding="utf-8"))["total_count"] == len(records)
+        assert list(iter_records(str(path))) == records
+
+def test_jsonl_skips_broken_lines(tmp_path):
+    buffer = io.StringIO()
+    write_jsonl_stream(buffer, RECORDS[:2])
+    path = tmp_path / "records.jsonl"
+    path.write_text(buffer.getvalue() + "{rusak\n\n" + json.dumps(RECORDS[2]) + "\n", encoding="utf-8")
+    assert list(iter_records(str(path))) == RECORDS[:3]
+
+def test_csv_empty_cells_become_none(tmp_path):
+    path = tmp_path / "records.csv"
+    path.write_text("nama,desa,latitude\nSD 1,,-3.5\nSD 2,\"Baraka, Kota\",\n", encoding="utf-8")
+    assert list(iter_records(str(path))) == [
+        {"nama": "SD 1", "desa": None, "latitude": "-3.5"},
+        {"nama": "SD 2", "desa": "Baraka, Kota", "latitude": None},
+    ]
+
+def test_invalid_json_raises(tmp_path, monkeypatch):
+    monkeypatch.setattr(record_stream, "CHUNK_SIZE", 4)
+    path = tmp_path / "broken.json"
+    path.write_text('[{"nama": "A"} {"nama": "B"}]', encoding="utf-8")
+    with pytest.raises(ValueError):
+        list(iter_records(str(path)))
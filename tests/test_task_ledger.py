@@ -0,0 +1,43 @@
+from config import LEDGER_CONFIG
+from task_ledger import DONE, FAILED, PENDING, RUNNING, TaskLedger
+
+def test_resume_skips_done_units_and_recovers_running(tmp_path):
+    filename = str(tmp_path / "ledger.sqlite")
+    ledger = TaskLedger(filename)
+    ledger.start_run(["Alla", "Baraka"], ["sekolah", "masjid"])
+    ledger.mark_running("Alla", "sekolah")
+    ledger.mark_done("Alla", "sekolah", 12)
+    ledger.mark_running("Alla", "masjid")
+    ledger.close()
+
+    # Proses mati saat (Alla, masjid) masih running: dibuka ulang seperti run --resume
+    ledger = TaskLedger(filename)
+    assert ledger.summary() == {PENDING: 2, RUNNING: 1, DONE: 1, FAILED: 0}
+    assert ledger.recover_interrupted() == 1
+    assert ledger.recover_interrupted() == 0
+    assert ledger.unfinished() == [("Alla", "masjid"), ("Baraka", "sekolah"), ("Baraka", "masjid")]
+    assert ledger.unfinished_keywords("Alla", ["sekolah", "masjid"]) == ["masjid"]
+    ledger.close()
+
+def test_failed_units_retry_until_max_attempts(tmp_path):
+    ledger = TaskLedger(str(tmp_path / "ledger.sqlite"))
+    ledger.start_units([("Alla", "sekolah")])
+    for attempt in range(LEDGER_CONFIG["max_attempts"]):
+        assert ledger.unfinished() == [("Alla", "sekolah")]
+        ledger.mark_running("Alla", "sekolah")
+        ledger.mark_failed("Alla", "sekolah", RuntimeError(f"gagal {attempt}"))
+    assert ledger.unfinished() == []
+    assert ledger.summary()[FAILED] == 1
+    ledger.close()
+
+def test_start_run_resets_tasks_but_keeps_sightings(tmp_path):
+    ledger = TaskLedger(str(tmp_path / "ledger.sqlite"))
+    ledger.start_run(["Alla"], ["sekolah"])
+    ledger.record_sightings("Alla", "sekolah", ["a", "b", "a"])
+    ledger.record_sightings("Alla", "sekolah", ["b", "c"])
+    ledger.start_run(["Baraka"], ["masjid"])
+
+    assert ledger.unfinished() == [("Baraka", "masjid")]
+    assert sorted(place for _, _, place in ledger.sightings()) == ["a", "b", "c"]
+    assert ledger.searched_units() == {("Alla", "sekolah")}
+    ledger.close()
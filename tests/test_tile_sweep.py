@@ -0,0 +1,79 @@
+import json
+import pytest
+from config import TILE_SWEEP_CONFIG
+from tile_sweep import Tile, TileSweep, in_kabupaten, initial_tiles, save_coverage
+
+def drain(sweep, cards):
+    """Jalankan sweep sampai habis; cards(tile) = jumlah kartu feed untuk tile itu"""
+    while True:
+        tile = sweep.next_tile()
+        if tile is None:
+            return sweep.report()
+        sweep.record(tile, cards(tile), 0, 0)
+
+def test_initial_grid_covers_bbox_without_gaps():
+    rows, cols = TILE_SWEEP_CONFIG["grid"]
+    tiles = initial_tiles()
+    south, west, north, east = TILE_SWEEP_CONFIG["bbox"]
+    assert len(tiles) == rows * cols
+    area = sum((tile.north - tile.south) * (tile.east - tile.west) for tile in tiles)
+    assert area == pytest.approx((north - south) * (east - west))
+
+def test_split_yields_four_quadrants_that_tile_the_parent():
+    parent = Tile("0-0", -3.5, 119.8, -3.3, 120.0, depth=1)
+    children = parent.split()
+    assert [child.tile_id for child in children] == ["0-0.0", "0-0.1", "0-0.2", "0-0.3"]
+    assert all(child.depth == 2 for child in children)
+    # Setiap titik di dalam parent jatuh ke tepat satu anak
+    for lat, lng in [(-3.45, 119.85), (-3.35, 119.95), (-3.4, 119.9), (-3.5, 119.8)]:
+        assert sum(child.contains(lat, lng) for child in children) == 1
+
+def test_saturated_tile_is_split_and_leaves_are_reported(monkeypatch):
+    monkeypatch.setitem(TILE_SWEEP_CONFIG, "grid", [1, 1])
+    monkeypatch.setitem(TILE_SWEEP_CONFIG, "max_depth", 3)
+    saturation = TILE_SWEEP_CONFIG["saturation_count"]
+
+    # Tile awal jenuh, anak pertamanya juga jenuh, sisanya sepi
+    report = drain(TileSweep("masjid"), lambda tile: saturation if tile.tile_id in ("0-0", "0-0.0") else 5)
+
+    assert report["tiles_searched"] == 1 + 4 + 4
+    assert report["leaf_tiles"] == 3 + 4
+    assert report["tiles"]["0-0"]["subdivided"] and report["tiles"]["0-0.0"]["subdivided"]
+    assert report["saturated_leaves"] == []
+
+def test_saturation_at_max_depth_is_reported_not_split(monkeypatch):
+    monkeypatch.setitem(TILE_SWEEP_CONFIG, "grid", [1, 1])
+    monkeypatch.setitem(TILE_SWEEP_CONFIG, "max_depth", 1)
+
+    report = drain(TileSweep("masjid"), lambda tile: TILE_SWEEP_CONFIG["saturation_count"])
+
+    assert report["tiles_searched"] == 5
+    assert sorted(report["saturated_leaves"]) == ["0-0.0", "0-0.1", "0-0.2", "0-0.3"]
+
+def test_failed_tiles_are_not_counted_as_covered(monkeypatch):
+    monkeypatch.setitem(TILE_SWEEP_CONFIG, "grid", [1, 2])
+    sweep = TileSweep("sekolah")
+    sweep.mark_failed(sweep.next_tile())
+    sweep.record(sweep.next_tile(), 0, 0, 0)
+    report = sweep.report()
+    assert report["failed"] == ["0-0"]
+    assert list(report["tiles"]) == ["0-1"]
+    assert report["empty_leaves"] == 1
+
+def test_points_outside_kabupaten_bbox_are_skipped():
+    south, west, north, east = TILE_SWEEP_CONFIG["bbox"]
+    assert in_kabupaten((south + north) / 2, (west + east) / 2)
+    assert in_kabupaten(south, west) and in_kabupaten(north, east)
+    assert not in_kabupaten(south - 0.01, west + 0.1)
+    assert not in_kabupaten(north - 0.1, east + 0.01)
+    # Koordinat tertukar (lng, lat) tidak lolos
+    assert not in_kabupaten((west + east) / 2, (south + north) / 2)
+
+def test_save_coverage_writes_reports(tmp_path, monkeypatch):
+    monkeypatch.setitem(TILE_SWEEP_CONFIG, "grid", [1, 1])
+    report = drain(TileSweep("pasar"), lambda tile: 3)
+    filename = save_coverage([report], str(tmp_path / "coverage.json"))
+    with open(filename, encoding="utf-8") as f:
+        saved = json.load(f)
+    assert saved[0]["keyword"] == "pasar"
+    assert saved[0]["tiles"]["0-0"]["cards"] == 3
@@ -0,0 +1,37 @@
+import pytest
+from url_parser import parse_place_url, reparse_records
+
+PLACE_URL = ("https://www.google.com/maps/place/SD+Negeri+1+Enrekang/@-3.5601,119.7702,17z/"
+             "data=!3m1!4b1!4m6!3m5!1s0x2d95a3f0a1b2c3d4:0x1f2e3d4c5b6a7988!8m2!3d-3.5612345!4d119.7787654")
+
+def test_place_url_separates_place_and_viewport():
+    parsed = parse_place_url(PLACE_URL)
+    assert (parsed["lat"], parsed["lng"]) == (-3.5612345, 119.7787654)
+    assert (parsed["viewport_lat"], parsed["viewport_lng"], parsed["zoom"]) == (-3.5601, 119.7702, 17.0)
+    assert parsed["place_id"] == "0x2d95a3f0a1b2c3d4:0x1f2e3d4c5b6a7988"
+    assert parsed["cid"] == str(0x1f2e3d4c5b6a7988)
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://maps.google.com/?cid=1234567890", {"cid": "1234567890", "lat": None, "place_id": None}),
+    ("https://www.google.com/maps/search/sekolah/@-3.5,119.8,14z", {"viewport_lat": -3.5, "zoom": 14.0, "lat": None}),
+    ("https://www.google.com/maps?ftid=0xABC:0x10", {"place_id": "0xabc:0x10", "cid": "16"}),
+    ("", {"lat": None, "cid": None}),
+    (None, {"lat": None, "cid": None}),
+])
+def test_parse_place_url_variants(url, expected):
+    parsed = parse_place_url(url)
+    assert {key: parsed[key] for key in expected} == expected
+
+def test_reparse_records_prefers_place_coordinates():
+    records = [
+        {"url": PLACE_URL, "latitude": -3.5601, "longitude": 119.7702},
+        {"url": "https://www.google.com/maps/search/sekolah/@-3.5,119.8,14z", "latitude": -3.4, "longitude": 119.9},
+        {"url": None, "place_id": "lama"},
+    ]
+    stats = reparse_records(records)
+    assert (records[0]["latitude"], records[0]["longitude"]) == (-3.5612345, 119.7787654)
+    assert records[0]["place_id"] == "0x2d95a3f0a1b2c3d4:0x1f2e3d4c5b6a7988"
+    # Tanpa segmen !3d/!4d koordinat lama dipertahankan
+    assert (records[1]["latitude"], records[1]["longitude"]) == (-3.4, 119.9)
+    assert records[2]["place_id"] == "lama"
+    assert stats == {"total": 3, "coordinates_updated": 1, "place_ids_added": 1, "no_place_coordinates": 2}
@@ -0,0 +1,59 @@
+import asyncio
+import worker_pool
+from config import POOL_CONFIG
+
+class FakeDataManager:
+    def __init__(self):
+        self.saved = False
+        self.closed = False
+
+    def checkpoint(self):
+        return 0
+
+    def save_to_files(self):
+        self.saved = True
+        return {"json": "a.json", "csv": "a.csv", "parquet": None, "geojsonseq": None, "flatgeobuf": None,
+                "clusters": None}
+
+    def close(self):
+        self.closed = True
+
+    def count(self):
+        return 0
+
+class FakeScraper:
+    def __init__(self):
+        self.done = []
+        self.closed = False
+
+    async def scrape_keyword_with_ledger(self, keyword, district):
+        self.done.append((district, keyword))
+        return []
+
+    def close(self):
+        self.closed = True
+
+def test_session_pool_survives_a_session_that_fails_to_start(monkeypatch):
+    monkeypatch.setitem(POOL_CONFIG, "startup_stagger", 0)
+    scrapers = []
+
+    async def create(**kwargs):
+        # Sesi pertama gagal start browser, sesi kedua mengerjakan semua task
+        if not scrapers:
+            scrapers.append(None)
+            raise RuntimeError("chrome tidak bisa start")
+        scraper = FakeScraper()
+        scrapers.append(scraper)
+        return scraper
+
+    monkeypatch.setattr(worker_pool.GoogleMapsInfrastructureScraper, "create", staticmethod(create))
+    data_manager = FakeDataManager()
+
+    result = asyncio.run(worker_pool.run_session_pool(["Alla"], ["masjid", "sekolah", "pasar"], sessions=2,
+                                                      data_manager=data_manager))
+
+    assert result["failed_sessions"] == 1
+    assert result["completed"] == 3 and result["failed"] == 0
+    assert sorted(keyword for _, keyword in scrapers[1].done) == ["masjid", "pasar", "sekolah"]
+    assert scrapers[1].closed
+    assert data_manager.saved and data_manager.closed
@@ -0,0 +1,138 @@
+import json
+import math
+import urllib.parse
+from config import OUTPUT_FILES, TILE_SWEEP_CONFIG
+
+class Tile:
+    """Kotak lat/lng (south, west, north, east) sebagai unit kerja pencarian"""
+
+    def __init__(self, tile_id, south, west, north, east, depth=0):
+        self.tile_id = tile_id
+        self.south = south
+        self.west = west
+        self.north = north
+        self.east = east
+        self.depth = depth
+
+    def center(self):
+        return (self.south + self.north) / 2, (self.west + self.east) / 2
+
+    def zoom(self):
+        """Zoom terbesar yang viewport map-nya masih menutup seluruh tile"""
+        span = max(self.east - self.west, (self.north - self.south) * 1.5)
+        zoom = math.floor(math.log2(TILE_SWEEP_CONFIG["viewport_pixels"] / 256 * 360 / span))
+        return max(TILE_SWEEP_CONFIG["min_zoom"], min(TILE_SWEEP_CONFIG["max_zoom"], zoom))
+
+    def contains(self, lat, lng):
+        return self.south <= lat < self.north and self.west <= lng < self.east
+
+    def split(self):
+        """Empat sub-tile (kuadran) untuk tile yang jenuh"""
+        mid_lat, mid_lng = self.center()
+        quadrants = [
+            (self.south, self.west, mid_lat, mid_lng),
+            (self.south, mid_lng, mid_lat, self.east),
+            (mid_lat, self.west, self.north, mid_lng),
+            (mid_lat, mid_lng, self.north, self.east)
+        ]
+        return [Tile(f"{self.tile_id}.{index}", *bounds, depth=self.depth + 1)
+                for index, bounds in enumerate(quadrants)]
+
+    def search_url(self, keyword):
+        lat, lng = self.center()
+        return (f"https://www.google.com/maps/search/{urllib.parse.quote(keyword)}/"
+                f"@{lat:.6f},{lng:.6f},{self.zoom()}z?hl=id")
+
+    def to_dict(self):
+        return {"tile_id": self.tile_id, "south": self.south, "west": self.west,
+                "north": self.north, "east": self.east, "depth": self.depth, "zoom": self.zoom()}
+
+def kabupaten_bounds():
+    return tuple(TILE_SWEEP_CONFIG["bbox"])
+
+def in_kabupaten(lat, lng):
+    south, west, north, east = kabupaten_bounds()
+    return south <= lat <= north and west <= lng <= east
+
+def initial_tiles():
+    """Grid awal rows×cols di atas bounding box kabupaten"""
+    south, west, north, east = kabupaten_bounds()
+    rows, cols = TILE_SWEEP_CONFIG["grid"]
+    lat_step = (north - south) / rows
+    lng_step = (east - west) / cols
+
+    return [
+        Tile(f"{row}-{col}", south + row * lat_step, west + col * lng_step,
+             south + (row + 1) * lat_step, west + (col + 1) * lng_step)
+        for row in range(rows) for col in range(cols)
+    ]
+
+class TileSweep:
+    """Antrian tile untuk satu keyword dengan subdivisi adaptif dan akuntansi coverage"""
+
+    def __init__(self, keyword):
+        self.keyword = keyword
+        self.queue = initial_tiles()
+        self.coverage = {}
+        self.failed = []
+
+    def next_tile(self):
+        return self.queue.pop(0) if self.queue else None
+
+    def mark_failed(self, tile):
+        """Tile yang pencariannya gagal tidak dihitung sebagai ter-cover"""
+        self.failed.append(tile.tile_id)
+
+    def record(self, tile, card_count, in_tile_count, added_count):
+        """Catat hasil satu tile; tile jenuh dipecah jadi 4 selama depth masih diizinkan"""
+        saturated = card_count >= TILE_SWEEP_CONFIG["saturation_count"]
+        subdivided = saturated and tile.depth < TILE_SWEEP_CONFIG["max_depth"]
+
+        self.coverage[tile.tile_id] = {
+            **tile.to_dict(),
+            "cards": card_count,
+            "in_tile": in_tile_count,
+            "added": added_count,
+            "saturated": saturated,
+            "subdivided": subdivided
+        }
+
+        if subdivided:
+            children = tile.split()
+            self.queue.extend(children)
+            print(f"🧩 Tile {tile.tile_id} jenuh ({card_count} hasil), dipecah jadi {len(children)}")
+
+        return subdivided
+
+    def report(self):
+        """Ringkasan coverage: tile selesai, jenuh di depth maksimum (coverage tidak lengkap)"""
+        leaves = [tile for tile in self.coverage.values() if not tile["subdivided"]]
+        return {
+            "keyword": self.keyword,
+            "tiles_searched": len(self.coverage),
+            "leaf_tiles": len(leaves),
+            "saturated_leaves": [tile["tile_id"] for tile in leaves if tile["saturated"]],
+            "empty_leaves": sum(1 for tile in leaves if tile["cards"] == 0),
+            "failed": self.failed,
+            "cards": sum(tile["cards"] for tile in self.coverage.values()),
+            "added": sum(tile["added"] for tile in self.coverage.values()),
+            "tiles": self.coverage
+        }
+
+    def print_report(self):
+        report = self.report()
+        print(f"🗺️  Coverage '{self.keyword}': {report['tiles_searched']} tile dicari, "
+              f"{report['leaf_tiles']} tile akhir ({report['empty_leaves']} kosong), "
+              f"{report['added']} data baru dari {report['cards']} kartu")
+        if report["failed"]:
+            print(f"❌ {len(report['failed'])} tile gagal dicari: {', '.join(report['failed'])}")
+        if report["saturated_leaves"]:
+            print(f"⚠️  {len(report['saturated_leaves'])} tile masih jenuh di depth maksimum: "
+                  f"{', '.join(report['saturated_leaves'])}")
+
+def save_coverage(reports, filename=None):
+    """Simpan laporan coverage semua keyword"""
+    filename = filename or OUTPUT_FILES["tile_coverage"]
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(reports, f, ensure_ascii=False, indent=2)
+    return filename
@@ -0,0 +1,112 @@
+import argparse
+import json
+import re
+from config import OUTPUT_FILES
+
+# Semua pattern di-compile sekali saat import
+PLACE_COORDINATES_PATTERN = re.compile(r"!3d(-?\d+(?:\.\d+)?)!4d(-?\d+(?:\.\d+)?)")
+VIEWPORT_PATTERN = re.compile(r"@(-?\d+(?:\.\d+)?),(-?\d+(?:\.\d+)?)(?:,(\d+(?:\.\d+)?)z)?")
+FEATURE_ID_PATTERN = re.compile(r"(?:!1s|ftid=)(0x[0-9a-fA-F]+):(0x[0-9a-fA-F]+)")
+CID_PARAM_PATTERN = re.compile(r"[?&]cid=(\d+)")
+
+def parse_place_url(url):
+    """Parse koordinat tempat, viewport, feature ID dan CID dari URL Google Maps"""
+    result = {
+        "lat": None,
+        "lng": None,
+        "viewport_lat": None,
+        "viewport_lng": None,
+        "zoom": None,
+        "place_id": None,
+        "cid": None
+    }
+
+    if not url:
+        return result
+
+    # Koordinat tempat dari segmen data (!3d lat !4d lng)
+    match = PLACE_COORDINATES_PATTERN.search(url)
+    if match:
+        result["lat"] = float(match.group(1))
+        result["lng"] = float(match.group(2))
+
+    # Pusat viewport dari @lat,lng,zoom - bukan lokasi tempat
+    match = VIEWPORT_PATTERN.search(url)
+    if match:
+        result["viewport_lat"] = float(match.group(1))
+        result["viewport_lng"] = float(match.group(2))
+        if match.group(3):
+            result["zoom"] = float(match.group(3))
+
+    # Feature ID 0x...:0x..., bagian kedua adalah CID dalam hex
+    match = FEATURE_ID_PATTERN.search(url)
+    if match:
+        result["place_id"] = f"{match.group(1).lower()}:{match.group(2).lower()}"
+        result["cid"] = str(int(match.group(2), 16))
+    else:
+        match = CID_PARAM_PATTERN.search(url)
+        if match:
+            result["cid"] = match.group(1)
+
+    return result
+
+def parse_place_urls(urls):
+    """Batch parse untuk banyak URL sekaligus"""
+    return [parse_place_url(url) for url in urls]
+
+def reparse_records(records):
+    """Turunkan ulang latitude/longitude, place_id dan cid dari URL setiap record"""
+    stats = {"total": len(records), "coordinates_updated": 0, "place_ids_added": 0, "no_place_coordinates": 0}
+
+    parsed_urls = parse_place_urls([str(item.get("url") or "") for item in records])
+
+    for item, parsed in zip(records, parsed_urls):
+        if parsed["lat"] is not None:
+            if item.get("latitude") != parsed["lat"] or item.get("longitude") != parsed["lng"]:
+                stats["coordinates_updated"] += 1
+            item["latitude"] = parsed["lat"]
+            item["longitude"] = parsed["lng"]
+        else:
+            stats["no_place_coordinates"] += 1
+
+        if parsed["place_id"] and not item.get("place_id"):
+            stats["place_ids_added"] += 1
+        if parsed["place_id"]:
+            item["place_id"] = parsed["place_id"]
+        if parsed["cid"]:
+            item["cid"] = parsed["cid"]
+
+    return stats
+
+def reparse_dataset(filename=None, output=None):
+    """Perbaiki koordinat dataset JSON yang sudah ada tanpa scraping ulang"""
+    filename = filename or OUTPUT_FILES["json"]
+    output = output or filename
+
+    with open(filename, 'r', encoding='utf-8') as f:
+        document = json.load(f)
+
+    records = document["data"] if isinstance(document, dict) and "data" in document else document
+    stats = reparse_records(records)
+
+    if isinstance(document, dict) and "data" in document:
+        document["total_count"] = len(records)
+
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(document, f, ensure_ascii=False, indent=2)
+
+    print(f"🌍 {stats['coordinates_updated']}/{stats['total']} koordinat diperbaiki dari segmen !3d/!4d")
+    print(f"🆔 {stats['place_ids_added']} place ID ditambahkan")
+    if stats["no_place_coordinates"]:
+        print(f"⚠️  {stats['no_place_coordinates']} URL tanpa koordinat tempat, koordinat lama dipertahankan")
+    print(f"💾 Disimpan ke {output}")
+
+    return stats
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-derive koordinat tempat dan place ID dari URL Google Maps")
+    parser.add_argument("input", nargs="?", default=OUTPUT_FILES["json"], help="File JSON hasil scraping")
+    parser.add_argument("-o", "--output", help="File output (default: timpa file input)")
+    args = parser.parse_args()
+
+    reparse_dataset(args.input, args.output)
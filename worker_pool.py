@@ -0,0 +1,255 @@
+import asyncio
+import multiprocessing
+import queue
+import random
+import time
+from config import OUTPUT_FILES, POOL_CONFIG, SECURITY_CONFIG
+from data_manager import DataManager, print_saved_files
+from job import apply_job_settings
+from metrics import MetricsRecorder, metric_files
+from rate_limiter import RateLimiter, SharedTokenBucket, TokenBucket
+from scraper import GoogleMapsInfrastructureScraper
+
+def build_tasks(districts, keywords, task_ledger=None):
+    """Unit kerja kecamatan×keyword (hanya yang belum selesai jika pakai ledger)"""
+    if task_ledger:
+        tasks = task_ledger.unfinished()
+    else:
+        tasks = [(district, keyword) for district in districts for keyword in keywords]
+    if SECURITY_CONFIG["randomize_order"]:
+        random.shuffle(tasks)
+    return tasks
+
+def worker_main(worker_id, task_queue, result_queue, request_bucket, settings=None):
+    """Proses worker: satu browser, ambil task dari queue sampai sentinel None"""
+    scraper = None
+    try:
+        # Proses spawn memuat config dari awal: terapkan ulang pacing dan path output job
+        if settings:
+            apply_job_settings(settings)
+
+        # Stagger start supaya tidak semua Chrome launch bersamaan
+        time.sleep(worker_id * POOL_CONFIG["startup_stagger"])
+
+        # DataManager lokal tanpa journal hanya sebagai placeholder: dedupe global (beserta fase
+        # dan counter added/duplicates-nya) dilakukan di parent.
+        # Bucket search diganti bucket lintas proses supaya budget berlaku untuk seluruh pool
+        rate_limiter = RateLimiter(shared_buckets={"search": request_bucket})
+        jsonl_file, prometheus_file = metric_files(f"worker{worker_id}")
+        metrics = MetricsRecorder(jsonl_file, prometheus_file, labels={"worker": str(worker_id)})
+        scraper = GoogleMapsInfrastructureScraper(data_manager=DataManager(), rate_limiter=rate_limiter,
+                                                  metrics=metrics)
+        scraper.defer_dedupe = True
+        print(f"👷 Worker {worker_id} siap")
+
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+
+            district, keyword = task
+            result_queue.put(("start", worker_id, district, keyword, None))
+
+            try:
+                results = asyncio.run(scraper.scrape_keyword(keyword, district))
+                payload = None if results is None else {"records": results, "sightings": scraper.sightings}
+                result_queue.put(("result", worker_id, district, keyword, payload))
+            except Exception as e:
+                result_queue.put(("error", worker_id, district, keyword, str(e)))
+
+    except Exception as e:
+        print(f"❌ Worker {worker_id} error: {e}")
+
+    finally:
+        if scraper:
+            scraper.close()
+        result_queue.put(("done", worker_id, None, None, None))
+
+def run_worker_pool(districts, keywords, workers=None, data_manager=None, task_ledger=None, settings=None):
+    """Jalankan N proses worker dengan token bucket global dan satu DataManager sink"""
+    workers = workers or POOL_CONFIG["workers"]
+    context = multiprocessing.get_context("spawn")
+
+    tasks = build_tasks(districts, keywords, task_ledger)
+    if not tasks:
+        print("✅ Tidak ada task tersisa")
+        return {"completed": 0, "failed": 0, "total": 0}
+    workers = max(1, min(workers, len(tasks)))
+
+    if data_manager is None:
+        data_manager = DataManager(journal_file=OUTPUT_FILES["journal"], index_file=OUTPUT_FILES["facility_index"])
+        data_manager.load_existing_data()
+
+    # Metrics parent: fase dedupe global dan counter added/duplicates per unit
+    jsonl_file, prometheus_file = metric_files("pool")
+    metrics = MetricsRecorder(jsonl_file, prometheus_file)
+
+    task_queue = context.Queue()
+    result_queue = context.Queue()
+    request_bucket = SharedTokenBucket(SECURITY_CONFIG["max_requests_per_hour"], context=context)
+
+    for task in tasks:
+        task_queue.put(task)
+    for _ in range(workers):
+        task_queue.put(None)
+
+    print(f"🚀 Pool mode: {workers} worker, {len(tasks)} task, "
+          f"budget {SECURITY_CONFIG['max_requests_per_hour']} request/jam")
+
+    processes = []
+    for worker_id in range(workers):
+        process = context.Process(
+            target=worker_main,
+            args=(worker_id, task_queue, result_queue, request_bucket, settings),
+            daemon=True
+        )
+        process.start()
+        processes.append(process)
+
+    start_time = time.time()
+    finished_workers = set()
+    completed_tasks = 0
+    failed_tasks = 0
+
+    while len(finished_workers) < workers:
+        try:
+            kind, worker_id, district, keyword, payload = result_queue.get(
+                timeout=POOL_CONFIG["result_poll_interval"]
+            )
+        except queue.Empty:
+            # Worker yang mati tanpa mengirim "done" dianggap selesai
+            for worker_id, process in enumerate(processes):
+                if not process.is_alive() and worker_id not in finished_workers:
+                    print(f"⚠️  Worker {worker_id} berhenti tanpa sinyal selesai (exit {process.exitcode})")
+                    finished_workers.add(worker_id)
+            continue
+
+        if kind == "done":
+            finished_workers.add(worker_id)
+
+        elif kind == "start":
+            if task_ledger:
+                task_ledger.mark_running(district, keyword)
+
+        elif kind == "result":
+            completed_tasks += 1
+            if payload is None:
+                failed_tasks += 1
+                if task_ledger:
+                    task_ledger.mark_failed(district, keyword, "pencarian gagal")
+                print(f"❌ [{completed_tasks}/{len(tasks)}] Pencarian gagal: {keyword} di {district}")
+                continue
+
+            # Dedupe global: semua worker masuk ke satu DataManager
+            records = payload["records"]
+            unit = metrics.start_unit(district, keyword)
+            with unit.phase("dedupe"):
+                added = sum(1 for item in records if data_manager.add_data(item))
+            unit.count("added", added)
+            unit.count("duplicates", len(records) - added)
+            metrics.finish_unit(unit, "done", labels={"worker": str(worker_id)})
+            total = data_manager.checkpoint()
+            if task_ledger:
+                task_ledger.record_sightings(district, keyword, payload["sightings"])
+                task_ledger.mark_done(district, keyword, added)
+            print(f"📦 [{completed_tasks}/{len(tasks)}] Worker {worker_id}: {keyword} di {district} - "
+                  f"{added}/{len(records)} baru, total {total}")
+
+        elif kind == "error":
+            completed_tasks += 1
+            failed_tasks += 1
+            if task_ledger:
+                task_ledger.mark_failed(district, keyword, payload)
+            print(f"❌ [{completed_tasks}/{len(tasks)}] Worker {worker_id} error {keyword} di {district}: {payload}")
+
+    for process in processes:
+        process.join(timeout=30)
+
+    total_time = time.time() - start_time
+    print(f"\n🎉 Pool selesai dalam {total_time/3600:.1f} jam: {completed_tasks} task, {failed_tasks} gagal")
+
+    print_saved_files(data_manager.save_to_files())
+    data_manager.close()
+
+    return {"completed": completed_tasks, "failed": failed_tasks, "total": data_manager.count()}
+
+async def run_session_pool(districts, keywords, sessions=None, data_manager=None, task_ledger=None):
+    """Beberapa sesi browser dalam satu event loop; delay satu sesi di-overlap dengan kerja sesi lain"""
+    sessions = sessions or POOL_CONFIG["sessions"]
+    tasks = build_tasks(districts, keywords, task_ledger)
+    if not tasks:
+        print("✅ Tidak ada task tersisa")
+        return {"completed": 0, "failed": 0, "failed_sessions": 0, "total": 0}
+    sessions = max(1, min(sessions, len(tasks)))
+
+    if data_manager is None:
+        data_manager = DataManager(journal_file=OUTPUT_FILES["journal"], index_file=OUTPUT_FILES["facility_index"])
+        data_manager.load_existing_data()
+
+    task_queue = asyncio.Queue()
+    for task in tasks:
+        task_queue.put_nowait(task)
+
+    # Budget search bersama untuk semua sesi (satu event loop, tidak perlu lintas proses)
+    request_bucket = TokenBucket(SECURITY_CONFIG["max_requests_per_hour"])
+    metrics = MetricsRecorder()
+    progress = {"completed": 0, "failed": 0}
+
+    print(f"🚀 Session pool: {sessions} sesi browser, {len(tasks)} task, "
+          f"budget {SECURITY_CONFIG['max_requests_per_hour']} request/jam")
+
+    async def session_loop(session_id):
+        await asyncio.sleep(session_id * POOL_CONFIG["startup_stagger"])
+
+        # Semua sesi menulis ke DataManager yang sama (dedupe global di event loop)
+        rate_limiter = RateLimiter(shared_buckets={"search": request_bucket})
+        scraper = None
+        try:
+            scraper = await GoogleMapsInfrastructureScraper.create(
+                data_manager=data_manager, rate_limiter=rate_limiter, metrics=metrics
+            )
+            scraper.task_ledger = task_ledger
+            scraper.metric_labels = {"session": str(session_id)}
+            while True:
+                try:
+                    district, keyword = task_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+
+                try:
+                    results = await scraper.scrape_keyword_with_ledger(keyword, district)
+                except Exception as e:
+                    print(f"❌ Sesi {session_id} error {keyword} di {district}: {e}")
+                    results = None
+
+                progress["completed"] += 1
+                if results is None:
+                    progress["failed"] += 1
+
+                total = data_manager.checkpoint()
+                print(f"📦 [{progress['completed']}/{len(tasks)}] Sesi {session_id}: {keyword} di {district} "
+                      f"- total {total}")
+        finally:
+            if scraper:
+                await asyncio.get_running_loop().run_in_executor(None, scraper.close)
+
+    start_time = time.time()
+    try:
+        # Sesi yang gagal (mis. browser tidak bisa start) tidak menghentikan sesi lain;
+        # task yang tersisa diambil sesi yang masih hidup
+        outcomes = await asyncio.gather(*(session_loop(session_id) for session_id in range(sessions)),
+                                        return_exceptions=True)
+        failed_sessions = [(session_id, outcome) for session_id, outcome in enumerate(outcomes)
+                           if isinstance(outcome, BaseException)]
+        for session_id, error in failed_sessions:
+            print(f"❌ Sesi {session_id} berhenti: {error}")
+
+        total_time = time.time() - start_time
+        print(f"\n🎉 Session pool selesai dalam {total_time/3600:.1f} jam: "
+              f"{progress['completed']} task, {progress['failed']} gagal, {len(failed_sessions)} sesi gagal")
+    finally:
+        print_saved_files(data_manager.save_to_files())
+        data_manager.close()
+
+    return {"completed": progress["completed"], "failed": progress["failed"], "failed_sessions": len(failed_sessions),
+            "total": data_manager.count()}